@@ -0,0 +1,5 @@
+"""ベンチマークパッケージ。
+
+このパッケージは、コア機能の性能を計測するベンチマークスクリプトを含みます。
+各モジュールは ``python -m benchmarks.<モジュール名>`` で実行できます。
+"""
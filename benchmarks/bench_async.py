@@ -0,0 +1,95 @@
+"""非同期実行のベンチマーク。
+
+このモジュールは、Application.run_async() と AsyncTaskRunner の性能を計測します。
+
+使用例:
+    python -m benchmarks.bench_async
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import List
+
+from src.core.logger import Logger
+from src.core.tasks import AsyncTaskRunner
+
+
+def bench_overlap(count: int = 200, delay: float = 0.01) -> None:
+    """I/O待ちの処理を順に実行した場合と同時に実行した場合を比較します。
+
+    Args:
+        count: 処理の数
+        delay: 1つの処理のI/O待ちの時間（秒）
+    """
+
+    async def wait_io(_: int) -> None:
+        await asyncio.sleep(delay)
+
+    print(f"{delay * 1000:.0f}ms のI/O待ちを {count} 回実行する時間")
+    start = time.perf_counter()
+    for _ in range(count):
+        time.sleep(delay)
+    print(f"{'同期（順に実行）':<28} {time.perf_counter() - start:8.3f} s")
+    for concurrency in (10, 50, 200):
+        runner = AsyncTaskRunner(concurrency=concurrency)
+        start = time.perf_counter()
+        asyncio.run(runner.map(wait_io, range(count)))
+        elapsed = time.perf_counter() - start
+        print(f"{f'非同期（concurrency={concurrency}）':<28} {elapsed:8.3f} s")
+
+
+def bench_loop_blocking(count: int = 20000) -> None:
+    """コルーチンからログを出力したときにイベントループを止める時間を計測します。
+
+    ログの出力中はイベントループが他のコルーチンを実行できないため、
+    logger.info() の呼び出しにかかった時間の合計と最大値を比較します。
+
+    Args:
+        count: 出力するログの数
+    """
+    temp_dir = tempfile.mkdtemp()
+    print(f"{count} 件のログの出力でイベントループを止めた時間")
+    try:
+        for async_mode in (False, True):
+            log_file = os.path.join(temp_dir, f"async_{async_mode}.log")
+            logger = Logger(
+                f"bench.async_{async_mode}", log_file=log_file, async_mode=async_mode
+            )
+            # コンソールへの出力を除き、ファイルへの書き込みだけを計測する
+            logger.handlers[0].setLevel(logging.CRITICAL)
+
+            async def produce(logger: Logger) -> List[int]:
+                durations = []
+                for i in range(count):
+                    start = time.perf_counter_ns()
+                    logger.info("処理中のレコード %d", i)
+                    durations.append(time.perf_counter_ns() - start)
+                    if i % 100 == 0:
+                        await asyncio.sleep(0)
+                return durations
+
+            durations = asyncio.run(produce(logger))
+            logger.close()
+            durations.sort()
+            label = "async_mode=True" if async_mode else "async_mode=False"
+            print(
+                f"{label:<28} 合計 {sum(durations) / 1e6:8.1f} ms  "
+                f"p99 {durations[int(count * 0.99)] / 1e3:7.1f} us  "
+                f"最大 {durations[-1] / 1e3:8.1f} us"
+            )
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_overlap()
+    bench_loop_blocking()
+
+
+if __name__ == "__main__":
+    main()
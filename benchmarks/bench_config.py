@@ -0,0 +1,354 @@
+"""設定管理モジュールのベンチマーク。
+
+このモジュールは、設定管理モジュール（src.core.config）の性能を計測します。
+
+使用例:
+    python -m benchmarks.bench_config
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from typing import Any, Callable, Dict, Tuple
+
+import yaml
+
+from src.core.config import ConfigManager
+from src.core.main import Application
+from src.core.schema import ConfigSchema
+
+DEEP_KEY = "service.database.pool.primary.connection.timeout"
+
+
+def _build_config() -> Dict[str, Any]:
+    """計測用の設定辞書を作成します。
+
+    Returns:
+        深い階層のキーを含む設定辞書
+    """
+    config: Dict[str, Any] = {
+        f"section{i}": {f"key{j}": j for j in range(20)} for i in range(50)
+    }
+    config["service"] = {
+        "database": {"pool": {"primary": {"connection": {"timeout": 30}}}}
+    }
+    return config
+
+
+def _legacy_get(config: Dict[str, Any], key: str, default: Any = None) -> Any:
+    """インデックス導入前の get() と同等の処理を行います。
+
+    Args:
+        config: 設定辞書
+        key: 設定キー
+        default: デフォルト値
+
+    Returns:
+        設定値
+    """
+    env_value = os.environ.get("APP_" + key.upper().replace(".", "_"))
+    if env_value is not None:
+        return env_value
+    value: Any = config
+    for k in key.split("."):
+        if isinstance(value, dict) and k in value:
+            value = value[k]
+        else:
+            return default
+    return value
+
+
+def _report(label: str, func: Callable[[], Any], number: int) -> None:
+    """関数の1回あたりの実行時間を表示します。
+
+    Args:
+        label: 表示ラベル
+        func: 計測する関数
+        number: 1計測あたりの実行回数
+    """
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<40} {best / number * 1e9:8.1f} ns/call")
+
+
+def bench_deep_key_lookup(number: int = 200000) -> None:
+    """深い階層のキー参照の性能を計測します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    config = _build_config()
+    manager = ConfigManager()
+    manager.config = config
+
+    print(f"深い階層のキー参照: {DEEP_KEY}")
+    _report("before (split + walk)", lambda: _legacy_get(config, DEEP_KEY), number)
+    _report("after (ConfigManager.get)", lambda: manager.get(DEEP_KEY), number)
+
+    manager.enable_stats()
+    _report("ConfigManager.get (stats enabled)", lambda: manager.get(DEEP_KEY), number)
+
+
+def bench_bulk_access(number: int = 20000) -> None:
+    """関連する複数のキーの取得方法ごとの性能を計測します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    manager = ConfigManager()
+    manager.config = _build_config()
+    keys = [f"section0.key{j}" for j in range(20)]
+    relative_keys = [f"key{j}" for j in range(20)]
+    view = manager.view("section0")
+
+    print(f"関連するキーの取得（{len(keys)} キー）")
+    _report("get x N", lambda: [manager.get(k) for k in keys], number)
+    _report("get_many", lambda: manager.get_many(keys), number)
+    _report("view.get x N", lambda: [view.get(k) for k in relative_keys], number)
+    _report("view.get_many", lambda: view.get_many(relative_keys), number)
+
+
+class _ConnectionSchema(ConfigSchema):
+    """計測用の接続のスキーマ。"""
+
+    timeout: int
+
+
+class _PrimarySchema(ConfigSchema):
+    """計測用のプライマリのスキーマ。"""
+
+    connection: _ConnectionSchema
+
+
+class _PoolSchema(ConfigSchema):
+    """計測用のコネクションプールのスキーマ。"""
+
+    primary: _PrimarySchema
+
+
+class _DatabaseSchema(ConfigSchema):
+    """計測用のデータベースのスキーマ。"""
+
+    pool: _PoolSchema
+
+
+class _ServiceSchema(ConfigSchema):
+    """計測用のサービスのスキーマ。"""
+
+    database: _DatabaseSchema
+
+
+class _AppSchema(ConfigSchema):
+    """計測用のアプリケーションのスキーマ。"""
+
+    service: _ServiceSchema
+
+
+def bench_typed_access(number: int = 200000) -> None:
+    """スキーマで変換した設定の属性参照の性能を計測します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    manager = ConfigManager(schema=_AppSchema)
+    manager.config = _build_config()
+    cfg = manager.typed
+
+    print(f"スキーマによる属性参照: {DEEP_KEY}")
+    _report("ConfigManager.get", lambda: manager.get(DEEP_KEY), number)
+    _report(
+        "typed attribute",
+        lambda: cfg.service.database.pool.primary.connection.timeout,
+        number,
+    )
+
+
+def _time_startup(config_path: str, cache_dir: Any, repeat: int) -> float:
+    """Application の初期化時間の最小値を計測します。
+
+    Args:
+        config_path: 設定ファイルのパス
+        cache_dir: 設定キャッシュのディレクトリ。Noneの場合はキャッシュなし。
+        repeat: 計測回数
+
+    Returns:
+        初期化時間の最小値（秒）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            Application(config_path=config_path, config_cache_dir=cache_dir)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_startup(sections: int = 2000, repeat: int = 5) -> None:
+    """設定キャッシュの有無による Application の初期化時間を計測します。
+
+    Args:
+        sections: 生成する設定のセクション数
+        repeat: 計測回数
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        config_path = os.path.join(temp_dir, "config.yaml")
+        config = {
+            f"section{i}": {f"key{j}": f"value-{i}-{j}" for j in range(50)}
+            for i in range(sections)
+        }
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.dump(config, f)
+        size_mb = os.path.getsize(config_path) / 1024 / 1024
+
+        cold_best = float("inf")
+        for i in range(repeat):
+            cache_dir = os.path.join(temp_dir, f"cold{i}")
+            cold_best = min(cold_best, _time_startup(config_path, cache_dir, 1))
+        warm_dir = os.path.join(temp_dir, "warm")
+        _time_startup(config_path, warm_dir, 1)
+
+        print(f"Application の初期化時間（設定ファイル {size_mb:.1f} MB）")
+        no_cache = _time_startup(config_path, None, repeat)
+        print(f"{'no cache':<40} {no_cache * 1e3:8.1f} ms")
+        print(f"{'cold cache':<40} {cold_best * 1e3:8.1f} ms")
+        warm = _time_startup(config_path, warm_dir, repeat)
+        print(f"{'warm cache':<40} {warm * 1e3:8.1f} ms")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+# 子プロセスで設定を読み込み、最初の get() までの時間と最大RSSを出力する
+# ru_maxrss は fork 元のプロセスの値を引き継ぐことがあるため、
+# Linux では exec 時にリセットされる /proc/self/status の VmHWM を使用する
+_FIRST_GET_SCRIPT = """
+import resource, sys, time
+from src.core.config import ConfigManager
+start = time.perf_counter()
+manager = ConfigManager(sys.argv[1], lazy=sys.argv[2] == "1")
+manager.get("logging.file")
+elapsed = time.perf_counter() - start
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                max_rss = int(line.split()[1])
+except OSError:
+    pass
+print(elapsed, max_rss)
+"""
+
+
+def _measure_first_get(config_path: str, lazy: bool) -> Tuple[float, int]:
+    """新しいプロセスで最初の get() までの時間と最大RSSを計測します。
+
+    Args:
+        config_path: 設定ファイルのパス
+        lazy: 遅延読み込みを使用するかどうか
+
+    Returns:
+        (最初の get() までの時間（秒）, 最大RSS（KB）)
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", _FIRST_GET_SCRIPT, config_path, "1" if lazy else "0"],
+        capture_output=True,
+        check=True,
+        cwd=project_root,
+        text=True,
+    )
+    elapsed, max_rss = result.stdout.split()
+    return float(elapsed), int(max_rss)
+
+
+def bench_lazy_load(rows: int = 500000) -> None:
+    """遅延読み込みの有無による最初の get() までの時間と最大RSSを計測します。
+
+    最大RSSの計測には resource モジュールを使用するため、Unix でのみ動作します。
+
+    Args:
+        rows: 生成する参照テーブルの行数
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        config_path = os.path.join(temp_dir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write('{"logging": {"file": "/var/log/app.log", "level": "INFO"}, ')
+            f.write('"tables": [')
+            for i in range(rows):
+                if i:
+                    f.write(",")
+                json.dump({"id": i, "name": f"item-{i}", "tags": ["a", "b"]}, f)
+            f.write("]}")
+        size_mb = os.path.getsize(config_path) / 1024 / 1024
+
+        print(f"最初の get() までの時間と最大RSS（設定ファイル {size_mb:.1f} MB）")
+        for label, lazy in (("eager", False), ("lazy", True)):
+            elapsed, max_rss = _measure_first_get(config_path, lazy)
+            print(f"{label:<40} {elapsed * 1e3:8.1f} ms {max_rss / 1024:8.1f} MB")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def bench_concurrent_access(readers: int = 4, duration: float = 1.0) -> None:
+    """コピーオンライトの set() と並行する get() のスループットを計測します。
+
+    Args:
+        readers: 読み取りスレッドの数
+        duration: 計測時間（秒）
+    """
+    manager = ConfigManager(thread_safe=True)
+    manager.config = _build_config()
+    stop = threading.Event()
+    counts = [0] * (readers + 1)
+
+    def reader(slot: int) -> None:
+        get = manager.get
+        n = 0
+        while not stop.is_set():
+            for _ in range(100):
+                get(DEEP_KEY)
+            n += 100
+        counts[slot] = n
+
+    def writer() -> None:
+        n = 0
+        while not stop.is_set():
+            manager.set(DEEP_KEY, n)
+            n += 1
+        counts[readers] = n
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"並行アクセス（読み取り {readers} スレッド、書き込み 1 スレッド）")
+    print(f"{'get':<40} {sum(counts[:readers]) / duration:8.0f} ops/s")
+    print(f"{'set (copy-on-write)':<40} {counts[readers] / duration:8.0f} ops/s")
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_deep_key_lookup()
+    bench_bulk_access()
+    bench_typed_access()
+    bench_startup()
+    bench_lazy_load()
+    bench_concurrent_access()
+
+
+if __name__ == "__main__":
+    main()
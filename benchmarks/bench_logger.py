@@ -0,0 +1,536 @@
+"""ロギングモジュールのベンチマーク。
+
+このモジュールは、ロギングモジュール（src.core.logger）の性能を計測します。
+
+使用例:
+    python -m benchmarks.bench_logger
+"""
+
+import contextlib
+import functools
+import glob
+import gzip
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.collector import LogCollector
+from src.core.formatters import FIELDS_ATTR, CachedTimeFormatter, JsonFormatter
+from src.core.handlers import BatchingRotatingFileHandler
+from src.core.logger import Logger
+
+
+def _percentile(samples: List[int], ratio: float) -> float:
+    """計測値の百分位数を返します。
+
+    Args:
+        samples: 昇順に並べた計測値
+        ratio: 百分位（0.0〜1.0）
+
+    Returns:
+        百分位数
+    """
+    return float(samples[min(len(samples) - 1, int(len(samples) * ratio))])
+
+
+def _measure_info(logger: Logger, count: int) -> Dict[str, float]:
+    """Logger.info の呼び出し元での所要時間を計測します。
+
+    Args:
+        logger: 計測するロガー
+        count: 呼び出し回数
+
+    Returns:
+        スループット（呼び出し/秒）と、1回あたりの所要時間の百分位数（ns）
+    """
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    start = time.perf_counter()
+    for i in range(count):
+        t = perf_counter_ns()
+        logger.info(f"処理中のレコード {i}")
+        samples.append(perf_counter_ns() - t)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        "throughput": count / elapsed,
+        "p50": _percentile(samples, 0.5),
+        "p99": _percentile(samples, 0.99),
+        "max": float(samples[-1]),
+    }
+
+
+def bench_logger_info(count: int = 50000, **logger_options: Any) -> None:
+    """同期モードと非同期モードの Logger.info の性能を計測します。
+
+    ログはコンソール（/dev/null）とファイルに出力します。ファイルは
+    計測中にローテーションされるサイズに設定します。非同期モードの
+    close() は計測に含めず、残りのレコードを出力し終えるまでの時間を
+    別に表示します。
+
+    Args:
+        count: 呼び出し回数
+        **logger_options: Logger に追加で渡す引数
+    """
+    options = ", ".join(f"{k}={v}" for k, v in logger_options.items())
+    print(f"Logger.info の呼び出し元での所要時間（{count} 回）{options}")
+    for label, async_mode in (("sync", False), ("async", True)):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+                devnull
+            ):
+                logger = Logger(
+                    f"bench_{label}",
+                    log_file=os.path.join(temp_dir, "app.log"),
+                    max_bytes=1024 * 1024,
+                    backup_count=3,
+                    async_mode=async_mode,
+                    **logger_options,
+                )
+                result = _measure_info(logger, count)
+                start = time.perf_counter()
+                logger.close()
+                close_ms = (time.perf_counter() - start) * 1e3
+            print(
+                f"{label:<10} {result['throughput']:10.0f} calls/s  "
+                f"p50 {result['p50']:8.0f} ns  p99 {result['p99']:8.0f} ns  "
+                f"max {result['max'] / 1e6:6.2f} ms  close {close_ms:6.1f} ms  "
+                f"dropped {logger.dropped}"
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def _report(label: str, func: Callable[[], Any], number: int) -> None:
+    """関数の1回あたりの実行時間を表示します。
+
+    Args:
+        label: 表示ラベル
+        func: 計測する関数
+        number: 1計測あたりの実行回数
+    """
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<40} {best / number * 1e9:8.1f} ns/call")
+
+
+def bench_disabled_debug(number: int = 200000) -> None:
+    """無効なDEBUGレベルの呼び出しの性能を計測します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        logger = Logger("bench_disabled", level="INFO")
+    record = {"id": 42, "values": list(range(10))}
+
+    print("無効なDEBUGレベルの呼び出し")
+    _report(
+        "before (logging.debug + f-string)",
+        lambda: logger.logger.debug(f"レコード: {record}"),
+        number,
+    )
+    _report("Logger.debug + f-string", lambda: logger.debug(f"レコード: {record}"), number)
+    _report("Logger.debug + % args", lambda: logger.debug("レコード: %s", record), number)
+    _report(
+        "Logger.debug + callable",
+        lambda: logger.debug(lambda: f"レコード: {record}"),
+        number,
+    )
+
+
+def bench_flight_recorder(number: int = 100000) -> None:
+    """フライトレコーダーでDEBUGログを保持する場合の性能を計測します。
+
+    DEBUGレベルでログを出力する場合（コンソールは /dev/null）と比較します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    record = {"id": 42, "values": list(range(10))}
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            disabled = Logger("bench_recorder_disabled", level="INFO")
+            recording = Logger(
+                "bench_recorder", level="INFO", flight_recorder_size=10000
+            )
+            enabled = Logger("bench_recorder_enabled", level="DEBUG")
+
+        print("DEBUGログの保持")
+        for label, logger in (
+            ("disabled", disabled),
+            ("flight recorder (10000 件)", recording),
+            ("level=DEBUG (/dev/null)", enabled),
+        ):
+            _report(label, lambda: logger.debug("レコード: %s", record), number)
+
+    slots = recording._recorder._slots  # type: ignore[union-attr]
+    slot_bytes = sys.getsizeof(slots) + sum(sys.getsizeof(entry) for entry in slots)
+    print(f"10000 件のスロットとタプルのサイズ: {slot_bytes / 1024:.0f} KiB")
+
+
+def bench_file_handlers(count: int = 100000) -> None:
+    """ファイルハンドラごとのログ出力の性能を計測します。
+
+    ローテーションが発生するサイズに設定し、close() までの時間を計測します。
+
+    Args:
+        count: ログの出力回数
+    """
+    print(f"ファイルハンドラのスループット（{count} レコード、ローテーションあり）")
+    factories = (
+        (
+            "RotatingFileHandler",
+            lambda path: logging.handlers.RotatingFileHandler(
+                path, maxBytes=1024 * 1024, backupCount=3, encoding="utf-8"
+            ),
+        ),
+        (
+            "BatchingRotatingFileHandler",
+            lambda path: BatchingRotatingFileHandler(
+                path, max_bytes=1024 * 1024, backup_count=3
+            ),
+        ),
+    )
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    for label, factory in factories:
+        temp_dir = tempfile.mkdtemp()
+        try:
+            handler = factory(os.path.join(temp_dir, "app.log"))
+            handler.setFormatter(formatter)
+            logger = logging.getLogger(f"bench_file_{label}")
+            logger.propagate = False
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            start = time.perf_counter()
+            for i in range(count):
+                logger.info("処理中のレコード %d", i)
+            handler.close()
+            elapsed = time.perf_counter() - start
+            logger.handlers = []
+            print(f"{label:<40} {count / elapsed:10.0f} records/s")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def bench_json_formatter(number: int = 50000) -> None:
+    """テキスト形式とJSON形式のフォーマッタの性能を計測します。
+
+    json.dumps でレコード全体を変換する素朴な実装とも比較します。
+
+    Args:
+        number: 1計測あたりの実行回数
+    """
+    context = {"app": "bench", "host": "localhost", "pid": os.getpid()}
+    record = logging.LogRecord(
+        "bench", logging.INFO, __file__, 1, "処理中のレコード %d", (42,), None
+    )
+    setattr(record, FIELDS_ATTR, {"user_id": 42, "path": "/api/items"})
+    text_formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    json_formatter = JsonFormatter(context)
+
+    def naive_json() -> str:
+        return json.dumps(
+            {
+                "ts": text_formatter.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **context,
+                **getattr(record, FIELDS_ATTR),
+            },
+            ensure_ascii=False,
+        )
+
+    print("フォーマッタの1レコードあたりの所要時間")
+    _report("logging.Formatter (text)", lambda: text_formatter.format(record), number)
+    _report("json.dumps (naive)", naive_json, number)
+    _report("JsonFormatter", lambda: json_formatter.format(record), number)
+
+
+def bench_timestamp_formatter(count: int = 50000) -> None:
+    """タイムスタンプをキャッシュするフォーマッタの性能を計測します。
+
+    1秒あたり rate 件のレコードをフォーマットし、1秒あたりの処理件数を
+    logging.Formatter と比較します。rate が1の場合はすべてのレコードで
+    秒が変わるため、キャッシュが効かない場合の性能になります。
+
+    Args:
+        count: フォーマットするレコードの数
+    """
+    format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    formatters = [
+        ("logging.Formatter", logging.Formatter(format_string)),
+        ("CachedTimeFormatter", CachedTimeFormatter(format_string)),
+        (
+            "CachedTimeFormatter (epoch)",
+            CachedTimeFormatter(format_string, timestamp="epoch"),
+        ),
+    ]
+
+    def format_all(
+        format: Callable[[logging.LogRecord], str], records: List[logging.LogRecord]
+    ) -> None:
+        for record in records:
+            format(record)
+
+    print("タイムスタンプのフォーマット（1秒あたりの処理件数）")
+    for rate in (1000, 1):
+        records = []
+        for i in range(count):
+            record = logging.LogRecord(
+                "bench", logging.INFO, __file__, 1, "処理中のレコード %d", (i,), None
+            )
+            record.created = 1700000000 + i / rate
+            record.msecs = (record.created - int(record.created)) * 1000
+            records.append(record)
+        for label, formatter in formatters:
+            func = functools.partial(format_all, formatter.format, records)
+            best = min(timeit.repeat(func, number=1, repeat=5))
+            print(f"{label:<28} {rate:>5} 件/秒のログ {count / best:10.0f} records/s")
+
+
+def bench_sampling(count: int = 100000) -> None:
+    """ホットループからのログ出力を間引いた場合の性能を計測します。
+
+    ログはファイルに出力し、close() までの時間を計測します。
+
+    Args:
+        count: ログの出力回数
+    """
+    print(f"ホットループからのログ出力（{count} 回）")
+    for label, options in (
+        ("no sampling", {}),
+        ("sample_every=100", {"sample_every": 100}),
+        ("rate_limit=100/s", {"rate_limit": 100.0}),
+        ("sample_every=1 + rate_limit=1e9/s", {"rate_limit": 1e9}),
+    ):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+                devnull
+            ):
+                logger = Logger(
+                    "bench_sampling",
+                    log_file=os.path.join(temp_dir, "app.log"),
+                    **options,
+                )
+                logger.handlers[0].setLevel(logging.CRITICAL)  # ファイルにだけ出力
+                start = time.perf_counter()
+                for i in range(count):
+                    logger.warning(f"リトライします: {i}")
+                logger.close()
+                elapsed = time.perf_counter() - start
+            print(f"{label:<40} {elapsed / count * 1e9:8.1f} ns/call")
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """ログファイルを書き込み中のスレッドで圧縮する rotator（比較用）。"""
+    with open(source, "rb") as f_in, gzip.open(dest + ".gz", "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+    os.remove(source)
+
+
+def bench_compressed_rotation(count: int = 200000) -> None:
+    """ローテーションを含むログ出力の所要時間を、圧縮の方法ごとに計測します。
+
+    Args:
+        count: ログの出力回数
+    """
+    print(f"ローテーションを含むログ出力（{count} レコード、4MB ごとにローテーション）")
+
+    def rotating_handler(path: str, compress: bool) -> logging.Handler:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=4 * 1024 * 1024, backupCount=3, encoding="utf-8"
+        )
+        if compress:
+            handler.rotator = _gzip_rotator
+        return handler
+
+    factories = (
+        ("RotatingFileHandler", lambda path: rotating_handler(path, False)),
+        (
+            "RotatingFileHandler + gzip rotator",
+            lambda path: rotating_handler(path, True),
+        ),
+        (
+            "BatchingRotatingFileHandler + gzip",
+            lambda path: BatchingRotatingFileHandler(
+                path,
+                max_bytes=4 * 1024 * 1024,
+                backup_count=3,
+                buffer_size=0,
+                flush_interval=0,
+                compression="gzip",
+            ),
+        ),
+    )
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    for label, factory in factories:
+        temp_dir = tempfile.mkdtemp()
+        try:
+            handler = factory(os.path.join(temp_dir, "app.log"))
+            handler.setFormatter(formatter)
+            logger = logging.getLogger(f"bench_rotation_{label}")
+            logger.propagate = False
+            logger.handlers = [handler]
+            logger.setLevel(logging.INFO)
+            samples = []
+            perf_counter_ns = time.perf_counter_ns
+            for i in range(count):
+                t = perf_counter_ns()
+                logger.info("処理中のレコード %d", i)
+                samples.append(perf_counter_ns() - t)
+            start = time.perf_counter()
+            handler.close()
+            close_ms = (time.perf_counter() - start) * 1e3
+            logger.handlers = []
+            samples.sort()
+            print(
+                f"{label:<36} p50 {_percentile(samples, 0.5):8.0f} ns  "
+                f"p99 {_percentile(samples, 0.99):8.0f} ns  "
+                f"max {samples[-1] / 1e6:7.2f} ms  close {close_ms:6.1f} ms"
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def _write_from_process(
+    worker: int, count: int, log_file: str, collector: Optional[str]
+) -> None:
+    """子プロセスでログを出力します。
+
+    Args:
+        worker: プロセスの番号
+        count: ログの出力回数
+        log_file: ログファイルのパス
+        collector: ログコレクタのソケットのパス
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        logger = Logger(
+            f"bench_worker{worker}",
+            log_file=log_file,
+            max_bytes=1024 * 1024,
+            backup_count=100,
+            collector=collector,
+        )
+        for i in range(count):
+            logger.info(f"worker {worker} 処理中のレコード {i}")
+        logger.close()
+
+
+def _scan_rotated_logs(log_file: str) -> Dict[str, int]:
+    """ローテーションしたログファイルを古い順に読み、行の数と順序を調べます。
+
+    Args:
+        log_file: ログファイルのパス
+
+    Returns:
+        ファイル数、行数、同じプロセスの前の行より古い番号の行の数
+    """
+    paths = glob.glob(log_file + ".*")
+    paths.sort(key=lambda path: int(path.rsplit(".", 1)[1]), reverse=True)
+    paths.append(log_file)
+    last: Dict[str, int] = {}
+    lines = out_of_order = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                # 例: "... - INFO - worker 3 処理中のレコード 42"
+                worker, index = line.split(" - ")[-1].split()[1::2]
+                lines += 1
+                if int(index) < last.get(worker, -1):
+                    out_of_order += 1
+                last[worker] = int(index)
+    return {"files": len(paths), "lines": lines, "out_of_order": out_of_order}
+
+
+def bench_multiprocess(processes: int = 4, count: int = 50000) -> None:
+    """複数のプロセスから同じログファイルに出力する場合の性能を計測します。
+
+    各プロセスが RotatingFileHandler で直接書き込む場合と、ログコレクタに
+    送る場合について、全プロセスが終了するまでの時間と、ローテーション後の
+    ファイルに残った行数を比較します。
+
+    Args:
+        processes: ログを出力するプロセスの数
+        count: 1プロセスあたりのログの出力回数
+    """
+    total = processes * count
+    print(
+        f"{processes} プロセスからのログ出力"
+        f"（合計 {total} レコード、1MB ごとにローテーション）"
+    )
+    for label, use_collector in (
+        ("RotatingFileHandler", False),
+        ("LogCollector", True),
+    ):
+        temp_dir = tempfile.mkdtemp()
+        log_file = os.path.join(temp_dir, "app.log")
+        collector = None
+        address = None
+        try:
+            if use_collector:
+                address = os.path.join(temp_dir, "log.sock")
+                handler = BatchingRotatingFileHandler(
+                    log_file, max_bytes=1024 * 1024, backup_count=100
+                )
+                collector = LogCollector(address, handler)
+                collector.start()
+            start = time.perf_counter()
+            workers = [
+                multiprocessing.Process(
+                    target=_write_from_process, args=(n, count, log_file, address)
+                )
+                for n in range(processes)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if collector is not None:
+                collector.close()
+            elapsed = time.perf_counter() - start
+
+            result = _scan_rotated_logs(log_file)
+            print(
+                f"{label:<40} {total / elapsed:10.0f} records/s  "
+                f"lines {result['lines']}/{total}  files {result['files']}  "
+                f"out of order {result['out_of_order']}"
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_disabled_debug()
+    bench_flight_recorder()
+    bench_file_handlers()
+    bench_json_formatter()
+    bench_timestamp_formatter()
+    bench_sampling()
+    bench_compressed_rotation()
+    bench_multiprocess()
+    bench_logger_info()
+    bench_logger_info(queue_size=1000, overflow="drop_new")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""メトリクスモジュールのベンチマーク。
+
+このモジュールは、メトリクスモジュール（src.core.metrics）の記録1回あたりの
+時間とメモリの確保を計測します。
+
+使用例:
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+import tracemalloc
+from typing import Callable
+
+from src.core.metrics import MetricsRegistry
+
+
+def _ns_per_call(func: Callable[[], None], count: int) -> float:
+    """1回の呼び出しにかかる時間（ナノ秒）を計測します。
+
+    Args:
+        func: 計測する関数
+        count: 呼び出す回数
+
+    Returns:
+        5回計測したうちの最小の時間
+    """
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            func()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / count
+
+
+def bench_record(count: int = 200000) -> None:
+    """メトリクスの記録1回あたりの時間を計測します。
+
+    Args:
+        count: 記録する回数
+    """
+    metrics = MetricsRegistry()
+    counter = metrics.counter("records")
+    histogram = metrics.histogram("latency")
+    value = 0.003
+
+    def nothing() -> None:
+        pass
+
+    def timer() -> None:
+        with histogram.time():
+            pass
+
+    def registry_timer() -> None:
+        with metrics.time("phase"):
+            pass
+
+    cases = (
+        ("関数呼び出しのみ（基準）", nothing),
+        ("Counter.inc()", counter.inc),
+        ("Histogram.observe()", lambda: histogram.observe(value)),
+        ("with Histogram.time()", timer),
+        ("with MetricsRegistry.time(name)", registry_timer),
+    )
+    print(f"記録1回あたりの時間（{count} 回）")
+    for label, func in cases:
+        print(f"{label:<34} {_ns_per_call(func, count):8.0f} ns")
+
+
+def bench_allocation(count: int = 100000) -> None:
+    """ヒストグラムへの記録で確保されるメモリを計測します。
+
+    Args:
+        count: 記録する回数
+    """
+    histogram = MetricsRegistry().histogram("latency")
+    values = [i * 1e-5 for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for value in values:
+        histogram.observe(value)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(
+        f"{count} 回の Histogram.observe() で増えたメモリ: {grown} bytes "
+        f"（{grown / count:.2f} bytes/回）"
+    )
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_record()
+    bench_allocation()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""並列実行モジュールのベンチマーク。
+
+このモジュールは、並列実行モジュール（src.core.parallel）のワーカー数に
+対するスケーリングを計測します。
+
+使用例:
+    python -m benchmarks.bench_parallel
+"""
+
+import hashlib
+import os
+import time
+from typing import Callable, List
+
+from src.core.parallel import ParallelExecutor
+
+
+def _cpu_task(value: int) -> str:
+    """CPUを使う処理（ハッシュの繰り返し計算）。"""
+    digest = str(value).encode()
+    for _ in range(200):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()
+
+
+def _io_task(value: int) -> int:
+    """I/Oを待つ処理（1msの待機）。"""
+    time.sleep(0.001)
+    return value
+
+
+def _throughput(
+    mode: str, workers: int, func: Callable[[int], object], count: int
+) -> float:
+    """1秒あたりの処理件数を計測します。
+
+    Args:
+        mode: 実行モード
+        workers: ワーカーの数
+        func: 計測する関数
+        count: 処理する件数
+
+    Returns:
+        3回計測したうちの最大の処理件数（件/秒）
+    """
+    best = float("inf")
+    with ParallelExecutor(mode, workers=workers, chunk_size=50) as executor:
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in executor.map(func, range(count)):
+                pass
+            best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def bench_scaling(max_workers: int = 0, count: int = 2000) -> None:
+    """ワーカーの数を1からmax_workersまで変えて処理件数を計測します。
+
+    Args:
+        max_workers: ワーカーの最大数。0の場合はCPUの数（最小4）を使用します。
+        count: 処理する件数
+    """
+    max_workers = max_workers or max(4, os.cpu_count() or 1)
+    worker_counts: List[int] = sorted(
+        {n for n in (1, 2, 4, max_workers) if n <= max_workers}
+    )
+    print(f"ワーカー数に対するスケーリング（CPUの数: {os.cpu_count()}）")
+    for task_name, func in (("CPU", _cpu_task), ("I/O", _io_task)):
+        serial = _throughput("serial", 1, func, count)
+        print(f"{task_name:<4} serial            {serial:10.0f} records/s  x1.00")
+        for mode in ("thread", "process"):
+            for workers in worker_counts:
+                rate = _throughput(mode, workers, func, count)
+                print(
+                    f"{task_name:<4} {mode:<7} workers={workers:<2} "
+                    f"{rate:10.0f} records/s  x{rate / serial:.2f}"
+                )
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_scaling()
+
+
+if __name__ == "__main__":
+    main()
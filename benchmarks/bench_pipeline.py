@@ -0,0 +1,96 @@
+"""パイプラインモジュールのベンチマーク。
+
+このモジュールは、パイプラインモジュール（src.core.pipeline）の性能を計測します。
+
+使用例:
+    python -m benchmarks.bench_pipeline
+"""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+from src.core.pipeline import Pipeline, Stage
+
+
+def _rows(count: int) -> Iterator[str]:
+    """計測用のCSV形式の行を生成します。
+
+    Args:
+        count: 生成する行の数
+    """
+    for i in range(count):
+        yield f"{i},user{i % 1000},{i * 0.5}"
+
+
+def _parse(line: str) -> Dict[str, Any]:
+    """CSV形式の行を辞書に変換します。"""
+    row_id, user, amount = line.split(",")
+    return {"id": int(row_id), "user": user, "amount": float(amount)}
+
+
+def _measure(label: str, func: Callable[[], Any], count: int) -> None:
+    """関数の処理件数とメモリ使用量のピークを表示します。
+
+    tracemalloc は実行時間に影響するため、メモリ使用量は別に実行して計測します。
+
+    Args:
+        label: 表示ラベル
+        func: 計測する関数
+        count: 処理するレコードの数
+    """
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<36} {count / elapsed:10.0f} records/s  "
+        f"peak {peak / 1024 / 1024:8.1f} MiB"
+    )
+
+
+def bench_pipeline(count: int = 200000) -> None:
+    """リストで一括処理する場合とパイプラインで処理する場合を比較します。
+
+    Args:
+        count: 処理するレコードの数
+    """
+    totals: Dict[str, float] = {}
+
+    def write_batch(batch: List[Dict[str, Any]]) -> None:
+        for row in batch:
+            totals[row["user"]] = totals.get(row["user"], 0.0) + row["amount"]
+
+    def in_memory() -> None:
+        rows = [_parse(line) for line in _rows(count)]
+        rows = [row for row in rows if row["amount"] > 10]
+        write_batch(rows)
+
+    def pipeline(buffer_size: int) -> Callable[[], Any]:
+        return Pipeline(
+            lambda: _rows(count),
+            [
+                Stage("parse", _parse, buffer_size=buffer_size),
+                Stage("filter", lambda row: row if row["amount"] > 10 else None),
+            ],
+            Stage("write", write_batch, batch_size=1000),
+        ).run
+
+    print(f"{count} 件のレコードの処理")
+    _measure("リストで一括処理", in_memory, count)
+    _measure("Pipeline", pipeline(0), count)
+    _measure("Pipeline (buffer_size=10000)", pipeline(10000), count)
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_pipeline()
+
+
+if __name__ == "__main__":
+    main()
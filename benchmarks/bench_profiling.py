@@ -0,0 +1,71 @@
+"""プロファイリングモジュールのベンチマーク。
+
+このモジュールは、プロファイリングモジュール（src.core.profiling）の
+計測方法ごとのオーバーヘッドを計測します。
+
+使用例:
+    python -m benchmarks.bench_profiling
+"""
+
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from src.core.profiling import Profiler
+
+
+def _parse(line: str) -> Dict[str, str]:
+    """関数呼び出しの多い処理（1行の解析）。"""
+    key, _, value = line.partition("=")
+    return {"key": key.strip(), "value": value.strip()}
+
+
+def _workload(count: int) -> List[Dict[str, str]]:
+    """計測対象の処理。"""
+    return [_parse(f"key{i} = value{i}") for i in range(count)]
+
+
+def bench_overhead(count: int = 200000) -> None:
+    """計測方法ごとに処理時間を比較します。
+
+    Args:
+        count: 処理する行の数
+    """
+    temp_dir = tempfile.mkdtemp()
+    cases: List[tuple] = [
+        ("計測なし", None, None),
+        ("cpu（cProfile）", "cpu", None),
+        ("cpu（サンプリング 10ms）", "cpu", 0.01),
+        ("cpu（サンプリング 1ms）", "cpu", 0.001),
+        ("memory（tracemalloc）", "memory", None),
+    ]
+    print(f"{count} 行の解析にかかる時間（3回の最小値）")
+    try:
+        baseline = 0.0
+        for label, mode, interval in cases:
+            best = float("inf")
+            for _ in range(3):
+                profiler: Optional[Profiler] = None
+                if mode is not None:
+                    profiler = Profiler(mode, temp_dir, sample_interval=interval)
+                    profiler.start()
+                start = time.perf_counter()
+                _workload(count)
+                elapsed = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.stop()
+                best = min(best, elapsed)
+            baseline = baseline or best
+            print(f"{label:<28} {best:8.3f} s  x{best / baseline:.2f}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def main() -> None:
+    """すべてのベンチマークを実行します。"""
+    bench_overhead()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,16 @@ argparseを使用したコマンドライン引数の処理、サブコマンド
 """
 
 import argparse
+import asyncio
+import signal
 import sys
-from typing import List, Optional
+from typing import Any, List, Optional
 
+from src.core.collector import LogCollector
+from src.core.config import ConfigManager
+from src.core.handlers import BatchingRotatingFileHandler
 from src.core.main import Application
+from src.core.profiling import PROFILE_MODES, Profiler
 
 
 class CLI:
@@ -51,6 +57,21 @@ class CLI:
             choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
             default="INFO",
         )
+        parser.add_argument(
+            "--config-cache-dir",
+            help="解析済みの設定をキャッシュするディレクトリ",
+            default=None,
+        )
+        parser.add_argument(
+            "--config-stats",
+            action="store_true",
+            help="設定アクセスの統計を集計し、実行終了時にログに出力",
+        )
+        parser.add_argument(
+            "--metrics-file",
+            help="実行終了時にフェーズごとの時間などのメトリクスをJSONで書き込むファイル",
+            default=None,
+        )
         parser.add_argument(
             "-v", "--version", action="store_true", help="バージョン情報を表示して終了"
         )
@@ -65,6 +86,67 @@ class CLI:
         run_parser.add_argument(
             "--option", help="オプション引数の例", default="default_value"
         )
+        run_parser.add_argument(
+            "--mode",
+            choices=["serial", "thread", "process"],
+            help="実行モード（省略時は設定の execution.mode、未設定の場合は serial）",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--workers",
+            type=int,
+            help="ワーカーの数（省略時は設定の execution.workers、未設定の場合はCPUの数）",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="1つのチャンクのレコード数（省略時は設定の execution.chunk_size）",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--unordered",
+            action="store_const",
+            const=False,
+            dest="ordered",
+            help="結果を投入した順ではなく完了した順に受け取る",
+        )
+        run_parser.add_argument(
+            "--async",
+            action="store_const",
+            const=True,
+            dest="async_mode",
+            help="1つのイベントループ上で非同期に実行（省略時は設定の execution.async）",
+        )
+        run_parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="非同期に同時実行するタスクの最大数（省略時は設定の execution.concurrency）",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--task-timeout",
+            type=float,
+            help="非同期タスク1つのタイムアウト秒数（省略時は設定の execution.task_timeout）",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--profile",
+            choices=PROFILE_MODES,
+            help="実行中のCPU時間（cProfile）とメモリの確保（tracemalloc）を計測",
+            default=None,
+        )
+        run_parser.add_argument(
+            "--profile-dir",
+            help="プロファイルのレポートを書き込むディレクトリ",
+            default="profiles",
+        )
+        run_parser.add_argument(
+            "--profile-interval",
+            type=float,
+            help="CPU時間を cProfile の代わりにこの秒数の間隔のサンプリングで計測",
+            default=None,
+        )
 
         # initコマンド
         init_parser = subparsers.add_parser("init", help="アプリケーションを初期化")
@@ -72,6 +154,21 @@ class CLI:
             "--force", action="store_true", help="既存の設定を上書き"
         )
 
+        # collectorコマンド
+        collector_parser = subparsers.add_parser(
+            "collector", help="複数のプロセスのログを1つのファイルに書き込むコレクタを起動"
+        )
+        collector_parser.add_argument(
+            "--socket",
+            help="接続を受け付けるソケットのパス（省略時は設定の logging.collector）",
+            default=None,
+        )
+        collector_parser.add_argument(
+            "--log-file",
+            help="ログファイルのパス（省略時は設定の logging.file）",
+            default=None,
+        )
+
         return parser
 
     def parse_args(self, args: Optional[List[str]] = None) -> argparse.Namespace:
@@ -82,8 +179,16 @@ class CLI:
 
         Returns:
             解析された引数
+
+        Raises:
+            SystemExit: 引数が不正な場合、または --profile を指定せずに
+                --profile-interval を指定した場合
         """
-        return self.parser.parse_args(args)
+        parsed_args = self.parser.parse_args(args)
+        interval = getattr(parsed_args, "profile_interval", None)
+        if interval is not None and parsed_args.profile is None:
+            self.parser.error("--profile-interval は --profile と併用してください")
+        return parsed_args
 
     def run(self, args: Optional[List[str]] = None) -> int:
         """CLIを実行します。
@@ -106,23 +211,120 @@ class CLI:
         # コマンドの実行
         try:
             if parsed_args.command == "run":
-                app = Application(
-                    config_path=parsed_args.config, log_level=parsed_args.log_level
-                )
-                app.run()
+                self._run_command(parsed_args)
             elif parsed_args.command == "init":
                 self._init_command(parsed_args)
+            elif parsed_args.command == "collector":
+                self._collector_command(parsed_args)
             else:
                 # デフォルトはrunコマンドと同じ
-                app = Application(
-                    config_path=parsed_args.config, log_level=parsed_args.log_level
-                )
-                app.run()
+                self._run_command(parsed_args)
             return 0
+        except asyncio.CancelledError:
+            print("実行がキャンセルされました", file=sys.stderr)
+            return 1
         except Exception as e:
             print(f"エラー: {e}", file=sys.stderr)
             return 1
 
+    def _create_application(self, args: argparse.Namespace) -> Application:
+        """解析された引数からアプリケーションを作成します。
+
+        Args:
+            args: 解析された引数
+
+        Returns:
+            作成されたアプリケーション
+        """
+        return Application(
+            config_path=args.config,
+            log_level=args.log_level,
+            config_cache_dir=args.config_cache_dir,
+            config_stats=args.config_stats,
+            metrics_file=args.metrics_file,
+            # サブコマンドを省略した場合は run のオプションが存在しない
+            execution_mode=getattr(args, "mode", None),
+            workers=getattr(args, "workers", None),
+            chunk_size=getattr(args, "chunk_size", None),
+            ordered=getattr(args, "ordered", None),
+            async_mode=getattr(args, "async_mode", None),
+            concurrency=getattr(args, "concurrency", None),
+            task_timeout=getattr(args, "task_timeout", None),
+        )
+
+    def _run_command(self, args: argparse.Namespace) -> None:
+        """runコマンドを実行します。
+
+        --profile が指定された場合は、アプリケーションの実行を計測し、
+        --profile-dir にレポートを書き込みます。
+
+        Args:
+            args: 解析された引数
+        """
+        app = self._create_application(args)
+        # サブコマンドを省略した場合は run のオプションが存在しない
+        profile = getattr(args, "profile", None)
+        if profile is None:
+            self._run_application(app)
+            return
+
+        profiler = Profiler(
+            profile, args.profile_dir, sample_interval=args.profile_interval
+        )
+        try:
+            with profiler:
+                self._run_application(app)
+        finally:
+            for path in profiler.files:
+                print(f"プロファイルを出力しました: {path}", file=sys.stderr)
+
+    def _run_application(self, app: Application) -> None:
+        """アプリケーションを実行します。
+
+        async_mode が有効な場合は、イベントループ上で run_async() を実行します。
+
+        Args:
+            app: 実行するアプリケーション
+        """
+        if app.async_mode:
+            asyncio.run(app.run_async())
+        else:
+            app.run()
+
+    def _collector_command(self, args: argparse.Namespace) -> None:
+        """collectorコマンドを実行します。
+
+        SIGINT または SIGTERM を受け取るまでログを受け付け、
+        受信済みのログを書き込んでから終了します。
+
+        Args:
+            args: 解析された引数
+
+        Raises:
+            ValueError: ソケットまたはログファイルのパスが指定されていない場合
+        """
+        config = ConfigManager(args.config, cache_dir=args.config_cache_dir)
+        address = args.socket or config.get("logging.collector")
+        log_file = args.log_file or config.get("logging.file")
+        if not address:
+            raise ValueError("ソケットのパスが指定されていません")
+        if not log_file:
+            raise ValueError("ログファイルのパスが指定されていません")
+
+        # ローテーションの設定は Logger の既定値と同じにする
+        handler = BatchingRotatingFileHandler(
+            log_file, max_bytes=10485760, backup_count=5
+        )
+        collector = LogCollector(address, handler)
+
+        def stop(signum: int, frame: Any) -> None:
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, stop)
+        collector.start()
+        print(f"ログコレクタを起動しました: {address} -> {log_file}")
+        collector.serve_forever()
+
     def _init_command(self, args: argparse.Namespace) -> None:
         """initコマンドを実行します。
 
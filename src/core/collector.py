@@ -0,0 +1,302 @@
+"""ログコレクタモジュール。
+
+このモジュールは、複数のプロセスのログを1つのプロセスで受け取り、
+同じログファイルに書き込む機能を提供します。
+
+各プロセスの CollectorHandler はフォーマットしたレコードをまとめて
+Unixドメインソケットで送り、LogCollector がそれを受け取って
+ログファイルへの書き込みとローテーションを一手に行います。
+"""
+
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from src.core.handlers import BatchingRotatingFileHandler
+
+# 送信するまとまりの先頭に付けるバイト数（ビッグエンディアンの符号なし32ビット）
+_HEADER = struct.Struct(">I")
+
+
+class CollectorHandler(logging.Handler):
+    """フォーマットしたレコードをまとめてログコレクタに送るハンドラ。
+
+    レコードはこのプロセスでフォーマットしてバッファに溜め、バッファが
+    batch_size に達したとき、flush_level 以上のレコードを受け取ったとき、
+    または flush_interval 秒ごとに、1回の送信でまとめて送ります。
+
+    コレクタに接続できない場合や送信に失敗した場合は、そのまとまりを
+    捨てて数え、次の送信時に接続し直します。プロセスを fork した後は
+    子プロセスで新しく作成してください。
+
+    Attributes:
+        address: ログコレクタのソケットのパス
+        batch_size: まとめて送るバッファのサイズ（バイト）
+        flush_interval: バッファを送る間隔（秒）。0の場合は定期的に送りません。
+        flush_level: このレベル以上のレコードを受け取るとすぐに送ります。
+        dropped: 送信できずに捨てたレコードの数
+    """
+
+    terminator = "\n"
+
+    def __init__(
+        self,
+        address: str,
+        batch_size: int = 65536,
+        flush_interval: float = 0.5,
+        flush_level: int = logging.ERROR,
+        encoding: str = "utf-8",
+    ) -> None:
+        """CollectorHandlerを初期化します。
+
+        接続は最初の送信時に行います。
+
+        Args:
+            address: ログコレクタのソケットのパス
+            batch_size: まとめて送るバッファのサイズ（バイト）
+            flush_interval: バッファを送る間隔（秒）。0の場合は定期的に送りません。
+            flush_level: このレベル以上のレコードを受け取るとすぐに送ります。
+            encoding: レコードの文字コード
+        """
+        super().__init__()
+        self.address = address
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.encoding = encoding
+        self.dropped = 0
+        self._buffer = bytearray()
+        self._buffered_records = 0
+        self._socket: Optional[socket.socket] = None
+
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="log-shipper", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        """flush_interval 秒ごとにバッファを送ります。"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """レコードをフォーマットしてバッファに追加します。
+
+        Args:
+            record: ログレコード
+        """
+        try:
+            self._buffer += (self.format(record) + self.terminator).encode(
+                self.encoding
+            )
+            self._buffered_records += 1
+            if (
+                len(self._buffer) >= self.batch_size
+                or record.levelno >= self.flush_level
+            ):
+                self._send_buffer()
+        except RecursionError:  # pragma: no cover - logging と同じ扱い
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _send_buffer(self) -> None:
+        """バッファの内容をコレクタに送ります。
+
+        呼び出し元でロックを取得している必要があります。
+        """
+        if not self._buffer:
+            return
+        data = _HEADER.pack(len(self._buffer)) + self._buffer
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.connect(self.address)
+            self._socket.sendall(data)
+        except OSError as e:
+            self._close_socket()
+            self.dropped += self._buffered_records
+            sys.stderr.write(f"ログコレクタに送信できませんでした: {self.address}: {e}\n")
+        finally:
+            del self._buffer[:]
+            self._buffered_records = 0
+
+    def _close_socket(self) -> None:
+        """コレクタとの接続を閉じます。"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def flush(self) -> None:
+        """バッファの内容をコレクタに送ります。"""
+        with self.lock:  # type: ignore[union-attr]
+            self._send_buffer()
+
+    def close(self) -> None:
+        """バッファの内容を送り、コレクタとの接続を閉じます。"""
+        self._stop_event.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        with self.lock:  # type: ignore[union-attr]
+            try:
+                self._send_buffer()
+            finally:
+                self._close_socket()
+        super().close()
+
+
+class LogCollector:
+    """複数のプロセスから送られたログを1つのファイルに書き込むクラス。
+
+    Unixドメインソケットで接続を受け付け、接続ごとのスレッドで
+    CollectorHandler が送ったまとまりを受け取り、handler に書き込みます。
+    ログファイルへの書き込みとローテーションはこのプロセスだけが行うため、
+    複数のプロセスが同じログファイルを使用しても行が失われません。
+
+    Attributes:
+        address: 接続を受け付けるソケットのパス
+        handler: 受け取ったログを書き込むハンドラ
+        received: 受け取ったまとまりの数
+    """
+
+    accept_timeout = 0.2
+
+    def __init__(self, address: str, handler: BatchingRotatingFileHandler) -> None:
+        """LogCollectorを初期化します。
+
+        Args:
+            address: 接続を受け付けるソケットのパス
+            handler: 受け取ったログを書き込むハンドラ
+        """
+        self.address = address
+        self.handler = handler
+        self.received = 0
+        self._server: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self._connections: Dict[socket.socket, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        """ソケットを作成し、接続の受け付けを開始します。
+
+        前回の実行で残ったソケットファイルは削除します。
+
+        Raises:
+            OSError: ソケットを作成できない場合
+        """
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.address)
+        server.listen()
+        # close() で停止できるように、一定時間ごとに accept() から戻る
+        server.settimeout(self.accept_timeout)
+        self._server = server
+        self._accept_thread = threading.Thread(
+            target=self._accept, args=(server,), name="log-collector", daemon=True
+        )
+        self._accept_thread.start()
+
+    def serve_forever(self) -> None:
+        """close() が呼び出されるか、割り込まれるまで接続を受け付けます。"""
+        if self._server is None:
+            self.start()
+        try:
+            self._stop_event.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def _accept(self, server: socket.socket) -> None:
+        """接続を受け付け、接続ごとに受信用のスレッドを開始します。
+
+        Args:
+            server: 接続を受け付けるソケット
+        """
+        while not self._stop_event.is_set():
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return  # close() でソケットが閉じられた
+            connection.settimeout(None)
+            thread = threading.Thread(
+                target=self._receive,
+                args=(connection,),
+                name="log-collector-connection",
+                daemon=True,
+            )
+            with self._lock:
+                self._connections[connection] = thread
+            thread.start()
+
+    def _receive(self, connection: socket.socket) -> None:
+        """接続が閉じられるまで、まとまりを受け取って書き込みます。
+
+        Args:
+            connection: CollectorHandler との接続
+        """
+        try:
+            with connection, connection.makefile("rb") as stream:
+                while True:
+                    header = stream.read(_HEADER.size)
+                    if len(header) < _HEADER.size:
+                        return
+                    (length,) = _HEADER.unpack(header)
+                    data = stream.read(length)
+                    if len(data) < length:
+                        return
+                    self.handler.write(data)
+                    with self._lock:
+                        self.received += 1
+        except OSError:
+            pass  # close() で接続が閉じられた
+        finally:
+            with self._lock:
+                self._connections.pop(connection, None)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """接続の受け付けを停止し、受信済みのログを書き込んでから閉じます。
+
+        各接続が送信側から閉じられるまで最大 timeout 秒待ち、
+        それ以降に届いたログは受け取りません。
+
+        Args:
+            timeout: 接続が閉じられるまで待つ時間（秒）
+        """
+        with self._lock:
+            server, self._server = self._server, None
+        self._stop_event.set()
+        if server is None:
+            return
+        if self._accept_thread is not None:
+            self._accept_thread.join()
+        server.close()
+
+        with self._lock:
+            connections = dict(self._connections)
+        deadline = time.monotonic() + timeout
+        for thread in connections.values():
+            thread.join(max(0.0, deadline - time.monotonic()))
+        for connection, thread in connections.items():
+            if thread.is_alive():
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                thread.join()
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        self.handler.close()
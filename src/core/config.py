@@ -3,14 +3,382 @@
 このモジュールは、アプリケーションの設定を管理するための機能を提供します。
 YAML/JSON形式の設定ファイルの読み込み、環境変数からの設定値取得、
 およびデフォルト設定の提供をサポートします。
+
+複数の設定ファイルを順に重ねて読み込むこともできます。各設定ファイルは
+トップレベルの "include" キーで他の設定ファイルを取り込めます。
+取り込まれた設定ファイルは取り込んだ設定ファイルより先に適用されます。
+
+例:
+    # base.yaml
+    database:
+      host: localhost
+      port: 5432
+
+    # production.yaml
+    include: base.yaml
+    database:
+      host: db.example.com
 """
 
+import hashlib
 import json
+import logging
+import marshal
 import os
-from typing import Any, Dict, Optional
+import pickle
+import tempfile
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import yaml
 
+from src.core.lazy import LazyDocument
+from src.core.schema import ConfigSchema, compile_schema
+from src.core.stats import ConfigStats
+from src.core.watcher import FileWatcher
+
+try:
+    # libyaml が利用可能な場合は C 実装のローダーを使用する
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - libyaml なしの環境
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# 設定値を上書きする環境変数の接頭辞
+ENV_PREFIX = "APP_"
+
+# 他の設定ファイルを取り込むためのキー
+INCLUDE_KEY = "include"
+
+# get() でキーが存在しないことを表す番兵
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+# 設定変更の通知先。引数は (購読したキーの接頭辞, 変更前の値, 変更後の値)
+ConfigListener = Callable[[str, Any, Any], None]
+
+
+def _flatten(node: Any, prefix: str, index: Dict[str, Any]) -> None:
+    """ネストされた辞書をドット区切りキーの平坦なインデックスに展開します。
+
+    中間の辞書ノードも自身のキーで登録されます。文字列以外のキーや
+    ドットを含むキーはドット区切りのパスで到達できないため登録しません。
+
+    Args:
+        node: 展開する値
+        prefix: 登録するキーの接頭辞（末尾のドットを含む）
+        index: 展開先のインデックス
+    """
+    if not isinstance(node, dict):
+        return
+    for k, v in node.items():
+        if not isinstance(k, str) or "." in k:
+            continue
+        path = prefix + k
+        index[path] = v
+        if isinstance(v, dict):
+            _flatten(v, path + ".", index)
+
+
+def _cache_file_path(cache_dir: str, config_path: str) -> str:
+    """設定ファイルに対応するキャッシュファイルのパスを返します。
+
+    Args:
+        cache_dir: キャッシュディレクトリ
+        config_path: 設定ファイルの絶対パス
+
+    Returns:
+        キャッシュファイルのパス
+    """
+    name = hashlib.sha256(config_path.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, name + ".cache")
+
+
+def _read_cache(cache_file: str, cache_key: Tuple[Any, ...]) -> Any:
+    """キャッシュファイルから解析済みの設定を読み込みます。
+
+    Args:
+        cache_file: キャッシュファイルのパス
+        cache_key: 設定ファイルのパス、サイズ、更新時刻、内容のハッシュからなるキー
+
+    Returns:
+        解析済みの設定。キャッシュが存在しないか無効な場合は _MISSING。
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            stored_key, fmt, payload = marshal.loads(f.read())
+        if tuple(stored_key) != cache_key:
+            return _MISSING
+        if fmt == "marshal":
+            return marshal.loads(payload)
+        return pickle.loads(payload)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return _MISSING
+
+
+def _write_cache(cache_file: str, cache_key: Tuple[Any, ...], data: Any) -> None:
+    """解析済みの設定をキャッシュファイルに書き込みます。
+
+    marshal で表現できる値は marshal で、日付などを含む場合は pickle で
+    直列化します。書き込みは一時ファイルからの置き換えで行うため、
+    並行して起動したプロセスが書きかけのキャッシュを読むことはありません。
+    キャッシュの書き込みに失敗しても例外は送出しません。
+
+    Args:
+        cache_file: キャッシュファイルのパス
+        cache_key: キャッシュのキー
+        data: 解析済みの設定
+    """
+    try:
+        fmt, payload = "marshal", marshal.dumps(data)
+    except ValueError:
+        fmt, payload = "pickle", pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(marshal.dumps((cache_key, fmt, payload)))
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """設定ファイルの変更検出に使用する更新時刻とサイズを返します。
+
+    Args:
+        path: 設定ファイルのパス
+
+    Returns:
+        (更新時刻(ns), サイズ)。ファイルが存在しない場合は None。
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _copy_dicts(value: Any) -> Any:
+    """値に含まれる辞書をすべて新しい辞書に複製します。
+
+    辞書以外の値は複製せずに共有します。
+
+    Args:
+        value: 複製する値
+
+    Returns:
+        複製された値
+    """
+    if isinstance(value, dict):
+        return {k: _copy_dicts(v) for k, v in value.items()}
+    return value
+
+
+def _merge_into(target: Dict[str, Any], override: Dict[str, Any]) -> None:
+    """target に override を深くマージします。
+
+    両方の値が辞書の場合は再帰的にマージし、それ以外は override の値で
+    置き換えます。target の辞書は override の辞書と共有されません。
+
+    Args:
+        target: マージ先の辞書。この辞書が変更されます。
+        override: マージする辞書
+    """
+    for k, v in override.items():
+        current = target.get(k)
+        if isinstance(v, dict) and isinstance(current, dict):
+            _merge_into(current, v)
+        else:
+            target[k] = _copy_dicts(v)
+
+
+def _drop_subtree(index: Dict[str, Any], key: str) -> None:
+    """インデックスから指定キー配下のエントリを削除します。
+
+    Args:
+        index: 対象のインデックス
+        key: 配下を削除するキー（キー自身は削除しません）
+    """
+    prefix = key + "."
+    for k in [k for k in index if k.startswith(prefix)]:
+        del index[k]
+
+
+class _ConfigLayer:
+    """解析済みの設定ファイル1つ分の内容。
+
+    再読み込み時に、更新時刻とサイズが変わっていない設定ファイルは
+    再解析せずにこの内容を再利用します。
+    """
+
+    __slots__ = ("path", "signature", "data", "includes")
+
+    def __init__(
+        self,
+        path: str,
+        signature: Tuple[int, int],
+        data: Dict[str, Any],
+        includes: List[str],
+    ) -> None:
+        """_ConfigLayerを初期化します。
+
+        Args:
+            path: 設定ファイルの絶対パス
+            signature: 読み込み時の (更新時刻(ns), サイズ)
+            data: "include" キーを除いた設定辞書
+            includes: 取り込む設定ファイルの絶対パスのリスト
+        """
+        self.path = path
+        self.signature = signature
+        self.data = data
+        self.includes = includes
+
+
+class _ConfigSnapshot:
+    """設定辞書とそのインデックスの組。
+
+    再読み込み時は新しいスナップショットを作成して属性1つの代入で
+    差し替えるため、参照側はロックなしで一貫した設定を読み取れます。
+
+    遅延読み込みの場合は、未解析のトップレベルのキーを pending に保持し、
+    参照されたときに解析して設定辞書とインデックスに追加します。
+    """
+
+    __slots__ = ("config", "index", "typed", "document", "pending", "lock")
+
+    def __init__(
+        self, config: Dict[str, Any], document: Optional[LazyDocument] = None
+    ) -> None:
+        """_ConfigSnapshotを初期化します。
+
+        Args:
+            config: 設定辞書
+            document: 遅延読み込みする設定ファイル
+        """
+        self.config = config
+        self.index: Optional[Dict[str, Any]] = None
+        self.typed: Any = None
+        self.document = document
+        self.pending: Set[Any] = set(document.keys()) if document else set()
+        self.lock = threading.Lock()
+
+    def build_index(self) -> Dict[str, Any]:
+        """設定辞書から平坦なインデックスを構築します。
+
+        Returns:
+            ドット区切りキーから設定値へのインデックス
+        """
+        # 遅延読み込み中のセクションの追加や set() と競合しないようにする
+        with self.lock:
+            index = self.index
+            if index is None:
+                index = {}
+                _flatten(self.config, "", index)
+                self.index = index
+        return index
+
+    def lookup(self, key: str) -> Any:
+        """インデックスから設定値を取得します。
+
+        Args:
+            key: 設定キー。空文字列の場合は設定全体を返します。
+
+        Returns:
+            設定値。キーが存在しない場合は _MISSING。
+        """
+        if not key:
+            return self.materialize()
+        index = self.index
+        if index is None:
+            index = self.build_index()
+        value = index.get(key, _MISSING)
+        if value is _MISSING and self.pending:
+            value = self.load_missing(key)
+        return value
+
+    def load_section(self, top: Any) -> None:
+        """未解析のトップレベルのキーを解析し、設定辞書に追加します。
+
+        Args:
+            top: トップレベルのキー
+
+        Raises:
+            ValueError: 値の解析に失敗した場合。
+        """
+        if self.document is None:
+            return
+        with self.lock:
+            if top not in self.pending:
+                return
+            value = self.document.load(top)
+            # 参照中のスレッドがあるため、ルートの辞書は書き換えずに差し替える
+            config = dict(self.config)
+            config[top] = value
+            self.config = config
+            index = self.index
+            if index is not None:
+                _flatten({top: value}, "", index)
+            self.pending.discard(top)
+
+    def load_missing(self, key: str) -> Any:
+        """インデックスにないキーのトップレベルのセクションを解析して値を返します。
+
+        Args:
+            key: 設定キー
+
+        Returns:
+            設定値。キーが存在しない場合は _MISSING。
+        """
+        self.load_section(key.split(".", 1)[0])
+        index = self.index
+        if index is None:
+            index = self.build_index()
+        return index.get(key, _MISSING)
+
+    def materialize(self) -> Dict[str, Any]:
+        """未解析のセクションをすべて解析し、設定辞書を返します。
+
+        Returns:
+            設定辞書
+        """
+        for top in list(self.pending):
+            self.load_section(top)
+        return self.config
+
+    def close(self) -> None:
+        """遅延読み込みする設定ファイルを閉じます。
+
+        差し替えられた後に呼び出します。古いスナップショットを参照中の
+        スレッドは解析済みの値だけを参照でき、未解析のセクションは
+        存在しないものとして扱われます。
+        """
+        if self.document is None:
+            return
+        with self.lock:
+            self.pending = set()
+            self.document.close()
+            self.document = None
+
 
 class ConfigManager:
     """設定を管理するクラス。
@@ -18,26 +386,319 @@ class ConfigManager:
     このクラスは、設定ファイルの読み込み、環境変数からの設定値取得、
     およびデフォルト設定の提供を行います。
 
+    設定値の取得は、ドット区切りキーから値への平坦なインデックスを
+    初回参照時に構築して行うため、階層の深さによらず辞書参照1回で済みます。
+    インデックスは set() で差分更新され、load_config() や config への代入で
+    破棄されます。
+
+    環境変数による上書きは、初期化時に "APP_" で始まる環境変数を一度だけ
+    走査したスナップショットから参照します。初期化後の環境変数の変更を
+    反映するには refresh_env() を呼び出すか、live_env を有効にしてください。
+
+    cache_dir を指定すると、解析済みの設定をディレクトリにキャッシュし、
+    設定ファイルのパス、サイズ、更新時刻、内容のハッシュが一致する間は
+    再解析せずにキャッシュを使用します。キャッシュには pickle を使用する
+    場合があるため、他のユーザーが書き込めるディレクトリは指定しないでください。
+
+    watch() を呼び出すと設定ファイルの変更を監視し、バックグラウンドで
+    再解析した設定を丸ごと差し替えます。get() はロックを取らずに、
+    差し替え前または差し替え後のどちらか一方の設定を参照します。
+    再読み込みすると set() で設定した値は破棄されます。
+
+    schema を指定すると、読み込んだ設定をスキーマに従って検証し、
+    属性アクセス可能なオブジェクトに変換したものを typed で参照できます。
+    変換と環境変数の値の型変換は読み込み時に一度だけ行われます。
+
+    複数の設定ファイルを読み込んだ場合、各ファイルの解析結果と
+    先頭からのマージ結果をキャッシュします。再読み込み時は変更された
+    ファイルだけを再解析し、最初に変更されたファイル以降だけをマージし直します。
+
+    lazy を有効にすると、設定ファイルのトップレベルのキーの位置だけを
+    索引し、各セクションは初めて参照されたときに解析します。遅延読み込みは
+    include を含まない単一の設定ファイルでのみ使用でき、cache_dir は
+    使用されません。config や typed を参照するとすべてのセクションを解析します。
+
+    thread_safe を有効にすると、set() は設定辞書を直接書き換えず、変更する
+    キーの経路上の辞書だけを複製して差し替えます（コピーオンライト）。
+    get() はロックを取らずに値を参照でき、get() で取得した辞書が他の
+    スレッドの set() で変更されることはありません。set() 同士は直列化されます。
+
+    enable_stats() を呼び出すと、キーごとの参照回数、デフォルト値への
+    フォールバック回数、環境変数による上書き回数、参照時間を stats に
+    集計します。無効な間の get() と set() には計測の処理が一切加わりません。
+
     Attributes:
         config: 設定値を格納する辞書
+        config_paths: 読み込んだ設定ファイルのパスのリスト
+        schema: 設定のスキーマ
+        thread_safe: set() をコピーオンライトで行うかどうか
+        stats: 設定アクセスの統計。enable_stats() を呼び出すまではNone。
     """
 
-    def __init__(self, config_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        config_path: Optional[Union[str, Sequence[str]]] = None,
+        live_env: bool = False,
+        cache_dir: Optional[str] = None,
+        schema: Optional[Type[ConfigSchema]] = None,
+        lazy: bool = False,
+        thread_safe: bool = False,
+    ) -> None:
         """ConfigManagerを初期化します。
 
         Args:
-            config_path: 設定ファイルのパス。指定された場合は、初期化時に読み込みます。
+            config_path: 設定ファイルのパス、またはパスのリスト。
+                指定された場合は、初期化時に読み込みます。
+            live_env: Trueの場合、スナップショットを使わず参照のたびに
+                os.environ を確認します。
+            cache_dir: 解析済みの設定をキャッシュするディレクトリ。
+                指定されない場合はキャッシュを使用しません。
+            schema: 設定のスキーマ。指定された場合は、読み込み時に設定を検証します。
+            lazy: Trueの場合、設定ファイルのトップレベルのセクションを
+                初めて参照されたときに解析します。
+            thread_safe: Trueの場合、set() をコピーオンライトで行い、
+                複数のスレッドから get() と set() を同時に呼び出せるようにします。
+
+        Raises:
+            ValueError: 設定がスキーマに適合しない場合。
         """
-        self.config: Dict[str, Any] = {}
+        self.cache_dir = cache_dir
+        self.schema = schema
+        self.lazy = lazy
+        self.thread_safe = thread_safe
+        self.stats: Optional[ConfigStats] = None
+        self.config_paths: List[str] = []
+        self._snapshot = _ConfigSnapshot({})
+        self._layer_cache: Dict[str, _ConfigLayer] = {}
+        self._layers: List[_ConfigLayer] = []
+        self._merged: List[Tuple[_ConfigLayer, Dict[str, Any]]] = []
+        self._listeners: List[Tuple[str, ConfigListener]] = []
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[FileWatcher] = None
+        self._watch_options: Tuple[float, bool] = (1.0, True)
+        self._split_cache: Dict[str, List[str]] = {}
+        self._live_env = live_env
+        self._env_source: Mapping[str, str] = {}
+        self._env_enabled = False
+        self._env_keys: Dict[str, str] = {}
+        self.refresh_env()
         if config_path:
             self.load_config(config_path)
 
-    def load_config(self, config_path: str) -> None:
+    @property
+    def config(self) -> Dict[str, Any]:
+        """設定値を格納する辞書。
+
+        辞書を直接書き換えた場合はインデックスに反映されないため、
+        値の変更には set() を使用するか、辞書を再代入してください。
+        遅延読み込みの場合は、未解析のセクションをすべて解析します。
+        """
+        return self._snapshot.materialize()
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._snapshot = _ConfigSnapshot(value)
+
+    @property
+    def typed(self) -> Any:
+        """スキーマに従って変換された設定オブジェクト。
+
+        set() や refresh_env() の後は、次回参照時に変換し直します。
+
+        Raises:
+            ValueError: スキーマが指定されていないか、設定がスキーマに適合しない場合。
+        """
+        snapshot = self._snapshot
+        typed = snapshot.typed
+        if typed is None:
+            typed = snapshot.typed = self._compile_typed(snapshot.materialize())
+        return typed
+
+    @property
+    def layer_paths(self) -> List[str]:
+        """取り込まれたものを含む、適用順の設定ファイルの絶対パスのリスト。"""
+        return [layer.path for layer in self._layers]
+
+    def load_config(self, config_path: Union[str, Sequence[str]]) -> None:
         """設定ファイルを読み込みます。
 
+        パスのリストを指定した場合は、先頭から順に深くマージします。
+        後の設定ファイルの値が優先されます。
+
+        Args:
+            config_path: 設定ファイルのパス、またはパスのリスト。
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルの形式が不正な場合、取り込みが循環している
+                場合、または設定がスキーマに適合しない場合。
+        """
+        paths = [config_path] if isinstance(config_path, str) else list(config_path)
+        with self._reload_lock:
+            if self.lazy:
+                snapshot, layers = self._open_lazy(paths)
+            else:
+                layers = self._collect_layers(paths)
+                snapshot = _ConfigSnapshot(self._merge_layers(layers))
+            if self.schema is not None:
+                snapshot.typed = self._compile_typed(snapshot.materialize())
+            old_snapshot, self._snapshot = self._snapshot, snapshot
+            self._layers = layers
+            self.config_paths = paths
+            old_snapshot.close()
+
+    def _open_lazy(
+        self, paths: Sequence[str]
+    ) -> Tuple[_ConfigSnapshot, List[_ConfigLayer]]:
+        """設定ファイルを遅延読み込み用に開きます。
+
+        Args:
+            paths: 設定ファイルのパスのリスト。要素は1つである必要があります。
+
+        Returns:
+            遅延読み込みするスナップショットと、変更検出用の設定ファイルの情報
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルが1つでない場合、include を含む場合、
+                または形式が遅延読み込みに対応していない場合。
+        """
+        if len(paths) != 1:
+            raise ValueError("遅延読み込みは単一の設定ファイルでのみ使用できます")
+        path = os.path.abspath(paths[0])
+        signature = _file_signature(path)
+        if signature is None:
+            raise FileNotFoundError(f"設定ファイルが見つかりません: {path}")
+        document = LazyDocument(path)
+        if INCLUDE_KEY in document:
+            document.close()
+            raise ValueError(f"遅延読み込みでは include を使用できません: {path}")
+        layer = _ConfigLayer(path, signature, {}, [])
+        return _ConfigSnapshot({}, document), [layer]
+
+    def _collect_layers(self, paths: Sequence[str]) -> List[_ConfigLayer]:
+        """取り込みを展開した、適用順の設定ファイルのリストを返します。
+
+        Args:
+            paths: 設定ファイルのパスのリスト
+
+        Returns:
+            適用順の設定ファイルの内容のリスト
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルの形式が不正な場合、または取り込みが
+                循環している場合。
+        """
+        layers: List[_ConfigLayer] = []
+        for path in paths:
+            self._collect_layer(os.path.abspath(path), layers, ())
+        return layers
+
+    def _collect_layer(
+        self, path: str, layers: List[_ConfigLayer], stack: Tuple[str, ...]
+    ) -> None:
+        """設定ファイルとその取り込み先を適用順に layers に追加します。
+
+        Args:
+            path: 設定ファイルの絶対パス
+            layers: 追加先のリスト
+            stack: 取り込み元の設定ファイルのパス（循環の検出に使用）
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルの形式が不正な場合、または取り込みが
+                循環している場合。
+        """
+        if path in stack:
+            chain = " -> ".join(stack + (path,))
+            raise ValueError(f"設定ファイルの取り込みが循環しています: {chain}")
+        layer = self._load_layer(path)
+        for include in layer.includes:
+            self._collect_layer(include, layers, stack + (path,))
+        layers.append(layer)
+
+    def _load_layer(self, path: str) -> _ConfigLayer:
+        """設定ファイルを読み込みます。変更されていなければキャッシュを返します。
+
+        Args:
+            path: 設定ファイルの絶対パス
+
+        Returns:
+            設定ファイルの内容
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルの形式が不正な場合。
+        """
+        signature = _file_signature(path)
+        if signature is None:
+            raise FileNotFoundError(f"設定ファイルが見つかりません: {path}")
+        cached = self._layer_cache.get(path)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        data = self._read_config(path)
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ValueError(f"設定ファイルの内容が辞書ではありません: {path}")
+
+        includes: List[str] = []
+        if INCLUDE_KEY in data:
+            raw_includes = data[INCLUDE_KEY]
+            if isinstance(raw_includes, str):
+                raw_includes = [raw_includes]
+            if not isinstance(raw_includes, list) or not all(
+                isinstance(p, str) for p in raw_includes
+            ):
+                raise ValueError(f"include の形式が不正です: {path}")
+            base_dir = os.path.dirname(path)
+            includes = [os.path.join(base_dir, p) for p in raw_includes]
+            data = {k: v for k, v in data.items() if k != INCLUDE_KEY}
+
+        layer = _ConfigLayer(path, signature, data, includes)
+        self._layer_cache[path] = layer
+        return layer
+
+    def _merge_layers(self, layers: List[_ConfigLayer]) -> Dict[str, Any]:
+        """設定ファイルの内容を先頭から順に深くマージします。
+
+        前回のマージ結果のうち、最初に変更された設定ファイルより前の
+        部分は再利用します。
+
+        Args:
+            layers: 適用順の設定ファイルの内容のリスト
+
+        Returns:
+            マージされた設定辞書
+        """
+        merged = self._merged
+        start = 0
+        while (
+            start < len(layers)
+            and start < len(merged)
+            and merged[start][0] is layers[start]
+        ):
+            start += 1
+        del merged[start:]
+
+        current: Dict[str, Any] = merged[-1][1] if merged else {}
+        for layer in layers[start:]:
+            current = _copy_dicts(current)
+            _merge_into(current, layer.data)
+            merged.append((layer, current))
+        return current
+
+    def _read_config(self, config_path: str) -> Any:
+        """設定ファイルを解析して返します。
+
         Args:
             config_path: 設定ファイルのパス。
 
+        Returns:
+            解析された設定
+
         Raises:
             FileNotFoundError: 設定ファイルが見つからない場合。
             ValueError: 設定ファイルの形式が不正な場合。
@@ -46,19 +707,180 @@ class ConfigManager:
             raise FileNotFoundError(f"設定ファイルが見つかりません: {config_path}")
 
         file_ext = os.path.splitext(config_path)[1].lower()
+        if file_ext not in (".json", ".yaml", ".yml"):
+            raise ValueError(f"サポートされていないファイル形式です: {file_ext}")
+
+        with open(config_path, "rb") as f:
+            content = f.read()
+            stat = os.fstat(f.fileno())
+
+        cache_file = None
+        cache_key: Tuple[Any, ...] = ()
+        if self.cache_dir:
+            abs_path = os.path.abspath(config_path)
+            cache_file = _cache_file_path(self.cache_dir, abs_path)
+            cache_key = (
+                abs_path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                hashlib.sha256(content).hexdigest(),
+            )
+            cached = _read_cache(cache_file, cache_key)
+            if cached is not _MISSING:
+                return cached
+
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                if file_ext == ".json":
-                    self.config = json.load(f)
-                elif file_ext in (".yaml", ".yml"):
-                    self.config = yaml.safe_load(f)
-                else:
-                    raise ValueError(
-                        f"サポートされていないファイル形式です: {file_ext}"
-                    )
-        except (json.JSONDecodeError, yaml.YAMLError) as e:
+            text = content.decode("utf-8")
+            if file_ext == ".json":
+                config = json.loads(text)
+            else:
+                config = yaml.load(text, Loader=_YamlLoader)
+        except (UnicodeDecodeError, json.JSONDecodeError, yaml.YAMLError) as e:
             raise ValueError(f"設定ファイルの解析に失敗しました: {e}")
 
+        if cache_file is not None:
+            _write_cache(cache_file, cache_key, config)
+        return config
+
+    def reload(self) -> bool:
+        """設定ファイルを再読み込みし、変更があれば設定を差し替えます。
+
+        新しい設定のインデックスを構築してから差し替えるため、get() を
+        呼び出しているスレッドが書きかけの設定を参照することはありません。
+        差し替え後、値が変化した接頭辞の購読者に通知します。
+
+        Returns:
+            設定が変更された場合はTrue
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルが読み込まれていないか、形式が不正な場合、
+                または設定がスキーマに適合しない場合。
+        """
+        if not self.config_paths:
+            raise ValueError("設定ファイルが読み込まれていません")
+        with self._reload_lock:
+            if self.lazy:
+                layer = self._layers[0]
+                if _file_signature(layer.path) == layer.signature:
+                    return False
+                new_snapshot, layers = self._open_lazy(self.config_paths)
+            else:
+                layers = self._collect_layers(self.config_paths)
+                new_snapshot = _ConfigSnapshot(self._merge_layers(layers))
+                new_snapshot.build_index()
+            if self.schema is not None:
+                new_snapshot.typed = self._compile_typed(new_snapshot.materialize())
+            old_snapshot = self._snapshot
+            self._layers = layers
+            if not self.lazy and new_snapshot.config == old_snapshot.config:
+                return False
+            self._snapshot = new_snapshot
+            try:
+                self._notify_listeners(old_snapshot, new_snapshot)
+            finally:
+                # 古いスナップショットが開いている設定ファイルを閉じる
+                old_snapshot.close()
+        return True
+
+    def subscribe(self, prefix: str, listener: ConfigListener) -> None:
+        """設定の変更通知を購読します。
+
+        再読み込みによって prefix 配下の値が変化した場合にだけ、
+        listener(prefix, 変更前の値, 変更後の値) が呼び出されます。
+        キーが存在しない場合の値は None です。
+
+        Args:
+            prefix: 購読するキーの接頭辞。空文字列の場合は設定全体。
+            listener: 通知を受け取る関数
+        """
+        self._listeners.append((prefix, listener))
+
+    def unsubscribe(self, prefix: str, listener: ConfigListener) -> None:
+        """設定の変更通知の購読を解除します。
+
+        Args:
+            prefix: subscribe() で指定した接頭辞
+            listener: subscribe() で指定した関数
+        """
+        self._listeners = [
+            (p, f) for p, f in self._listeners if (p, f) != (prefix, listener)
+        ]
+
+    def watch(self, interval: float = 1.0, use_inotify: bool = True) -> None:
+        """設定ファイルの変更監視を開始します。
+
+        変更を検出すると、バックグラウンドのスレッドで reload() を実行します。
+
+        Args:
+            interval: ポーリング間隔（秒）
+            use_inotify: Falseの場合、inotifyが利用可能でもポーリングを使用します。
+
+        Raises:
+            ValueError: 設定ファイルが読み込まれていない場合。
+        """
+        if not self.config_paths:
+            raise ValueError("設定ファイルが読み込まれていません")
+        self.stop_watching()
+        self._watch_options = (interval, use_inotify)
+        self._watcher = FileWatcher(
+            self.layer_paths,
+            self._reload_in_background,
+            interval=interval,
+            use_inotify=use_inotify,
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """設定ファイルの変更監視を停止します。"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _reload_in_background(self) -> None:
+        """監視スレッドから設定を再読み込みします。
+
+        書きかけのファイルなどで解析に失敗した場合は、現在の設定を維持します。
+        """
+        try:
+            self.reload()
+        except (OSError, ValueError) as e:
+            logger.warning(f"設定ファイルの再読み込みに失敗しました: {e}")
+            return
+        # 取り込む設定ファイルが変わった場合は監視対象を更新する
+        watcher = self._watcher
+        if watcher is not None and watcher.paths != self.layer_paths:
+            self.watch(*self._watch_options)
+
+    def _notify_listeners(
+        self, old_snapshot: _ConfigSnapshot, new_snapshot: _ConfigSnapshot
+    ) -> None:
+        """値が変化した接頭辞の購読者に通知します。
+
+        設定ファイルがその場で書き換えられた場合、差し替え前のスナップショットの
+        未解析のセクションは読み出せないため、存在しなかったものとして扱います。
+
+        Args:
+            old_snapshot: 差し替え前のスナップショット
+            new_snapshot: 差し替え後のスナップショット
+        """
+        for prefix, listener in list(self._listeners):
+            try:
+                old_value = old_snapshot.lookup(prefix)
+            except ValueError:
+                old_value = _MISSING
+            try:
+                new_value = new_snapshot.lookup(prefix)
+                if old_value == new_value:
+                    continue
+                listener(
+                    prefix,
+                    None if old_value is _MISSING else old_value,
+                    None if new_value is _MISSING else new_value,
+                )
+            except Exception:
+                logger.exception(f"設定変更の通知でエラーが発生しました: {prefix}")
+
     def get(self, key: str, default: Any = None) -> Any:
         """設定値を取得します。
 
@@ -74,21 +896,115 @@ class ConfigManager:
             設定値。キーが存在しない場合はデフォルト値。
         """
         # 環境変数から取得を試みる
-        env_key = "APP_" + key.upper().replace(".", "_")
-        env_value = os.environ.get(env_key)
-        if env_value is not None:
-            return env_value
+        if self._env_enabled:
+            env_key = self._env_keys.get(key)
+            if env_key is None:
+                env_key = self._env_keys[key] = self._to_env_key(key)
+            env_value = self._env_source.get(env_key)
+            if env_value is not None:
+                return env_value
 
         # 設定から取得
-        keys = key.split(".")
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
+        snapshot = self._snapshot
+        index = snapshot.index
+        if index is None:
+            index = snapshot.build_index()
+        value = index.get(key, _MISSING)
+        if value is _MISSING:
+            if not snapshot.pending:
+                return default
+            value = snapshot.load_missing(key)
+            if value is _MISSING:
                 return default
         return value
 
+    def get_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """複数の設定値をまとめて取得します。
+
+        すべての値を同じスナップショットから取得するため、途中で設定が
+        再読み込みされても、一貫した組み合わせの値が返されます。
+        環境変数による上書きは get() と同様に適用されます。
+
+        Args:
+            keys: 設定キーのリスト
+            default: キーが存在しない場合のデフォルト値。
+
+        Returns:
+            設定キーから設定値へのマッピング
+        """
+        index = self._plain_index()
+        if index is not None:
+            return {key: index.get(key, default) for key in keys}
+        keys = list(keys)
+        return dict(zip(keys, self._get_values(keys, default)))
+
+    def _plain_index(self) -> Optional[Dict[str, Any]]:
+        """辞書参照だけで設定値を取得できる場合に、インデックスを返します。
+
+        Returns:
+            環境変数による上書き、遅延読み込み中のセクション、統計の集計が
+            いずれもない場合はインデックス。それ以外の場合はNone。
+        """
+        snapshot = self._snapshot
+        if self._env_enabled or self.stats is not None or snapshot.pending:
+            return None
+        index = snapshot.index
+        if index is None:
+            index = snapshot.build_index()
+        return index
+
+    def _get_values(self, keys: Sequence[str], default: Any = None) -> List[Any]:
+        """複数の設定値を同じスナップショットから取得します。
+
+        環境変数による上書きと遅延読み込みを考慮します。それらがない場合は
+        _plain_index() のインデックスを直接参照してください。
+
+        Args:
+            keys: 設定キーのリスト
+            default: キーが存在しない場合のデフォルト値。
+
+        Returns:
+            keys と同じ順序の設定値のリスト
+        """
+        if self.stats is not None:
+            return [self.get(key, default) for key in keys]
+
+        snapshot = self._snapshot
+        index = snapshot.index
+        if index is None:
+            index = snapshot.build_index()
+        env_source = self._env_source if self._env_enabled else None
+        env_keys = self._env_keys
+        values = []
+        for key in keys:
+            if env_source is not None:
+                env_key = env_keys.get(key)
+                if env_key is None:
+                    env_key = env_keys[key] = self._to_env_key(key)
+                env_value = env_source.get(env_key)
+                if env_value is not None:
+                    values.append(env_value)
+                    continue
+            value = index.get(key, _MISSING)
+            if value is _MISSING and snapshot.pending:
+                value = snapshot.load_missing(key)
+            values.append(default if value is _MISSING else value)
+        return values
+
+    def view(self, prefix: str) -> "ConfigView":
+        """キーの接頭辞を固定した設定の参照オブジェクトを返します。
+
+        例: view("database").get("pool.size") は get("database.pool.size") と
+        同じ値を返します。
+
+        Args:
+            prefix: キーの接頭辞。空文字列の場合は設定全体。
+
+        Returns:
+            設定の参照オブジェクト
+        """
+        return ConfigView(self, prefix)
+
     def set(self, key: str, value: Any) -> None:
         """設定値を設定します。
 
@@ -96,13 +1012,304 @@ class ConfigManager:
             key: 設定キー。ドットで区切られた階層構造をサポートします。
             value: 設定値。
         """
-        keys = key.split(".")
-        config = self.config
+        keys = self._split_key(key)
+        snapshot = self._snapshot
+        if snapshot.pending:
+            snapshot.load_section(keys[0])
+        with snapshot.lock:
+            snapshot.typed = None
+            if self.thread_safe:
+                self._set_copy_on_write(snapshot, keys, key, value)
+                return
+
+            index = snapshot.index
+            config = config_root = snapshot.config
+            for i, k in enumerate(keys[:-1]):
+                if k not in config or not isinstance(config[k], dict):
+                    # 途中のキーが存在しないか辞書でない場合は、辞書に置き換える
+                    config[k] = {}
+                    if index is not None:
+                        index[".".join(keys[: i + 1])] = config[k]
+                config = config[k]
+
+            if self._merged and self._merged[-1][1] is config_root:
+                # キャッシュしたマージ結果を書き換えるため、再読み込み時は作り直す
+                self._merged.pop()
+            leaf = keys[-1]
+            if index is not None:
+                if isinstance(config.get(leaf), dict):
+                    _drop_subtree(index, key)
+                index[key] = value
+                _flatten(value, key + ".", index)
+            config[leaf] = value
+
+    @staticmethod
+    def _set_copy_on_write(
+        snapshot: _ConfigSnapshot, keys: List[str], key: str, value: Any
+    ) -> None:
+        """経路上の辞書だけを複製して設定値を設定します。
+
+        公開済みの辞書は変更せず、複製した辞書をインデックスに反映してから
+        ルートの辞書を差し替えます。インデックスには新しいエントリを先に
+        追加し、不要になったエントリを後から削除するため、get() が
+        変更されていないキーを見失うことはありません。
+        呼び出し元で snapshot.lock を取得している必要があります。
+
+        Args:
+            snapshot: 対象のスナップショット
+            keys: 分割された設定キー
+            key: 設定キー
+            value: 設定値
+        """
+        config_root = config = dict(snapshot.config)
+        updates: Dict[str, Any] = {}
         for i, k in enumerate(keys[:-1]):
-            if k not in config:
-                config[k] = {}
-            elif not isinstance(config[k], dict):
-                # 途中のキーが辞書でない場合は、辞書に置き換える
-                config[k] = {}
-            config = config[k]
+            child = config.get(k)
+            # 途中のキーが存在しないか辞書でない場合は、辞書に置き換える
+            child = dict(child) if isinstance(child, dict) else {}
+            config[k] = child
+            updates[".".join(keys[: i + 1])] = child
+            config = child
+        old_value = config.get(keys[-1])
         config[keys[-1]] = value
+
+        index = snapshot.index
+        if index is not None:
+            updates[key] = value
+            _flatten(value, key + ".", updates)
+            index.update(updates)
+            if isinstance(old_value, dict):
+                prefix = key + "."
+                for k in [k for k in index if k.startswith(prefix)]:
+                    if k not in updates:
+                        del index[k]
+        snapshot.config = config_root
+
+    def enable_stats(self) -> ConfigStats:
+        """設定アクセスの統計の集計を開始します。
+
+        get() と set() をインスタンス属性で計測付きのメソッドに差し替えるため、
+        無効な間は通常の呼び出しに計測のオーバーヘッドがかかりません。
+        既に有効な場合は、集計中の統計をそのまま返します。
+
+        Returns:
+            集計先の統計
+        """
+        if self.stats is None:
+            self.stats = ConfigStats()
+            self.get = self._get_with_stats  # type: ignore[method-assign]
+            self.set = self._set_with_stats  # type: ignore[method-assign]
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """設定アクセスの統計の集計を停止し、統計を破棄します。"""
+        self.stats = None
+        self.__dict__.pop("get", None)
+        self.__dict__.pop("set", None)
+
+    def _get_with_stats(self, key: str, default: Any = None) -> Any:
+        """参照を統計に記録しながら設定値を取得します。
+
+        Args:
+            key: 設定キー
+            default: キーが存在しない場合のデフォルト値。
+
+        Returns:
+            設定値。キーが存在しない場合はデフォルト値。
+        """
+        start = time.perf_counter_ns()
+        value = ConfigManager.get(self, key, _MISSING)
+        elapsed = time.perf_counter_ns() - start
+        stats = self.stats
+        if stats is not None:
+            env_hit = value is not _MISSING and self._env_value(key) is not None
+            stats.record_get(key, elapsed, value is _MISSING, env_hit)
+        return default if value is _MISSING else value
+
+    def _set_with_stats(self, key: str, value: Any) -> None:
+        """設定を統計に記録しながら設定値を設定します。
+
+        Args:
+            key: 設定キー
+            value: 設定値
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.record_set(key)
+        ConfigManager.set(self, key, value)
+
+    def refresh_env(self) -> None:
+        """環境変数のスナップショットを取り直します。
+
+        "APP_" で始まる環境変数を os.environ から走査し直します。
+        live_env が有効な場合は os.environ を直接参照するため、何もしません。
+        """
+        if self._live_env:
+            self._env_source = os.environ
+            self._env_enabled = True
+            self._snapshot.typed = None
+            return
+        overlay = {k: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+        self._env_source = overlay
+        self._env_enabled = bool(overlay)
+        self._snapshot.typed = None
+
+    def _env_value(self, key: str) -> Optional[str]:
+        """設定キーに対応する環境変数の値を返します。
+
+        Args:
+            key: 設定キー
+
+        Returns:
+            環境変数の値。存在しない場合はNone。
+        """
+        if not self._env_enabled:
+            return None
+        env_key = self._env_keys.get(key)
+        if env_key is None:
+            env_key = self._env_keys[key] = self._to_env_key(key)
+        return self._env_source.get(env_key)
+
+    def _compile_typed(self, config: Any) -> Any:
+        """設定をスキーマに従って変換します。
+
+        Args:
+            config: 設定辞書
+
+        Returns:
+            変換された設定オブジェクト
+
+        Raises:
+            ValueError: スキーマが指定されていないか、設定がスキーマに適合しない場合。
+        """
+        if self.schema is None:
+            raise ValueError("スキーマが指定されていません")
+        return compile_schema(self.schema, config, self._env_value)
+
+    @staticmethod
+    def _to_env_key(key: str) -> str:
+        """設定キーを対応する環境変数名に変換します。
+
+        Args:
+            key: 設定キー
+
+        Returns:
+            環境変数名。例: "database.host" -> "APP_DATABASE_HOST"
+        """
+        return ENV_PREFIX + key.upper().replace(".", "_")
+
+    def _split_key(self, key: str) -> List[str]:
+        """ドット区切りキーを分割します。分割結果はキーごとにキャッシュされます。
+
+        Args:
+            key: 設定キー
+
+        Returns:
+            分割されたキーのリスト
+        """
+        keys = self._split_cache.get(key)
+        if keys is None:
+            keys = self._split_cache[key] = key.split(".")
+        return keys
+
+
+class ConfigView:
+    """キーの接頭辞を固定して設定を参照するクラス。
+
+    相対キーから完全なキーへの変換結果をキャッシュし、値は設定マネージャの
+    平坦なインデックスから直接取得するため、1回の参照は ConfigManager.get() と
+    同程度の時間で済みます。値は参照のたびに現在のスナップショットから
+    取得するため、set() や再読み込みの結果が反映されます。環境変数による
+    上書き、遅延読み込み中のセクション、統計の集計がある場合は
+    ConfigManager.get() を経由して取得します。
+
+    Attributes:
+        prefix: キーの接頭辞
+    """
+
+    def __init__(self, manager: ConfigManager, prefix: str) -> None:
+        """ConfigViewを初期化します。
+
+        Args:
+            manager: 参照する設定マネージャ
+            prefix: キーの接頭辞。空文字列の場合は設定全体。
+        """
+        self.prefix = prefix.strip(".")
+        self._manager = manager
+        self._key_prefix = self.prefix + "." if self.prefix else ""
+        self._keys: Dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        """接頭辞を含む文字列表現を返します。"""
+        return f"ConfigView({self.prefix!r})"
+
+    def _full_key(self, key: str) -> str:
+        """相対キーを完全なキーに変換します。
+
+        Args:
+            key: 相対キー。空文字列の場合は接頭辞そのもの。
+
+        Returns:
+            完全なキー
+        """
+        full_key = self._keys.get(key)
+        if full_key is None:
+            full_key = self._key_prefix + key if key else self.prefix
+            self._keys[key] = full_key
+        return full_key
+
+    def get(self, key: str = "", default: Any = None) -> Any:
+        """相対キーの設定値を取得します。
+
+        Args:
+            key: 相対キー。空文字列の場合は接頭辞のキーの値。
+            default: キーが存在しない場合のデフォルト値。
+
+        Returns:
+            設定値。キーが存在しない場合はデフォルト値。
+        """
+        manager = self._manager
+        index = manager._snapshot.index
+        if index is not None and not manager._env_enabled and manager.stats is None:
+            # 変換済みの相対キーで、インデックスにある値は添字参照だけで返す
+            try:
+                return index[self._keys[key]]
+            except KeyError:
+                pass
+        # 遅延読み込み中のセクションの解析とデフォルト値は get() に任せる
+        return manager.get(self._full_key(key), default)
+
+    def get_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """複数の相対キーの設定値をまとめて取得します。
+
+        Args:
+            keys: 相対キーのリスト
+            default: キーが存在しない場合のデフォルト値。
+
+        Returns:
+            相対キーから設定値へのマッピング
+        """
+        manager = self._manager
+        keys = list(keys)
+        index = manager._plain_index()
+        if index is not None:
+            full_keys = self._keys
+            # 変換済みの相対キーの値がすべてインデックスにあれば添字参照だけで済む
+            try:
+                return {key: index[full_keys[key]] for key in keys}
+            except KeyError:
+                pass
+            return {key: index.get(self._full_key(key), default) for key in keys}
+        values = manager._get_values([self._full_key(key) for key in keys], default)
+        return dict(zip(keys, values))
+
+    def view(self, prefix: str) -> "ConfigView":
+        """接頭辞をさらに絞り込んだ参照オブジェクトを返します。
+
+        Args:
+            prefix: 相対キーの接頭辞
+
+        Returns:
+            設定の参照オブジェクト
+        """
+        return ConfigView(self._manager, self._full_key(prefix.strip(".")))
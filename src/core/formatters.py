@@ -0,0 +1,216 @@
+"""ログフォーマッタモジュール。
+
+このモジュールは、Logger で使用する独自のログフォーマッタを提供します。
+"""
+
+import json
+import logging
+import time
+from json.encoder import encode_basestring  # type: ignore[attr-defined]
+from typing import AbstractSet, Any, Dict, Mapping, Optional, Tuple
+
+# Logger から渡される呼び出しごとの追加フィールドを保持するレコードの属性名
+FIELDS_ATTR = "fields"
+
+# CachedTimeFormatter のタイムスタンプの形式
+TIMESTAMP_DATETIME = "datetime"  # 日時（logging.Formatter と同じ形式）
+TIMESTAMP_EPOCH = "epoch"  # UNIX時間の秒数
+TIMESTAMP_RELATIVE = "relative"  # logging モジュールの読み込みからの経過秒数
+_TIMESTAMPS = (TIMESTAMP_DATETIME, TIMESTAMP_EPOCH, TIMESTAMP_RELATIVE)
+
+# JsonFormatter が出力するキー。同名のフィールドには接頭辞を付ける
+_JSON_RESERVED_KEYS = frozenset({"ts", "level", "logger", "msg", "exc"})
+_JSON_FIELD_PREFIX = "extra_"
+
+
+def _dumps(value: Any) -> str:
+    """値をJSONに変換します。変換できない値は文字列として出力します。"""
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _field_name(name: str, taken: AbstractSet[str]) -> str:
+    """出力済みのキーと重複しないよう、必要に応じて接頭辞を付けた名前を返します。"""
+    while name in taken:
+        name = _JSON_FIELD_PREFIX + name
+    return name
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """秒単位の日時をキャッシュして %(asctime)s を作成するフォーマッタ。
+
+    logging.Formatter はレコードごとに time.strftime を呼び出しますが、
+    このフォーマッタは秒が変わったときだけ呼び出し、同じ秒のレコードでは
+    キャッシュした文字列にミリ秒を付け加えるだけです。出力は
+    logging.Formatter と同じです。
+
+    timestamp に "epoch" または "relative" を指定すると、%(asctime)s に
+    日時の代わりにUNIX時間、または logging モジュールの読み込みからの
+    経過時間をミリ秒までの秒数で出力します。LogRecord はモノトニック時計の
+    値を持たないため、"relative" はレコードの relativeCreated を使用します。
+
+    Attributes:
+        timestamp: タイムスタンプの形式（"datetime", "epoch", "relative"）
+    """
+
+    def __init__(
+        self,
+        fmt: Optional[str] = None,
+        datefmt: Optional[str] = None,
+        timestamp: str = TIMESTAMP_DATETIME,
+    ) -> None:
+        """CachedTimeFormatterを初期化します。
+
+        Args:
+            fmt: ログフォーマット文字列
+            datefmt: 日時のフォーマット文字列。指定されない場合は
+                logging.Formatter と同じ "%Y-%m-%d %H:%M:%S,ミリ秒" を使用します。
+            timestamp: タイムスタンプの形式（"datetime", "epoch", "relative"）
+
+        Raises:
+            ValueError: 不正な timestamp が指定された場合
+        """
+        if timestamp not in _TIMESTAMPS:
+            raise ValueError(f"不正なtimestampです: {timestamp}")
+        super().__init__(fmt, datefmt)
+        self.timestamp = timestamp
+        self._uses_time = super().usesTime()
+        # (秒, 日時のフォーマット, その秒の日時)。複数のスレッドから
+        # 参照されるため1回の代入で差し替える
+        self._second_cache: Tuple[int, Optional[str], str] = (-1, None, "")
+
+    def usesTime(self) -> bool:
+        """フォーマット文字列が %(asctime)s を含むかを返します。
+
+        レコードごとにフォーマット文字列を検索しないよう、初期化時の
+        結果を返します。
+        """
+        return self._uses_time
+
+    def formatTime(
+        self, record: logging.LogRecord, datefmt: Optional[str] = None
+    ) -> str:
+        """レコードの作成時刻を文字列に変換します。
+
+        Args:
+            record: ログレコード
+            datefmt: 日時のフォーマット文字列
+
+        Returns:
+            timestamp の形式のタイムスタンプ
+        """
+        if self.timestamp == TIMESTAMP_EPOCH:
+            return f"{record.created:.3f}"
+        if self.timestamp == TIMESTAMP_RELATIVE:
+            return f"{record.relativeCreated / 1000:.3f}"
+
+        second = int(record.created)
+        cached_second, cached_datefmt, text = self._second_cache
+        if second != cached_second or datefmt != cached_datefmt:
+            # 同じ秒のレコードでは strftime を呼び出さない
+            text = time.strftime(
+                datefmt or self.default_time_format, self.converter(second)
+            )
+            self._second_cache = (second, datefmt, text)
+        if datefmt or not self.default_msec_format:
+            return text
+        return self.default_msec_format % (text, record.msecs)
+
+
+class JsonFormatter(logging.Formatter):
+    """ログレコードを1行のJSONオブジェクトに変換するフォーマッタ。
+
+    出力するキーは ts（UTCのISO 8601形式）、level、logger、msg と、
+    静的なコンテキストのフィールド、呼び出しごとの追加フィールドです。
+    例外情報がある場合は exc に追加します。キーが重複しないよう、これらの
+    キーと同名のコンテキストのフィールドと、これらのキーまたはコンテキストの
+    フィールドと同名の追加フィールドは、重複しなくなるまで先頭に "extra_" を
+    付けて出力します。
+
+    静的なコンテキストは初期化時に一度だけJSONに変換し、レベル名と
+    ロガー名の断片、秒単位のタイムスタンプもキャッシュするため、
+    レコードごとに行うのはメッセージのエスケープと連結だけです。
+
+    Attributes:
+        context: 静的なコンテキストのフィールド
+    """
+
+    def __init__(self, context: Optional[Mapping[str, Any]] = None) -> None:
+        """JsonFormatterを初期化します。
+
+        Args:
+            context: すべてのレコードに含める静的なフィールド
+                （例: アプリケーション名、ホスト名、プロセスID）
+        """
+        super().__init__()
+        self.context: Dict[str, Any] = dict(context or {})
+        names = [_field_name(str(k), _JSON_RESERVED_KEYS) for k in self.context]
+        self._context_json = "".join(
+            f",{encode_basestring(name)}:{_dumps(v)}"
+            for name, v in zip(names, self.context.values())
+        )
+        # 追加フィールドに使用できない名前
+        self._taken_keys = _JSON_RESERVED_KEYS.union(names)
+        self._level_json: Dict[int, str] = {}
+        self._name_json: Dict[str, str] = {}
+        # (秒, その秒のタイムスタンプ)。複数のスレッドから参照されるため
+        # 1回の代入で差し替える
+        self._second_cache = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """レコードの作成時刻をUTCのISO 8601形式で返します。
+
+        Args:
+            created: レコードの作成時刻（UNIX時間）
+
+        Returns:
+            ミリ秒までのタイムスタンプ（例: "2024-01-02T03:04:05.678Z"）
+        """
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if second != cached_second:
+            # 同じ秒のレコードでは strftime を呼び出さない
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        """ログレコードをJSONに変換します。
+
+        Args:
+            record: ログレコード
+
+        Returns:
+            改行を含まない1行のJSON
+        """
+        level_json = self._level_json.get(record.levelno)
+        if level_json is None:
+            level_json = f',"level":{encode_basestring(record.levelname)}'
+            self._level_json[record.levelno] = level_json
+        name_json = self._name_json.get(record.name)
+        if name_json is None:
+            name_json = f',"logger":{encode_basestring(record.name)}'
+            self._name_json[record.name] = name_json
+
+        parts = [
+            '{"ts":"',
+            self._timestamp(record.created),
+            '"',
+            level_json,
+            name_json,
+            ',"msg":',
+            encode_basestring(record.getMessage()),
+            self._context_json,
+        ]
+        fields = getattr(record, FIELDS_ATTR, None)
+        if fields:
+            taken = self._taken_keys
+            for k, v in fields.items():
+                name = _field_name(str(k), taken)
+                parts.append(f",{encode_basestring(name)}:{_dumps(v)}")
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts.append(f',"exc":{encode_basestring(record.exc_text)}')
+        parts.append("}")
+        return "".join(parts)
@@ -0,0 +1,529 @@
+"""ログハンドラモジュール。
+
+このモジュールは、Logger で使用する独自のログハンドラを提供します。
+"""
+
+import bz2
+import glob
+import gzip
+import logging
+import lzma
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from typing import IO, Any, Callable, Dict, Hashable, Optional, Tuple
+
+# 圧縮方式ごとのファイルを開く関数と、圧縮したファイルの拡張子
+_COMPRESSIONS: Dict[str, Tuple[Callable[..., IO[Any]], str]] = {
+    "gzip": (gzip.open, ".gz"),
+    "bz2": (bz2.open, ".bz2"),
+    "lzma": (lzma.open, ".xz"),
+}
+
+
+class BackgroundCompressor:
+    """ローテーションしたログファイルをバックグラウンドのスレッドで圧縮するクラス。
+
+    submit() はログファイルを一時的な名前に変更してキューに積むだけで、
+    圧縮と、圧縮済みのバックアップファイルの番号の繰り下げはワーカー
+    スレッドが順番に行います。バックアップファイルの名前を変更するのは
+    ワーカーだけなので、圧縮中に次のローテーションが発生しても競合しません。
+
+    一時的なファイルはログファイルと同じディレクトリに隠しファイルとして
+    作成します。圧縮の前にプロセスが終了した場合は、次に同じログファイルで
+    初期化したときに圧縮します。
+
+    Attributes:
+        filename: ログファイルの絶対パス
+        backup_count: 保持するバックアップファイルの数
+        compression: 圧縮方式（"gzip", "bz2", "lzma"）
+        extension: 圧縮したファイルの拡張子
+    """
+
+    def __init__(
+        self, filename: str, backup_count: int, compression: str = "gzip"
+    ) -> None:
+        """BackgroundCompressorを初期化し、ワーカースレッドを開始します。
+
+        Args:
+            filename: ログファイルのパス
+            backup_count: 保持するバックアップファイルの数
+            compression: 圧縮方式（"gzip", "bz2", "lzma"）
+
+        Raises:
+            ValueError: 不正な圧縮方式が指定された場合
+        """
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"不正なcompressionです: {compression}")
+        self.filename = os.path.abspath(filename)
+        self.backup_count = backup_count
+        self.compression = compression
+        self.extension = _COMPRESSIONS[compression][1]
+        directory, base = os.path.split(self.filename)
+        self._pending_prefix = os.path.join(directory, f".{base}.")
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        leftovers = glob.glob(glob.escape(self._pending_prefix) + "*.pending")
+        for pending in sorted(leftovers):
+            self._queue.put(pending)
+        self._thread = threading.Thread(
+            target=self._run, name="log-compressor", daemon=True
+        )
+        self._thread.start()
+
+    def backup_filename(self, index: int) -> str:
+        """圧縮済みのバックアップファイルの名前を返します。
+
+        Args:
+            index: バックアップの番号（1が最新）
+
+        Returns:
+            バックアップファイルのパス
+        """
+        return f"{self.filename}.{index}{self.extension}"
+
+    def submit(self) -> None:
+        """ログファイルを一時的な名前に変更し、圧縮をキューに積みます。
+
+        呼び出し元でログファイルを閉じている必要があります。
+        """
+        pending = f"{self._pending_prefix}{time.time_ns():020d}.pending"
+        os.rename(self.filename, pending)
+        self._queue.put(pending)
+
+    def wait(self) -> None:
+        """キューに積まれたファイルをすべて圧縮し終えるまで待ちます。"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """残りのファイルを圧縮し終えてからワーカースレッドを停止します。"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        """キューに積まれたファイルを順番に圧縮します。"""
+        while True:
+            pending = self._queue.get()
+            try:
+                if pending is None:
+                    return
+                self._compress(pending)
+            except Exception as e:
+                # 圧縮前のファイルは残しておき、次回の初期化時に再び圧縮する
+                sys.stderr.write(f"ログファイルの圧縮に失敗しました: {pending}: {e}\n")
+            finally:
+                self._queue.task_done()
+
+    def _compress(self, pending: str) -> None:
+        """ファイルを圧縮し、最新のバックアップファイルとして配置します。
+
+        Args:
+            pending: 圧縮するファイルのパス
+        """
+        opener = _COMPRESSIONS[self.compression][0]
+        compressed = pending + self.extension
+        with open(pending, "rb") as source, opener(compressed, "wb") as dest:
+            shutil.copyfileobj(source, dest, 1024 * 1024)
+        for i in range(self.backup_count - 1, 0, -1):
+            source_name = self.backup_filename(i)
+            if os.path.exists(source_name):
+                os.replace(source_name, self.backup_filename(i + 1))
+        os.replace(compressed, self.backup_filename(1))
+        os.remove(pending)
+
+
+class BatchingRotatingFileHandler(logging.Handler):
+    """ログをまとめて書き込み、サイズでローテーションするファイルハンドラ。
+
+    フォーマットしてエンコードしたレコードをバッファに溜め、バッファが
+    buffer_size に達したとき、flush_level 以上のレコードを受け取ったとき、
+    または flush_interval 秒ごとに、1回の write でファイルに書き込みます。
+
+    ローテーションの判定には、ファイルに位置を問い合わせる代わりに
+    ハンドラ自身が数えている書き込み済みのバイト数を使用します。
+    そのため、他のプロセスが同じファイルに書き込む構成には対応しません。
+    ローテーションは backup_count が正の場合に、ログファイルが max_bytes
+    を超えるとき、または rotate_interval 秒が経過したときに行います。
+    namer と rotator でバックアップファイルの名前と作成方法を変更できます。
+
+    compression を指定すると、ローテーションではログファイルの名前を
+    変更するだけで、圧縮は BackgroundCompressor のスレッドで行います。
+    圧縮したバックアップファイルは filename.1.gz（最新）から
+    filename.{backup_count}.gz のように番号を付けて保持します。
+    この場合、namer と rotator は使用されません。
+
+    Attributes:
+        filename: ログファイルの絶対パス
+        max_bytes: ログファイルの最大サイズ（バイト）
+        backup_count: 保持するバックアップファイルの数
+        buffer_size: 書き込みを行うバッファのサイズ（バイト）
+        flush_interval: バッファを書き込む間隔（秒）。0の場合は定期的に書き込みません。
+        flush_level: このレベル以上のレコードを受け取るとすぐに書き込みます。
+        rotate_interval: ローテーションする間隔（秒）
+        namer: バックアップファイルの名前を返す関数
+        rotator: ログファイルをバックアップファイルに移動する関数
+    """
+
+    terminator = "\n"
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        encoding: str = "utf-8",
+        buffer_size: int = 65536,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+        compression: Optional[str] = None,
+        rotate_interval: Optional[float] = None,
+    ) -> None:
+        """BatchingRotatingFileHandlerを初期化し、ログファイルを開きます。
+
+        Args:
+            filename: ログファイルのパス
+            max_bytes: ログファイルの最大サイズ（バイト）
+            backup_count: 保持するバックアップファイルの数
+            encoding: ログファイルの文字コード
+            buffer_size: 書き込みを行うバッファのサイズ（バイト）
+            flush_interval: バッファを書き込む間隔（秒）。0の場合は定期的に書き込みません。
+            flush_level: このレベル以上のレコードを受け取るとすぐに書き込みます。
+            compression: バックアップファイルの圧縮方式（"gzip", "bz2", "lzma"）。
+                指定された場合は、バックグラウンドのスレッドで圧縮します。
+            rotate_interval: ローテーションする間隔（秒）。指定された場合は、
+                サイズに関係なくこの間隔でもローテーションします。
+
+        Raises:
+            ValueError: 不正な圧縮方式が指定された場合
+        """
+        super().__init__()
+        self.filename = os.path.abspath(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.rotate_interval = rotate_interval
+        self.namer: Optional[Callable[[str], str]] = None
+        self.rotator: Optional[Callable[[str, str], None]] = None
+        self._buffer = bytearray()
+        self._fd: Optional[int] = None
+        self._size = 0
+        self._rollover_at = float("inf")
+        self._compressor: Optional[BackgroundCompressor] = None
+        if compression is not None:
+            if compression not in _COMPRESSIONS:
+                raise ValueError(f"不正なcompressionです: {compression}")
+            if backup_count > 0:
+                self._compressor = BackgroundCompressor(
+                    self.filename, backup_count, compression
+                )
+        self._open()
+
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="log-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _open(self) -> None:
+        """ログファイルを追記モードで開き、書き込み済みのバイト数を取得します。
+
+        rotate_interval が指定されている場合は、既存のファイルの最終更新時刻
+        （新しいファイルの場合は現在時刻）から次のローテーションの時刻を求めます。
+        """
+        self._fd = os.open(
+            self.filename,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0),
+            0o644,
+        )
+        stat = os.fstat(self._fd)
+        self._size = stat.st_size
+        if self.rotate_interval is not None:
+            start = stat.st_mtime if self._size else time.time()
+            self._rollover_at = start + self.rotate_interval
+
+    def _flush_periodically(self) -> None:
+        """flush_interval 秒ごとにバッファを書き込みます。"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """レコードをフォーマットしてバッファに追加します。
+
+        Handler.handle() からロックを取得した状態で呼び出されます。
+
+        Args:
+            record: ログレコード
+        """
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            self._append(data, record.created, record.levelno >= self.flush_level)
+        except RecursionError:  # pragma: no cover - logging と同じ扱い
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def write(self, data: bytes, flush: bool = False) -> None:
+        """フォーマットしてエンコード済みのレコードをバッファに追加します。
+
+        複数のレコードをまとめて渡す場合は、各レコードが終端文字で
+        終わっている必要があります。ローテーションはまとまりの単位で行います。
+
+        Args:
+            data: 追加するデータ
+            flush: Trueの場合、すぐにファイルに書き込みます。
+        """
+        with self.lock:  # type: ignore[union-attr]
+            self._append(data, time.time(), flush)
+
+    def _append(self, data: bytes, created: float, flush: bool) -> None:
+        """必要ならローテーションしてからデータをバッファに追加します。
+
+        呼び出し元でロックを取得している必要があります。
+
+        Args:
+            data: 追加するデータ
+            created: データの作成時刻（UNIX時間）
+            flush: Trueの場合、すぐにファイルに書き込みます。
+        """
+        if self._should_rollover(len(data), created):
+            self._write_buffer()
+            self._do_rollover()
+        self._buffer += data
+        if flush or len(self._buffer) >= self.buffer_size:
+            self._write_buffer()
+
+    def _should_rollover(self, length: int, created: float) -> bool:
+        """レコードを追加する前にローテーションが必要かを返します。
+
+        Args:
+            length: 追加するレコードのバイト数
+            created: レコードの作成時刻（UNIX時間）
+
+        Returns:
+            ログファイルが最大サイズを超える場合、またはローテーションの
+            時刻を過ぎた場合はTrue。ログファイルが空の場合はFalse。
+        """
+        if self.backup_count <= 0:
+            return False
+        pending = self._size + len(self._buffer)
+        if pending == 0:
+            if created >= self._rollover_at:
+                # 空のファイルはローテーションせず、次の時刻まで延ばす
+                self._rollover_at = created + (self.rotate_interval or 0.0)
+            return False
+        if created >= self._rollover_at:
+            return True
+        return 0 < self.max_bytes <= pending + length
+
+    def _write_buffer(self) -> None:
+        """バッファの内容をファイルに書き込みます。
+
+        呼び出し元でロックを取得している必要があります。
+        """
+        if not self._buffer or self._fd is None:
+            return
+        data = bytes(self._buffer)
+        written = os.write(self._fd, data)
+        while written < len(data):
+            written += os.write(self._fd, data[written:])
+        self._size += len(data)
+        del self._buffer[:]
+
+    def rotation_filename(self, default_name: str) -> str:
+        """バックアップファイルの名前を返します。
+
+        Args:
+            default_name: デフォルトの名前
+
+        Returns:
+            namer が設定されている場合はその戻り値、それ以外は default_name
+        """
+        return default_name if self.namer is None else self.namer(default_name)
+
+    def rotate(self, source: str, dest: str) -> None:
+        """ログファイルをバックアップファイルに移動します。
+
+        Args:
+            source: ログファイルのパス
+            dest: バックアップファイルのパス
+        """
+        if self.rotator is None:
+            if os.path.exists(source):
+                os.rename(source, dest)
+        else:
+            self.rotator(source, dest)
+
+    def _do_rollover(self) -> None:
+        """ログファイルをローテーションします。
+
+        呼び出し元でロックを取得し、バッファを書き込んでいる必要があります。
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._compressor is not None:
+            self._compressor.submit()
+            self._open()
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.rotation_filename(f"{self.filename}.{i}")
+            dest = self.rotation_filename(f"{self.filename}.{i + 1}")
+            if os.path.exists(source):
+                if os.path.exists(dest):
+                    os.remove(dest)
+                os.rename(source, dest)
+        dest = self.rotation_filename(f"{self.filename}.1")
+        if os.path.exists(dest):
+            os.remove(dest)
+        self.rotate(self.filename, dest)
+        self._open()
+
+    def flush(self) -> None:
+        """バッファの内容をファイルに書き込みます。"""
+        with self.lock:  # type: ignore[union-attr]
+            self._write_buffer()
+
+    def close(self) -> None:
+        """バッファの内容を書き込み、ログファイルを閉じます。
+
+        圧縮中のバックアップファイルがある場合は、圧縮し終えるまで待ちます。
+        """
+        self._stop_event.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        with self.lock:  # type: ignore[union-attr]
+            try:
+                self._write_buffer()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+        if self._compressor is not None:
+            self._compressor.close()
+        super().close()
+
+
+class _RegistryEntry:
+    """レジストリに登録したハンドラと参照数。"""
+
+    __slots__ = ("key", "handler", "references")
+
+    def __init__(self, key: Hashable, handler: logging.Handler) -> None:
+        """_RegistryEntryを初期化します。
+
+        Args:
+            key: ハンドラを共有するためのキー
+            handler: 登録するハンドラ
+        """
+        self.key = key
+        self.handler = handler
+        self.references = 0
+
+
+class HandlerRegistry:
+    """プロセス内でハンドラを共有するためのレジストリ。
+
+    同じキー（出力先、フォーマット、ローテーションの設定など）の
+    ハンドラを1つだけ作成し、参照数を数えて共有します。release() で
+    参照数が0になったときにハンドラを閉じるため、同じファイルに出力する
+    ロガーを多数作成しても、ファイルを開くのは1回だけです。
+    """
+
+    def __init__(self) -> None:
+        """HandlerRegistryを初期化します。"""
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _RegistryEntry] = {}
+        self._entries_by_handler: Dict[int, _RegistryEntry] = {}
+
+    def acquire(
+        self, key: Hashable, factory: Callable[[], logging.Handler]
+    ) -> logging.Handler:
+        """キーに対応するハンドラを返し、参照数を1増やします。
+
+        ハンドラが登録されていない場合は factory で作成して登録します。
+
+        Args:
+            key: ハンドラを識別するキー
+            factory: ハンドラを作成する関数
+
+        Returns:
+            共有するハンドラ
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _RegistryEntry(key, factory())
+                self._entries[key] = entry
+                self._entries_by_handler[id(entry.handler)] = entry
+            entry.references += 1
+            return entry.handler
+
+    def release(self, handler: logging.Handler) -> None:
+        """ハンドラの参照数を1減らし、0になった場合は閉じます。
+
+        登録されていないハンドラはすぐに閉じます。
+
+        Args:
+            handler: acquire() で取得したハンドラ
+        """
+        with self._lock:
+            entry = self._entries_by_handler.get(id(handler))
+            if entry is not None and entry.handler is handler:
+                entry.references -= 1
+                if entry.references > 0:
+                    return
+                del self._entries[entry.key]
+                del self._entries_by_handler[id(handler)]
+        handler.close()
+
+    def close_all(self) -> None:
+        """登録されているすべてのハンドラを参照数に関係なく閉じます。"""
+        with self._lock:
+            handlers = [entry.handler for entry in self._entries.values()]
+            self._entries.clear()
+            self._entries_by_handler.clear()
+        for handler in handlers:
+            handler.close()
+
+    def forget_all(self) -> None:
+        """登録されているすべてのハンドラを閉じずに登録を解除します。
+
+        fork した子プロセスで、親プロセスから引き継いだハンドラ（親の
+        スレッドやバッファ、ソケットを持つもの）を使わないようにするために
+        呼び出します。fork の時点で取得されていた可能性があるため、
+        ロックも作成し直します。
+        """
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._entries_by_handler = {}
+
+    def references(self, handler: logging.Handler) -> int:
+        """ハンドラの参照数を返します。
+
+        Args:
+            handler: ハンドラ
+
+        Returns:
+            参照数。登録されていない場合は0
+        """
+        with self._lock:
+            entry = self._entries_by_handler.get(id(handler))
+            return entry.references if entry is not None else 0
+
+    def __len__(self) -> int:
+        """登録されているハンドラの数を返します。"""
+        with self._lock:
+            return len(self._entries)
+
+
+# プロセス全体で共有するハンドラのレジストリ
+handler_registry = HandlerRegistry()
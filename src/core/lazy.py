@@ -0,0 +1,298 @@
+"""設定ファイルの遅延読み込みモジュール。
+
+このモジュールは、巨大なJSON/YAML形式の設定ファイルを、トップレベルの
+キー単位で必要になったときに解析する機能を提供します。
+
+読み込み時にはファイルをメモリマップして一度だけ走査し、トップレベルの
+各キーの値が置かれている範囲を記録します。値そのものは解析しないため、
+起動時に参照しない大きなセクションの解析時間とメモリを節約できます。
+
+YAMLの場合、ルートはブロック形式のマッピングである必要があります。
+アンカーとエイリアスは同じトップレベルのセクション内でのみ使用できます。
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - libyaml なしの環境
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+_JSON_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_JSON_SCALAR = re.compile(rb"[^,}\] \t\r\n]+")
+# 値を読み飛ばす際に追跡するトークン。文字列中の括弧を数えないよう文字列ごと照合する
+_JSON_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+_JSON_OPEN = frozenset(b"[{")
+# 正規表現で一度に読み飛ばす入れ子の深さの上限
+_JSON_NESTED_DEPTH = 8
+
+
+def _compile_nested_json() -> Any:
+    """入れ子の括弧を含むJSONの値全体に一致する正規表現を作成します。
+
+    値の走査をC実装の正規表現エンジンに任せることで、トークンごとに
+    Pythonのループを回すより高速に読み飛ばせます。括弧の対応は
+    種類を区別しませんが、値は読み込み時に json で検証されます。
+
+    Returns:
+        コンパイル済みの正規表現。アトミックグループと強欲な量指定子に
+        対応していないPython（3.10以前）では None。
+    """
+    # 強欲な量指定子でバックトラック用の状態を残さず、巨大な配列でも
+    # メモリ使用量が増えないようにする
+    atom = rb'(?>[^"\[\]{}]+|' + _JSON_STRING.pattern
+    level = atom + rb")*+"
+    for _ in range(_JSON_NESTED_DEPTH - 1):
+        level = atom + rb"|[\[{]" + level + rb"[\]}])*+"
+    try:
+        return re.compile(rb"[\[{]" + level + rb"[\]}]")
+    except re.error:  # pragma: no cover - Python 3.10以前
+        return None
+
+
+_JSON_NESTED = _compile_nested_json()
+
+# 行頭から始まるトップレベルのキー。コメント、シーケンス、フロー形式、
+# ディレクティブ、ドキュメントの区切りを除く
+_YAML_TOP_KEY = re.compile(
+    rb"^(?![\s#%\[{?]|-[ \t\r\n]|---|\.\.\.)([^\n]*?):(?=[ \t\r\n]|$)", re.M
+)
+_YAML_DOCUMENT_MARKER = re.compile(rb"^(?:---|\.\.\.)(?=[ \t\r\n]|$)", re.M)
+# 最初のキーより前に置ける行（空行、コメント、ディレクティブ、ドキュメント開始）
+_YAML_PREAMBLE = re.compile(
+    rb"(?:[ \t]*(?:#[^\n]*)?\r?\n|%[^\n]*\n|---[ \t]*\r?\n)*"
+)
+
+
+def _skip_json_value(buf: Any, pos: int) -> int:
+    """JSONの値を解析せずに読み飛ばします。
+
+    Args:
+        buf: JSONのバイト列（メモリマップ可）
+        pos: 値の先頭の位置
+
+    Returns:
+        値の直後の位置
+
+    Raises:
+        ValueError: 値が不正な場合。
+    """
+    first = buf[pos] if pos < len(buf) else None
+    if first in _JSON_OPEN:
+        if _JSON_NESTED is not None:
+            m = _JSON_NESTED.match(buf, pos)
+            if m is not None:
+                return m.end()
+        # 入れ子が深すぎる場合などは、括弧をトークン単位で数える
+        depth = 0
+        for m in _JSON_TOKEN.finditer(buf, pos):
+            c = buf[m.start()]
+            if c == 0x22:  # '"'
+                continue
+            depth += 1 if c in _JSON_OPEN else -1
+            if depth == 0:
+                return m.end()
+        raise ValueError("JSONの括弧が閉じられていません")
+    m = (_JSON_STRING if first == 0x22 else _JSON_SCALAR).match(buf, pos)
+    if m is None:
+        raise ValueError(f"JSONの値が不正です: 位置 {pos}")
+    return m.end()
+
+
+def _index_json(buf: Any) -> Dict[Any, Tuple[int, int]]:
+    """JSONのトップレベルの各キーの値の範囲を求めます。
+
+    Args:
+        buf: JSONのバイト列（メモリマップ可）
+
+    Returns:
+        キーから値の (開始位置, 終了位置) へのマッピング
+
+    Raises:
+        ValueError: ルートがオブジェクトでない場合、または形式が不正な場合。
+    """
+    size = len(buf)
+    pos = 3 if buf[:3] == b"\xef\xbb\xbf" else 0
+    pos = _JSON_WHITESPACE.match(buf, pos).end()
+    if pos >= size or buf[pos] != 0x7B:  # '{'
+        raise ValueError("遅延読み込みできるのはルートがオブジェクトのJSONのみです")
+    pos = _JSON_WHITESPACE.match(buf, pos + 1).end()
+
+    sections: Dict[Any, Tuple[int, int]] = {}
+    if pos < size and buf[pos] == 0x7D:  # '}'
+        return sections
+    while True:
+        m = _JSON_STRING.match(buf, pos)
+        if m is None:
+            raise ValueError(f"JSONのキーが不正です: 位置 {pos}")
+        key = json.loads(buf[m.start() : m.end()])
+        pos = _JSON_WHITESPACE.match(buf, m.end()).end()
+        if pos >= size or buf[pos] != 0x3A:  # ':'
+            raise ValueError(f"JSONの ':' がありません: 位置 {pos}")
+        start = _JSON_WHITESPACE.match(buf, pos + 1).end()
+        end = _skip_json_value(buf, start)
+        sections[key] = (start, end)
+        pos = _JSON_WHITESPACE.match(buf, end).end()
+        if pos < size and buf[pos] == 0x2C:  # ','
+            pos = _JSON_WHITESPACE.match(buf, pos + 1).end()
+        elif pos < size and buf[pos] == 0x7D:  # '}'
+            return sections
+        else:
+            raise ValueError(f"JSONの ',' または '}}' がありません: 位置 {pos}")
+
+
+def _index_yaml(buf: Any) -> Dict[Any, Tuple[int, int]]:
+    """YAMLのトップレベルの各キーのセクションの範囲を求めます。
+
+    セクションはキーの行から次のトップレベルのキーの直前までです。
+
+    Args:
+        buf: YAMLのバイト列（メモリマップ可）
+
+    Returns:
+        キーからセクションの (開始位置, 終了位置) へのマッピング
+
+    Raises:
+        ValueError: ルートがブロック形式のマッピングでない場合、または
+            複数のドキュメントを含む場合。
+    """
+    matches = list(_YAML_TOP_KEY.finditer(buf))
+    first = matches[0].start() if matches else len(buf)
+    preamble_end = _YAML_PREAMBLE.match(buf).end()
+    if preamble_end < first and buf[preamble_end:first].strip():
+        raise ValueError(
+            "遅延読み込みできるのはルートがブロック形式のマッピングのYAMLのみです"
+        )
+    for marker in _YAML_DOCUMENT_MARKER.finditer(buf):
+        if marker.start() >= first:
+            raise ValueError("遅延読み込みできるのは単一ドキュメントのYAMLのみです")
+
+    sections: Dict[Any, Tuple[int, int]] = {}
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(buf)
+        raw_key = buf[m.start(1) : m.end(1)]
+        try:
+            key = yaml.load(raw_key, Loader=_YamlLoader)
+        except yaml.YAMLError:
+            key = None
+        if key is None or isinstance(key, (dict, list)):
+            key = raw_key.decode("utf-8").strip()
+        sections[key] = (m.start(), end)
+    return sections
+
+
+def _parse_json_section(data: bytes) -> Any:
+    """JSONの値を解析します。"""
+    return json.loads(data)
+
+
+def _parse_yaml_section(data: bytes) -> Any:
+    """YAMLのセクション（キー1つのマッピング）を解析し、その値を返します。"""
+    section = yaml.load(data, Loader=_YamlLoader)
+    if not isinstance(section, dict) or len(section) != 1:
+        raise ValueError("YAMLのセクションを解析できません")
+    return next(iter(section.values()))
+
+
+class LazyDocument:
+    """トップレベルのキー単位で遅延解析される設定ファイル。
+
+    索引の作成後はメモリマップを解除し、値はファイルから必要な範囲だけを
+    読み出して解析します。ファイルはオブジェクトの破棄または close() まで
+    開いたままにするため、設定ファイルがリネームで置き換えられても、
+    索引を作成した時点の内容を読み出します。
+
+    同じファイルをその場で書き換えた場合は索引の位置が内容と一致しなくなるため、
+    サポートしません。索引の作成後にサイズまたは更新時刻が変わったファイルから
+    値を読み込もうとすると ValueError が発生します。
+
+    Attributes:
+        path: 設定ファイルのパス
+    """
+
+    def __init__(self, path: str) -> None:
+        """LazyDocumentを初期化し、トップレベルのキーの索引を作成します。
+
+        Args:
+            path: 設定ファイルのパス
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合。
+            ValueError: 設定ファイルの形式が遅延読み込みに対応していない場合。
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"設定ファイルが見つかりません: {path}")
+        file_ext = os.path.splitext(path)[1].lower()
+        if file_ext == ".json":
+            index: Callable[[Any], Dict[Any, Tuple[int, int]]] = _index_json
+            self._parse: Callable[[bytes], Any] = _parse_json_section
+        elif file_ext in (".yaml", ".yml"):
+            index = _index_yaml
+            self._parse = _parse_yaml_section
+        else:
+            raise ValueError(f"サポートされていないファイル形式です: {file_ext}")
+
+        self.path = path
+        self._file = open(path, "rb")
+        self._lock = threading.Lock()
+        stat = os.fstat(self._file.fileno())
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+        try:
+            if stat.st_size == 0:
+                self._sections = index(b"")
+            else:
+                with mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as buf:
+                    self._sections = index(buf)
+        except ValueError as e:
+            self._file.close()
+            raise ValueError(f"設定ファイルの解析に失敗しました: {e}")
+
+    def keys(self) -> List[Any]:
+        """トップレベルのキーのリストを返します。"""
+        return list(self._sections)
+
+    def __contains__(self, key: object) -> bool:
+        """トップレベルのキーが存在するかを返します。"""
+        return key in self._sections
+
+    def load(self, key: Any) -> Any:
+        """トップレベルのキーの値を解析して返します。
+
+        Args:
+            key: トップレベルのキー
+
+        Returns:
+            解析された値
+
+        Raises:
+            KeyError: キーが存在しない場合。
+            ValueError: 値の解析に失敗した場合、またはファイルがその場で
+                書き換えられた場合。
+        """
+        start, end = self._sections[key]
+        with self._lock:
+            stat = os.fstat(self._file.fileno())
+            if (stat.st_mtime_ns, stat.st_size) != self._signature:
+                raise ValueError(
+                    f"索引の作成後に設定ファイルが書き換えられました: {self.path}"
+                )
+            self._file.seek(start)
+            data = self._file.read(end - start)
+        try:
+            return self._parse(data)
+        except (ValueError, yaml.YAMLError) as e:
+            raise ValueError(f"設定ファイルの解析に失敗しました: {key}: {e}")
+
+    def close(self) -> None:
+        """設定ファイルを閉じます。"""
+        self._file.close()
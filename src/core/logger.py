@@ -3,13 +3,120 @@
 このモジュールは、アプリケーションのロギング機能を提供します。
 複数レベルのログ出力、ファイル出力とコンソール出力、
 およびログフォーマットのカスタマイズをサポートします。
+
+非同期モードでは、ログレコードを有界キューに積み、バックグラウンドの
+スレッドがフォーマットとファイルへの書き込みを行います。
 """
 
+import atexit
+import functools
 import logging
 import os
+import queue
+import socket
 import sys
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+from src.core.collector import CollectorHandler
+from src.core.formatters import (
+    FIELDS_ATTR,
+    TIMESTAMP_DATETIME,
+    CachedTimeFormatter,
+    JsonFormatter,
+)
+from src.core.handlers import BatchingRotatingFileHandler, handler_registry
+from src.core.recorder import FlightRecorder, Message
+from src.core.sampling import LogSampler
+
+# キューが満杯のときの動作
+OVERFLOW_BLOCK = "block"  # 空きができるまで待つ
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # 最も古いレコードを捨てる
+OVERFLOW_DROP_NEW = "drop_new"  # 新しいレコードを捨てる
+_OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEW)
+
+_LEVELS = (
+    logging.DEBUG,
+    logging.INFO,
+    logging.WARNING,
+    logging.ERROR,
+    logging.CRITICAL,
+)
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """有界キューにログレコードを積むハンドラ。
+
+    キューが満杯のときは overflow の方式に従い、捨てたレコードを数えます。
+    レコードは同じプロセス内のスレッドに渡すため、QueueHandler と異なり
+    呼び出し元のスレッドではメッセージのフォーマットも複製も行いません。
+    そのため、ログに渡した引数をログの呼び出し後に変更しないでください。
+
+    Attributes:
+        overflow: キューが満杯のときの動作
+        dropped: 捨てたレコードの数
+    """
+
+    def __init__(
+        self, record_queue: "queue.Queue[logging.LogRecord]", overflow: str
+    ) -> None:
+        """_BoundedQueueHandlerを初期化します。
+
+        Args:
+            record_queue: ログレコードを積むキュー
+            overflow: キューが満杯のときの動作
+        """
+        super().__init__(record_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """レコードをそのままキューに積みます。"""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """overflow の方式に従ってレコードをキューに積みます。
+
+        Args:
+            record: ログレコード
+        """
+        if self.overflow == OVERFLOW_BLOCK:
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                pass
+            if self.overflow == OVERFLOW_DROP_NEW:
+                self._count_drop()
+                return
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                continue
+            self._count_drop()
+
+    def _count_drop(self) -> None:
+        """捨てたレコードを数えます。"""
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    """停止時にキューに残ったレコードをすべて処理するリスナー。
+
+    QueueListener は停止の合図を put_nowait() で積むため、有界キューが
+    満杯だと停止できません。空きができるまで待ってから合図を積みます。
+    """
+
+    def enqueue_sentinel(self) -> None:
+        """キューの末尾に停止の合図を積みます。"""
+        self.queue.put(self._sentinel)
 
 
 class Logger:
@@ -18,8 +125,49 @@ class Logger:
     このクラスは、複数レベルのログ出力、ファイル出力とコンソール出力、
     およびログフォーマットのカスタマイズを行います。
 
+    コンソールとファイルのハンドラは handler_registry に登録し、出力先、
+    フォーマット、ローテーションの設定が同じ他の Logger と共有します。
+    そのため、同じファイルに出力する Logger を多数作成してもファイルは
+    1回しか開かれません。ハンドラは、共有しているすべての Logger の
+    close() が呼び出されたときに閉じられます。
+
+    非同期モードでは、ロガーには有界キューに積むハンドラだけを追加し、
+    コンソールとファイルのハンドラはバックグラウンドのスレッドで
+    動作させます。close() またはインタプリタの終了時に、キューに残った
+    レコードをすべて出力してからスレッドを停止します。
+
+    debug() などのログ出力メソッドは、% 形式の引数と、引数なしで呼び出すと
+    メッセージを返す関数を受け付けます。どちらもレコードを出力する場合に
+    だけ評価されます。各レベルが有効かどうかはキャッシュしているため、
+    無効なレベルの呼び出しは属性1つの判定だけで戻ります。ログレベルの
+    変更は set_level() で行ってください。
+
+    テキスト形式の %(asctime)s は秒単位の日時をキャッシュして作成するため、
+    同じ秒のレコードでは time.strftime を呼び出しません。timestamp で
+    UNIX時間や経過時間の秒数に切り替えることもできます。
+
+    json_format を有効にすると、1行に1つのJSONオブジェクトを出力します。
+    ログ出力メソッドのキーワード引数は、そのレコードの追加フィールドとして
+    出力されます。アプリケーション名、ホスト名、プロセスIDと context は
+    すべてのレコードに含まれる静的なフィールドとして、初期化時に一度だけ
+    JSONに変換されます。
+
+    sample_every または rate_limit を指定すると、同じ呼び出し箇所から
+    繰り返し出力されるログを間引きます。メッセージの内容は f-string などで
+    毎回異なることがあるため、呼び出し元のファイル名と行番号、レベルを
+    キーとして数えます。間引いた件数は summary_interval 秒ごとに、
+    その後の最初のログ出力時と close() の呼び出し時に、呼び出し箇所と
+    あわせて1行にまとめて出力します。
+
+    flight_recorder_size を指定すると、ログレベルによって出力されなかった
+    直近のログを、フォーマットせずにその件数までリングバッファに保持し、
+    ERROR以上のログを出力する直前に（またはdump_flight_recorder()の呼び出し時に）
+    まとめて出力します。メモリ使用量の上限は FlightRecorder を参照してください。
+
     Attributes:
         logger: ロギングインスタンス
+        handlers: 出力先のハンドラ（コンソール、ファイル）のリスト
+        async_mode: 非同期モードかどうか
     """
 
     def __init__(
@@ -30,6 +178,23 @@ class Logger:
         max_bytes: int = 10485760,  # 10MB
         backup_count: int = 5,
         format_string: Optional[str] = None,
+        async_mode: bool = False,
+        queue_size: int = 10000,
+        overflow: str = OVERFLOW_BLOCK,
+        file_buffer_size: Optional[int] = None,
+        file_flush_interval: float = 1.0,
+        json_format: bool = False,
+        context: Optional[Dict[str, Any]] = None,
+        sample_every: int = 1,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[int] = None,
+        summary_interval: float = 60.0,
+        compression: Optional[str] = None,
+        rotate_interval: Optional[float] = None,
+        collector: Optional[str] = None,
+        flight_recorder_size: int = 0,
+        flight_recorder_file: Optional[str] = None,
+        timestamp: str = TIMESTAMP_DATETIME,
     ) -> None:
         """Loggerを初期化します。
 
@@ -40,36 +205,377 @@ class Logger:
             max_bytes: ログファイルの最大サイズ（バイト）
             backup_count: 保持するバックアップファイルの数
             format_string: ログフォーマット文字列。指定されない場合はデフォルトフォーマットを使用します。
+            async_mode: Trueの場合、ログの出力をバックグラウンドのスレッドで行います。
+            queue_size: 非同期モードのキューの最大レコード数
+            overflow: 非同期モードでキューが満杯のときの動作。"block"（待つ）、
+                "drop_oldest"（最も古いレコードを捨てる）、
+                "drop_new"（新しいレコードを捨てる）のいずれか。
+            file_buffer_size: 指定された場合、ログファイルへの書き込みを
+                このバイト数までまとめて行います。ERROR以上のレコードは
+                すぐに書き込みます。
+            file_flush_interval: file_buffer_size 指定時に、溜まったログを
+                書き込む間隔（秒）
+            json_format: Trueの場合、ログを1行に1つのJSONオブジェクトとして
+                出力します。format_string は使用されません。
+            context: json_format 指定時に、すべてのレコードに含めるフィールド
+            sample_every: 同じ呼び出し箇所のログを、最初の1回と以降
+                この回数に1回だけ出力します。
+            rate_limit: 同じ呼び出し箇所のログの1秒あたりの出力件数の上限
+            rate_burst: rate_limit 指定時に、連続して出力できる件数の上限
+            summary_interval: 間引いた件数を出力する間隔（秒）
+            compression: ローテーションしたログファイルの圧縮方式
+                （"gzip", "bz2", "lzma"）。圧縮はバックグラウンドのスレッドで
+                行い、ログを出力するスレッドは待ちません。
+            rotate_interval: ログファイルをローテーションする間隔（秒）。
+                指定された場合は、サイズに加えて時間でもローテーションします。
+            collector: ログコレクタのソケットのパス。指定された場合は、
+                ログファイルに書き込む代わりにログをまとめてコレクタに送ります。
+                ログファイルへの書き込みとローテーションはコレクタが行うため、
+                複数のプロセスで同じログファイルを使用できます。
+            flight_recorder_size: 出力されなかった直近のログを保持する件数。
+                0の場合は保持しません。
+            flight_recorder_file: 保持したログの出力先のファイル。
+                指定されない場合は、通常のログと同じ出力先に出力します。
+            timestamp: %(asctime)s のタイムスタンプの形式。"datetime"（日時）、
+                "epoch"（UNIX時間の秒数）、"relative"（logging モジュールの
+                読み込みからの経過秒数）のいずれか。json_format では使用されません。
+
+        Raises:
+            ValueError: 不正なログレベル、overflow、間引きの設定、
+                圧縮方式または timestamp が指定された場合、
+                または flight_recorder_size が負の場合
         """
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"不正なoverflowです: {overflow}")
+        self.async_mode = async_mode
+        self.handlers: List[logging.Handler] = []
+        self._queue_handler: Optional[_BoundedQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._sampler: Optional[LogSampler] = None
+        self._recorder: Optional[FlightRecorder] = None
+        self._recorder_handler: Optional[logging.Handler] = None
+        if flight_recorder_size:
+            self._recorder = FlightRecorder(flight_recorder_size)
+        if sample_every != 1 or rate_limit is not None:
+            self._sampler = LogSampler(
+                sample_every, rate_limit, rate_burst, summary_interval
+            )
+
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(self._get_log_level(level))
+        self._enabled: Dict[int, bool] = {}
+        self.set_level(level)
         self.logger.handlers = []  # 既存のハンドラをクリア
 
         # フォーマットの設定
-        if format_string is None:
-            format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        formatter = logging.Formatter(format_string)
+        formatter: logging.Formatter
+        format_key: Hashable
+        if json_format:
+            static_fields: Dict[str, Any] = {
+                "app": name,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+            }
+            static_fields.update(context or {})
+            formatter = JsonFormatter(static_fields)
+            format_key = ("json", repr(sorted(static_fields.items())))
+        else:
+            if format_string is None:
+                format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            formatter = CachedTimeFormatter(format_string, timestamp=timestamp)
+            format_key = ("text", format_string, timestamp)
 
+        # ハンドラは出力先、フォーマット、ローテーションの設定が同じロガーと共有する
         # コンソールハンドラの設定
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        self.handlers.append(
+            self._acquire_handler(
+                ("console", id(sys.stdout), format_key),
+                functools.partial(logging.StreamHandler, sys.stdout),
+                formatter,
+            )
+        )
 
         # ファイルハンドラの設定（指定された場合）
-        if log_file:
+        if collector:
+            self.handlers.append(
+                self._acquire_handler(
+                    ("collector", collector, format_key),
+                    functools.partial(CollectorHandler, collector),
+                    formatter,
+                )
+            )
+        elif log_file:
             # ディレクトリが存在しない場合は作成
             log_dir = os.path.dirname(log_file)
             if log_dir and not os.path.exists(log_dir):
                 os.makedirs(log_dir)
 
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=max_bytes,
-                backupCount=backup_count,
-                encoding="utf-8",
+            file_factory: Callable[[], logging.Handler]
+            if (
+                file_buffer_size is None
+                and compression is None
+                and rotate_interval is None
+            ):
+                file_factory = functools.partial(
+                    RotatingFileHandler,
+                    log_file,
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding="utf-8",
+                )
+            else:
+                # file_buffer_size が指定されない場合は、レコードごとに書き込む
+                file_factory = functools.partial(
+                    BatchingRotatingFileHandler,
+                    log_file,
+                    max_bytes=max_bytes,
+                    backup_count=backup_count,
+                    encoding="utf-8",
+                    buffer_size=file_buffer_size or 0,
+                    flush_interval=file_flush_interval if file_buffer_size else 0,
+                    compression=compression,
+                    rotate_interval=rotate_interval,
+                )
+            file_key = (
+                "file",
+                os.path.abspath(log_file),
+                format_key,
+                max_bytes,
+                backup_count,
+                file_buffer_size,
+                file_flush_interval,
+                compression,
+                rotate_interval,
+            )
+            self.handlers.append(
+                self._acquire_handler(file_key, file_factory, formatter)
+            )
+
+        if self._recorder is not None and flight_recorder_file:
+            self._recorder_handler = self._acquire_handler(
+                ("recorder", os.path.abspath(flight_recorder_file), format_key),
+                functools.partial(
+                    logging.FileHandler,
+                    flight_recorder_file,
+                    encoding="utf-8",
+                    delay=True,
+                ),
+                formatter,
+            )
+
+        if async_mode:
+            record_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(queue_size)
+            self._queue_handler = _BoundedQueueHandler(record_queue, overflow)
+            self.logger.addHandler(self._queue_handler)
+            self._listener = _DrainingQueueListener(
+                record_queue, *self.handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            atexit.register(self.close)
+        else:
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
+
+    @staticmethod
+    def _acquire_handler(
+        key: Hashable,
+        factory: Callable[[], logging.Handler],
+        formatter: logging.Formatter,
+    ) -> logging.Handler:
+        """共有のハンドラをレジストリから取得します。
+
+        Args:
+            key: ハンドラを識別するキー
+            factory: ハンドラを作成する関数
+            formatter: 新しく作成したハンドラに設定するフォーマッタ
+
+        Returns:
+            共有のハンドラ
+        """
+
+        def create() -> logging.Handler:
+            handler = factory()
+            handler.setFormatter(formatter)
+            return handler
+
+        return handler_registry.acquire(key, create)
+
+    @property
+    def dropped(self) -> int:
+        """非同期モードでキューが満杯のために捨てたレコードの数。"""
+        return self._queue_handler.dropped if self._queue_handler else 0
+
+    def close(self) -> None:
+        """ログを出力し終えてからハンドラを閉じます。
+
+        非同期モードでは、キューに残ったレコードをすべて出力してから
+        バックグラウンドのスレッドを停止します。共有のハンドラは、
+        使用しているすべてのロガーが閉じられたときに閉じます。
+        複数回呼び出しても安全です。
+        """
+        if self._sampler is not None:
+            self._log_suppressed(self._sampler)
+        listener = self._listener
+        if listener is not None:
+            self._listener = None
+            self.logger.removeHandler(self._queue_handler)
+            listener.stop()
+            atexit.unregister(self.close)
+        handlers, self.handlers = self.handlers, []
+        for handler in handlers:
+            self.logger.removeHandler(handler)
+            handler.flush()
+            handler_registry.release(handler)
+        recorder_handler, self._recorder_handler = self._recorder_handler, None
+        if recorder_handler is not None:
+            handler_registry.release(recorder_handler)
+
+    def dump_flight_recorder(self) -> int:
+        """フライトレコーダーに保持したログを古い順に出力し、空にします。
+
+        ログはレベルに関係なく、flight_recorder_file が指定されている場合は
+        そのファイルに、それ以外は通常のログと同じ出力先に出力します。
+
+        Returns:
+            出力したログの件数
+        """
+        if self._recorder is None:
+            return 0
+        entries = self._recorder.drain()
+        if not entries:
+            return 0
+        handle = (
+            self._recorder_handler.handle
+            if self._recorder_handler is not None
+            else self.logger.handle
+        )
+        handle(self._make_record(logging.INFO, f"---- 直前の {len(entries)} 件のログ ----"))
+        for _, created, level, message, args in entries:
+            if callable(message):
+                try:
+                    message = message()
+                except Exception as e:
+                    message, args = f"メッセージの生成に失敗しました: {e!r}", ()
+            handle(self._make_record(level, message, args, created))
+        handle(self._make_record(logging.INFO, "---- ここまで ----"))
+        return len(entries)
+
+    def _make_record(
+        self,
+        level: int,
+        message: str,
+        args: Any = (),
+        created: Optional[float] = None,
+    ) -> logging.LogRecord:
+        """フライトレコーダーの出力に使用するログレコードを作成します。
+
+        Args:
+            level: ログレベル
+            message: ログメッセージ
+            args: メッセージの % 形式の引数
+            created: ログの作成時刻（UNIX時間）。指定されない場合は現在時刻。
+
+        Returns:
+            ログレコード
+        """
+        record = self.logger.makeRecord(
+            self.logger.name, level, "(flight recorder)", 0, message, args, None
+        )
+        if created is not None:
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+        return record
+
+    def set_level(self, level: str) -> None:
+        """ログレベルを変更し、各レベルが有効かどうかのキャッシュを更新します。
+
+        Args:
+            level: ログレベル（"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"）
+
+        Raises:
+            ValueError: 不正なログレベルが指定された場合
+        """
+        self.logger.setLevel(self._get_log_level(level))
+        self.refresh_levels()
+
+    def refresh_levels(self) -> None:
+        """各レベルが有効かどうかのキャッシュを更新します。
+
+        logging.disable() や親ロガーのレベルを変更した場合に呼び出します。
+        """
+        self._enabled = {lv: self.logger.isEnabledFor(lv) for lv in _LEVELS}
+        self._debug_enabled = self._enabled[logging.DEBUG]
+        self._info_enabled = self._enabled[logging.INFO]
+        self._warning_enabled = self._enabled[logging.WARNING]
+        self._error_enabled = self._enabled[logging.ERROR]
+        self._critical_enabled = self._enabled[logging.CRITICAL]
+
+    def is_enabled(self, level: Union[str, int]) -> bool:
+        """指定したレベルのログが出力されるかを返します。
+
+        メッセージの組み立てに時間がかかる場合に、事前に判定するために使用します。
+
+        Args:
+            level: ログレベル（文字列または数値）
+
+        Returns:
+            出力される場合はTrue
+
+        Raises:
+            ValueError: 不正なログレベルが指定された場合
+        """
+        if isinstance(level, str):
+            level = self._get_log_level(level)
+        enabled = self._enabled.get(level)
+        if enabled is None:
+            enabled = self.logger.isEnabledFor(level)
+        return enabled
+
+    def _log(
+        self, level: int, message: Message, args: Any, fields: Dict[str, Any]
+    ) -> None:
+        """メッセージを評価してログを出力します。
+
+        Args:
+            level: ログレベル
+            message: ログメッセージ、またはメッセージを返す関数
+            args: メッセージの % 形式の引数
+            fields: レコードの追加フィールド
+        """
+        sampler = self._sampler
+        if sampler is not None:
+            caller = sys._getframe(2)
+            now = time.monotonic()
+            key = (caller.f_code.co_filename, caller.f_lineno, level)
+            allowed = sampler.allow(key, now)
+            if sampler.summary_due(now):
+                self._log_suppressed(sampler)
+            if not allowed:
+                return
+        if callable(message):
+            message = message()
+        # ファイル名や行番号にはこのクラスを呼び出した箇所を記録する
+        self.logger.log(
+            level,
+            message,
+            *args,
+            extra={FIELDS_ATTR: fields} if fields else None,
+            stacklevel=3,
+        )
+
+    def _log_suppressed(self, sampler: LogSampler) -> None:
+        """間引いたログの件数を呼び出し箇所ごとに出力します。
+
+        Args:
+            sampler: 間引いた件数を数えているサンプラー
+        """
+        for (filename, lineno, level), count in sampler.pop_suppressed():
+            self.logger.log(
+                level,
+                "同様のメッセージを %s 件抑制しました（%s:%d）",
+                f"{count:,}",
+                filename,
+                lineno,
             )
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
 
     def _get_log_level(self, level: str) -> int:
         """文字列のログレベルを数値に変換します。
@@ -97,42 +603,71 @@ class Logger:
         else:
             raise ValueError(f"不正なログレベルです: {level}")
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: Message, *args: Any, **fields: Any) -> None:
         """DEBUGレベルのログを出力します。
 
         Args:
-            message: ログメッセージ
+            message: ログメッセージ、またはメッセージを返す関数
+            *args: メッセージの % 形式の引数
+            **fields: JSON形式で出力する追加フィールド
         """
-        self.logger.debug(message)
+        if self._debug_enabled:
+            self._log(logging.DEBUG, message, args, fields)
+        elif self._recorder is not None:
+            self._recorder.append(logging.DEBUG, message, args)
 
-    def info(self, message: str) -> None:
+    def info(self, message: Message, *args: Any, **fields: Any) -> None:
         """INFOレベルのログを出力します。
 
         Args:
-            message: ログメッセージ
+            message: ログメッセージ、またはメッセージを返す関数
+            *args: メッセージの % 形式の引数
+            **fields: JSON形式で出力する追加フィールド
         """
-        self.logger.info(message)
+        if self._info_enabled:
+            self._log(logging.INFO, message, args, fields)
+        elif self._recorder is not None:
+            self._recorder.append(logging.INFO, message, args)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: Message, *args: Any, **fields: Any) -> None:
         """WARNINGレベルのログを出力します。
 
         Args:
-            message: ログメッセージ
+            message: ログメッセージ、またはメッセージを返す関数
+            *args: メッセージの % 形式の引数
+            **fields: JSON形式で出力する追加フィールド
         """
-        self.logger.warning(message)
+        if self._warning_enabled:
+            self._log(logging.WARNING, message, args, fields)
+        elif self._recorder is not None:
+            self._recorder.append(logging.WARNING, message, args)
 
-    def error(self, message: str) -> None:
+    def error(self, message: Message, *args: Any, **fields: Any) -> None:
         """ERRORレベルのログを出力します。
 
         Args:
-            message: ログメッセージ
+            message: ログメッセージ、またはメッセージを返す関数
+            *args: メッセージの % 形式の引数
+            **fields: JSON形式で出力する追加フィールド
         """
-        self.logger.error(message)
+        if self._error_enabled:
+            if self._recorder is not None:
+                self.dump_flight_recorder()
+            self._log(logging.ERROR, message, args, fields)
+        elif self._recorder is not None:
+            self._recorder.append(logging.ERROR, message, args)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: Message, *args: Any, **fields: Any) -> None:
         """CRITICALレベルのログを出力します。
 
         Args:
-            message: ログメッセージ
+            message: ログメッセージ、またはメッセージを返す関数
+            *args: メッセージの % 形式の引数
+            **fields: JSON形式で出力する追加フィールド
         """
-        self.logger.critical(message)
+        if self._critical_enabled:
+            if self._recorder is not None:
+                self.dump_flight_recorder()
+            self._log(logging.CRITICAL, message, args, fields)
+        elif self._recorder is not None:
+            self._recorder.append(logging.CRITICAL, message, args)
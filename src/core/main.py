@@ -4,10 +4,35 @@
 他のモジュールを統合し、アプリケーションの実行フローを制御します。
 """
 
-from typing import Optional
+import asyncio
+import json
+import signal
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from src.core.config import ConfigManager
 from src.core.logger import Logger
+from src.core.metrics import MetricsRegistry
+from src.core.parallel import (
+    MODE_PROCESS,
+    MODE_SERIAL,
+    ParallelExecutor,
+    init_worker,
+    set_worker_context,
+)
+from src.core.pipeline import Pipeline
+from src.core.schema import parse_value
+from src.core.tasks import AsyncTaskRunner
 
 
 class Application:
@@ -16,30 +41,134 @@ class Application:
     このクラスは、アプリケーションのメインロジックを実装し、
     他のモジュールを統合します。
 
+    pipeline を指定すると、_process() でパイプラインを実行し、run() の
+    終了時にステージごとの処理件数、スループット、レイテンシをログに出力します。
+
+    実行モード（設定の execution.mode、または execution_mode）に "thread" または
+    "process" を指定すると、パイプラインの parallel を指定したステージと
+    map() の処理を、チャンクに分割してスレッドプールまたはプロセスプールで
+    実行します。プロセスプールのワーカーには解析済みの設定を起動時に一度だけ
+    渡すため、ワーカーが設定ファイルを解析し直すことはありません。
+    ワーカーで実行する関数は src.core.parallel の worker_config() と
+    worker_logger() で設定とロガーを参照できます。複数のプロセスから
+    同じログファイルに出力する場合は logging.collector を設定してください。
+
+    ソケットやファイルの待ち時間が大半を占める処理は、_process_async() を
+    オーバーライドし、run_async() で1つのイベントループ上で実行します。
+    コルーチンは task_runner を通して実行すると、同時実行数
+    （execution.concurrency）とタイムアウト（execution.task_timeout）が
+    制限されます。async_mode（execution.async）を有効にすると、ログの
+    書き込みをバックグラウンドのスレッドで行うため、コルーチンからの
+    ログ出力がファイルへの書き込みでイベントループを止めることはありません。
+
+    設定の読み込み（phase.config_load）、ロガーの初期化（phase.logger_setup）、
+    内部処理（phase.process）の時間は metrics に自動で記録されます。
+    サブクラスは metrics に独自のカウンタやヒストグラムを記録できます。
+    メトリクスは実行の終了時に JSON として metrics_file（設定の
+    metrics.file）に書き込まれ、指定されない場合は DEBUG レベルで
+    ログに出力されます。
+
     Attributes:
         config: 設定マネージャ
         logger: ロガー
+        pipeline: _process() で実行するパイプライン
+        executor: 並列実行に使用する ParallelExecutor
+        async_mode: run_async() で実行することを想定したモードかどうか
+        task_runner: run_async() の実行中にコルーチンの同時実行数と
+            タイムアウトを制限する AsyncTaskRunner
+        metrics: フェーズごとの時間と独自のメトリクスを記録する
+            MetricsRegistry
+        metrics_file: 実行の終了時にメトリクスを書き込むファイルのパス
     """
 
     def __init__(
-        self, config_path: Optional[str] = None, log_level: str = "INFO"
+        self,
+        config_path: Optional[Union[str, Sequence[str]]] = None,
+        log_level: str = "INFO",
+        config_cache_dir: Optional[str] = None,
+        config_stats: bool = False,
+        pipeline: Optional[Pipeline] = None,
+        execution_mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        async_mode: Optional[bool] = None,
+        concurrency: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+        metrics_file: Optional[str] = None,
     ) -> None:
         """Applicationを初期化します。
 
         Args:
-            config_path: 設定ファイルのパス。指定された場合は、初期化時に読み込みます。
+            config_path: 設定ファイルのパス、またはパスのリスト。
+                指定された場合は、初期化時に読み込みます。
             log_level: ログレベル
+            config_cache_dir: 解析済みの設定をキャッシュするディレクトリ
+            config_stats: Trueの場合、設定アクセスの統計を集計し、
+                run() の終了時にログに出力します。
+            pipeline: _process() で実行するパイプライン
+            execution_mode: 実行モード（"serial", "thread", "process"）。
+                指定されない場合は設定の execution.mode を使用します。
+            workers: ワーカーの数。指定されない場合は設定の
+                execution.workers（省略時はCPUの数）を使用します。
+            chunk_size: 1つのチャンクのレコード数。指定されない場合は
+                設定の execution.chunk_size（省略時は1000）を使用します。
+            ordered: Falseの場合、完了した順に結果を受け取ります。指定されない
+                場合は設定の execution.ordered（省略時はTrue）を使用します。
+            async_mode: Trueの場合、run_async() で実行するためにログの書き込みを
+                バックグラウンドのスレッドで行います。指定されない場合は
+                設定の execution.async（省略時はFalse）を使用します。
+            concurrency: run_async() で同時に実行するコルーチンの最大数。
+                指定されない場合は設定の execution.concurrency（省略時は100）を
+                使用します。
+            task_timeout: run_async() で実行する1つのコルーチンの
+                タイムアウト（秒）。指定されない場合は設定の
+                execution.task_timeout（省略時は制限なし）を使用します。
+            metrics_file: 実行の終了時にメトリクスを JSON で書き込むファイルの
+                パス。指定されない場合は設定の metrics.file を使用します。
         """
+        self.metrics = MetricsRegistry()
+        self.metrics_file = metrics_file
+
         # 設定の初期化
-        self.config = ConfigManager(config_path)
+        with self.metrics.time("phase.config_load"):
+            self.config = ConfigManager(config_path, cache_dir=config_cache_dir)
+            if config_stats:
+                self.config.enable_stats()
 
         # ロガーの初期化
+        if async_mode is None:
+            async_mode = self._config_value("execution.async", bool, False)
+        self.async_mode = async_mode
         log_file = self.config.get("logging.file")
-        self.logger = Logger(
-            name="app",
-            level=log_level,
-            log_file=log_file,
-        )
+        logger_options: Dict[str, Any] = {
+            "name": "app",
+            "level": log_level,
+            "log_file": log_file,
+            "collector": self.config.get("logging.collector"),
+            "flight_recorder_size": self._config_value(
+                "logging.flight_recorder_size", int, 0
+            ),
+            "flight_recorder_file": self.config.get("logging.flight_recorder_file"),
+            "async_mode": async_mode,
+        }
+        with self.metrics.time("phase.logger_setup"):
+            self.logger = Logger(**logger_options)
+        self.pipeline = pipeline
+
+        # 並列実行の設定。最初に使用するときに設定ファイルの値と合わせて
+        # ParallelExecutor を作成する
+        self._logger_options = logger_options
+        self._execution_options: Dict[str, Any] = {
+            "mode": execution_mode,
+            "workers": workers,
+            "chunk_size": chunk_size,
+            "ordered": ordered,
+            "concurrency": concurrency,
+            "task_timeout": task_timeout,
+        }
+        self._executor: Optional[ParallelExecutor] = None
+        self.task_runner: Optional[AsyncTaskRunner] = None
         self.logger.info("アプリケーションを初期化しました")
 
     def run(self) -> None:
@@ -48,24 +177,222 @@ class Application:
         このメソッドは、アプリケーションのメインロジックを実行します。
         """
         self.logger.info("アプリケーションを実行します")
+        self.metrics.counter("app.runs").inc()
         try:
             # ここにアプリケーションのメインロジックを実装
-            self._process()
+            with self.metrics.time("phase.process"):
+                self._process()
+            self.logger.info("アプリケーションの実行が完了しました")
+        except Exception as e:
+            self.metrics.counter("app.failures").inc()
+            # フライトレコーダーが有効な場合は、直前のDEBUGログもあわせて出力される
+            self.logger.error(f"アプリケーションの実行中にエラーが発生しました: {e}")
+            raise
+        finally:
+            if self._executor is not None:
+                self._executor.close()
+            self._report_pipeline_stats()
+            self._report_config_stats()
+            self._export_metrics()
+
+    async def run_async(self) -> None:
+        """アプリケーションを1つのイベントループ上で実行します。
+
+        SIGINT または SIGTERM を受け取ると、実行中のコルーチンを
+        キャンセルし、それらの終了処理が終わってから
+        asyncio.CancelledError を送出します。
+
+        使用例:
+            asyncio.run(app.run_async())
+        """
+        self.logger.info("アプリケーションを非同期で実行します")
+        options = self._execution_options
+        concurrency = options["concurrency"] or self._config_value(
+            "execution.concurrency", int, 100
+        )
+        task_timeout = options["task_timeout"] or self._config_value(
+            "execution.task_timeout", float
+        )
+        self.task_runner = AsyncTaskRunner(concurrency, task_timeout)
+        loop = asyncio.get_running_loop()
+        signals = self._add_signal_handlers(loop)
+        self.metrics.counter("app.runs").inc()
+        try:
+            with self.metrics.time("phase.process"):
+                await self._process_async()
             self.logger.info("アプリケーションの実行が完了しました")
+        except asyncio.CancelledError:
+            self.metrics.counter("app.cancellations").inc()
+            self.logger.warning("アプリケーションの実行をキャンセルしました")
+            raise
         except Exception as e:
+            self.metrics.counter("app.failures").inc()
             self.logger.error(f"アプリケーションの実行中にエラーが発生しました: {e}")
             raise
+        finally:
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+            if self._executor is not None:
+                self._executor.close()
+            runner = self.task_runner
+            self.logger.info(lambda: f"非同期タスクの統計: {runner.summary()}")
+            self._report_pipeline_stats()
+            self._report_config_stats()
+            self._export_metrics()
+
+    def _add_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> List[int]:
+        """SIGINT と SIGTERM で実行中のタスクをキャンセルするように設定します。
+
+        メインスレッド以外や、シグナルハンドラに対応していない
+        イベントループでは設定しません。
+
+        Args:
+            loop: 実行中のイベントループ
+
+        Returns:
+            設定したシグナルのリスト
+        """
+        task = asyncio.current_task()
+        if task is None:
+            return []
+        signals = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, task.cancel)
+            except (NotImplementedError, RuntimeError, ValueError):
+                continue
+            signals.append(signum)
+        return signals
+
+    async def _process_async(self) -> None:
+        """内部処理を非同期で実行します。
+
+        サブクラスでオーバーライドして、コルーチンによる処理を実装することを
+        想定しています。pipeline が指定されている場合は、イベントループを
+        止めないよう別のスレッドでパイプラインを実行します。
+        """
+        self.logger.info("内部処理を実行します")
+        if self.pipeline is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.pipeline.run, self.executor)
+
+    @property
+    def executor(self) -> ParallelExecutor:
+        """並列実行に使用する ParallelExecutor。
+
+        最初に参照したときに、引数と設定の execution.* から作成します。
+        プロセスプールの場合は、解析済みの設定とロガーの設定を
+        ワーカーの初期化に渡します。
+
+        Raises:
+            ValueError: 不正な実行モード、ワーカーの数またはチャンクのサイズが
+                指定された場合
+        """
+        if self._executor is None:
+            options = self._execution_options
+            mode = options["mode"] or self.config.get("execution.mode", MODE_SERIAL)
+            ordered = options["ordered"]
+            if ordered is None:
+                ordered = self._config_value("execution.ordered", bool, True)
+            workers = options["workers"] or self._config_value(
+                "execution.workers", int
+            )
+            chunk_size = options["chunk_size"] or self._config_value(
+                "execution.chunk_size", int, 1000
+            )
+            initargs: tuple = ()
+            if mode == MODE_PROCESS:
+                initargs = (self.config.config, self._logger_options)
+            self._executor = ParallelExecutor(
+                mode=mode,
+                workers=workers,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                initializer=init_worker,
+                initargs=initargs,
+            )
+            # スレッドとして実行するワーカーはこのプロセスの設定とロガーを参照する
+            set_worker_context(self.config, self.logger)
+        return self._executor
+
+    def _config_value(self, key: str, tp: Any, default: Any = None) -> Any:
+        """設定値を取得し、型を変換して返します。
+
+        環境変数による上書きを適用するため、キーごとに config.get() で
+        取得します。環境変数の値は文字列のため、設定スキーマと同じ規則で
+        tp に変換します。
+
+        Args:
+            key: 設定キー
+            tp: 変換先の型（int、float、bool など）
+            default: キーが存在しない場合のデフォルト値
+
+        Returns:
+            変換された設定値。キーが存在しない場合はデフォルト値。
+
+        Raises:
+            ValueError: 値を変換できない場合
+        """
+        value = self.config.get(key)
+        if value is None:
+            return default
+        return parse_value(value, tp, key)
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[Any]:
+        """実行モードに従って、各項目に関数を適用した結果を返します。
+
+        _process() をオーバーライドする場合に、処理を並列に実行するために
+        使用します。プロセスプールで実行する場合、func はモジュールの
+        トップレベルで定義した関数である必要があります。
+
+        Args:
+            func: 項目を処理する関数
+            items: 項目の反復可能オブジェクト
+
+        Returns:
+            関数の戻り値のイテレータ
+        """
+        return self.executor.map(func, items)
+
+    def _report_pipeline_stats(self) -> None:
+        """パイプラインを実行した場合、ステージごとの統計をログに出力します。"""
+        pipeline = self.pipeline
+        if pipeline is not None and pipeline.stats:
+            self.logger.info(lambda: f"パイプラインの統計:\n{pipeline.report()}")
+
+    def _report_config_stats(self) -> None:
+        """設定アクセスの統計が有効な場合、統計をログに出力します。"""
+        stats = self.config.stats
+        if stats is not None:
+            self.logger.info(lambda: f"設定アクセスの統計:\n{stats.report()}")
+
+    def _export_metrics(self) -> None:
+        """メトリクスを JSON としてファイルまたはログに出力します。
+
+        書き込みに失敗しても実行の結果は変えず、警告をログに出力します。
+        """
+        path = self.metrics_file or self.config.get("metrics.file")
+        if not path:
+            metrics = self.metrics
+            self.logger.debug(
+                lambda: f"メトリクス: {json.dumps(metrics.to_dict(), ensure_ascii=False)}"
+            )
+            return
+        try:
+            self.metrics.write_json(path, extra={"timestamp": time.time()})
+        except OSError as e:
+            self.logger.warning(f"メトリクスの書き込みに失敗しました: {path}: {e}")
 
     def _process(self) -> None:
         """内部処理を実行します。
 
         このメソッドは、アプリケーションの内部処理を実行します。
-        サブクラスでオーバーライドして、具体的な処理を実装することを想定しています。
+        pipeline が指定されている場合は、パイプラインを実行します。
+        サブクラスでオーバーライドして、具体的な処理を実装することもできます。
         """
         self.logger.info("内部処理を実行します")
-        # ここにアプリケーション固有の処理を実装
-        # 例: データの処理、外部APIの呼び出し、計算の実行など
-        pass
+        if self.pipeline is not None:
+            self.pipeline.run(self.executor)
 
 
 def main() -> None:
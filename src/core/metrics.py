@@ -0,0 +1,338 @@
+"""メトリクスモジュール。
+
+このモジュールは、カウンタ、ゲージ、固定のバケットを持つヒストグラムと、
+それらをまとめてJSONに出力するレジストリを提供します。
+
+計測値の記録は、メトリクスの作成時に確保した値を更新するだけで、
+記録ごとにリストや辞書を作成しません。
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Union
+
+# 処理時間（秒）のヒストグラムのデフォルトのバケットの上限
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+)
+
+
+class Counter:
+    """単調に増加する値。
+
+    Attributes:
+        value: 現在の値
+    """
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        """Counterを初期化します。"""
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """値を増やします。
+
+        Args:
+            amount: 増やす量
+
+        Raises:
+            ValueError: amount が負の場合
+        """
+        if amount < 0:
+            raise ValueError(f"カウンタは減らせません: {amount}")
+        with self._lock:
+            self.value += amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """値を辞書として返します。"""
+        return {"type": "counter", "value": self.value}
+
+
+class Gauge:
+    """増減する現在の値。
+
+    Attributes:
+        value: 現在の値
+    """
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        """Gaugeを初期化します。"""
+        self.value: float = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """値を設定します。
+
+        Args:
+            value: 設定する値
+        """
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """値を増やします。
+
+        Args:
+            amount: 増やす量
+        """
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """値を減らします。
+
+        Args:
+            amount: 減らす量
+        """
+        with self._lock:
+            self.value -= amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """値を辞書として返します。"""
+        return {"type": "gauge", "value": self.value}
+
+
+class Histogram:
+    """固定のバケットで値の分布を数えるヒストグラム。
+
+    バケットごとの件数のリストは作成時に確保し、observe() は二分探索で
+    バケットを見つけて件数を1増やすだけです。最後のバケットの上限を
+    超えた値は、上限のないバケット（"+Inf"）に数えます。
+
+    Attributes:
+        buckets: バケットの上限（昇順）
+        count: 記録した値の数
+        sum: 記録した値の合計
+        min: 記録した値の最小値
+        max: 記録した値の最大値
+    """
+
+    __slots__ = ("buckets", "count", "sum", "min", "max", "_counts", "_lock")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Histogramを初期化します。
+
+        Args:
+            buckets: バケットの上限（昇順）
+
+        Raises:
+            ValueError: buckets が空、または昇順でない場合
+        """
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError(f"バケットは空でない昇順の列である必要があります: {buckets}")
+        self.buckets = tuple(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """値を記録します。
+
+        Args:
+            value: 記録する値
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def time(self) -> "_Timer":
+        """with 文のブロックの実行時間（秒）を記録するタイマーを返します。"""
+        return _Timer(self)
+
+    def percentile(self, ratio: float) -> float:
+        """値の分布からパーセンタイルを推定します。
+
+        ratio の位置の値を含むバケットの上限を返します。上限のない
+        バケットに含まれる場合は最大値を返します。
+
+        Args:
+            ratio: 0以上1以下の割合（例: 0.99）
+
+        Returns:
+            推定したパーセンタイル。値を記録していない場合は0
+        """
+        if not self.count:
+            return 0.0
+        rank = ratio * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self._counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """分布を辞書として返します。
+
+        buckets には各バケットの上限と、その上限以下の値の累積件数を含みます。
+        """
+        buckets: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip(self.buckets, self._counts):
+            total += count
+            buckets[repr(bound)] = total
+        buckets["+Inf"] = self.count
+        return {
+            "type": "histogram",
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class _Timer:
+    """ブロックの実行時間をヒストグラムに記録するコンテキストマネージャ。"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        """_Timerを初期化します。
+
+        Args:
+            histogram: 実行時間を記録するヒストグラム
+        """
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        """計測を開始します。"""
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """経過時間をヒストグラムに記録します。"""
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """名前でメトリクスを管理するクラス。
+
+    counter()、gauge()、histogram() は、同じ名前のメトリクスが
+    あればそれを返し、なければ作成します。頻繁に記録する場合は、
+    返されたメトリクスを変数に保持して使用してください。
+
+    使用例:
+        requests = metrics.counter("http.requests")
+        with metrics.time("http.latency"):
+            ...
+        requests.inc()
+    """
+
+    def __init__(self) -> None:
+        """MetricsRegistryを初期化します。"""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory: Any, *args: Any) -> Any:
+        """名前のメトリクスを返します。存在しない場合は作成します。
+
+        Raises:
+            ValueError: 同じ名前の種類の異なるメトリクスが存在する場合
+        """
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = factory(*args)
+        if not isinstance(metric, factory):
+            raise ValueError(f"{name} は {type(metric).__name__} として登録されています")
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        """カウンタを返します。
+
+        Args:
+            name: メトリクスの名前
+        """
+        return self._get(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        """ゲージを返します。
+
+        Args:
+            name: メトリクスの名前
+        """
+        return self._get(name, Gauge)
+
+    def histogram(
+        self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """ヒストグラムを返します。
+
+        Args:
+            name: メトリクスの名前
+            buckets: 作成する場合のバケットの上限（昇順）
+        """
+        return self._get(name, Histogram, buckets)
+
+    def time(self, name: str) -> _Timer:
+        """with 文のブロックの実行時間（秒）をヒストグラムに記録します。
+
+        Args:
+            name: ヒストグラムの名前
+        """
+        return self.histogram(name).time()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """すべてのメトリクスを名前順の辞書として返します。"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.to_dict() for name, metric in metrics}
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """すべてのメトリクスをJSONファイルに書き込みます。
+
+        書き込みは一時ファイルからの置き換えで行うため、読み込む側が
+        書きかけのファイルを読むことはありません。
+
+        Args:
+            path: 書き込むファイルのパス
+            extra: あわせて出力する値（出力した時刻など）
+        """
+        data = dict(extra or {})
+        data["metrics"] = self.to_dict()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
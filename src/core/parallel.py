@@ -0,0 +1,285 @@
+"""並列実行モジュール。
+
+このモジュールは、処理をチャンクに分割し、スレッドプールまたは
+プロセスプールで並列に実行する機能を提供します。
+
+プロセスプールのワーカーは起動時に一度だけ、解析済みの設定の辞書から
+ConfigManager を、ロガーの設定から Logger を作成します。タスクごとに
+設定ファイルを解析し直すことはありません。ワーカーで実行する関数は
+worker_config() と worker_logger() でそれらを参照できます。
+"""
+
+import collections
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing.util
+import os
+import sys
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
+
+from src.core.config import ConfigManager
+from src.core.handlers import handler_registry
+from src.core.logger import Logger
+
+# 実行モード
+MODE_SERIAL = "serial"  # 呼び出し元のスレッドで順に実行する
+MODE_THREAD = "thread"  # スレッドプールで実行する（I/O待ちの多い処理向け）
+MODE_PROCESS = "process"  # プロセスプールで実行する（CPUを使う処理向け）
+_MODES = (MODE_SERIAL, MODE_THREAD, MODE_PROCESS)
+
+# ワーカーで参照する設定とロガー
+_worker_context: Dict[str, Any] = {}
+
+
+def init_worker(config: Dict[str, Any], logger_options: Dict[str, Any]) -> None:
+    """プロセスプールのワーカーの設定とロガーを作成します。
+
+    ワーカーの起動時に一度だけ呼び出されます。fork で起動した場合に
+    親プロセスのハンドラを引き継がないよう、ハンドラの登録を解除してから
+    ロガーを作成します。
+
+    ワーカーは os._exit() で終了するため atexit も logging.shutdown() も
+    実行されません。ハンドラにバッファされたログを失わないよう、
+    ワーカーの終了処理でロガーを閉じるように登録します。
+
+    Args:
+        config: 解析済みの設定の辞書
+        logger_options: Logger の引数
+    """
+    handler_registry.forget_all()
+    manager = ConfigManager()
+    manager.config = config
+    logger = Logger(**logger_options)
+    multiprocessing.util.Finalize(None, logger.close, exitpriority=10)
+    set_worker_context(manager, logger)
+
+
+def set_worker_context(config: ConfigManager, logger: Logger) -> None:
+    """このプロセスのワーカーが参照する設定とロガーを設定します。
+
+    Args:
+        config: 設定マネージャ
+        logger: ロガー
+    """
+    _worker_context["config"] = config
+    _worker_context["logger"] = logger
+
+
+def worker_config() -> ConfigManager:
+    """ワーカーが参照する設定マネージャを返します。
+
+    Raises:
+        RuntimeError: 設定が初期化されていない場合
+    """
+    try:
+        return _worker_context["config"]
+    except KeyError:
+        raise RuntimeError("ワーカーの設定が初期化されていません") from None
+
+
+def worker_logger() -> Logger:
+    """ワーカーが参照するロガーを返します。
+
+    Raises:
+        RuntimeError: ロガーが初期化されていない場合
+    """
+    try:
+        return _worker_context["logger"]
+    except KeyError:
+        raise RuntimeError("ワーカーのロガーが初期化されていません") from None
+
+
+def _map_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    """チャンクの各レコードに関数を適用します。"""
+    return [func(record) for record in chunk]
+
+
+class ParallelExecutor:
+    """処理をチャンクに分割して並列に実行するクラス。
+
+    レコードを chunk_size 件ずつのチャンクに分割し、mode に従って
+    呼び出し元のスレッド、スレッドプール、プロセスプールのいずれかで
+    実行します。同時に実行待ちにするチャンクは workers の2倍までに
+    制限するため、レコードを先に読み込みすぎることはありません。
+
+    ordered がTrueの場合は投入した順に、Falseの場合は完了した順に
+    結果を返します。
+
+    プロセスプールで実行する関数と引数は pickle で送るため、
+    モジュールのトップレベルで定義した関数を使用してください。
+    プールは最初の実行時に作成し、close() で停止します。
+
+    Attributes:
+        mode: 実行モード（"serial", "thread", "process"）
+        workers: ワーカーの数
+        chunk_size: 1つのチャンクのレコード数
+        ordered: 投入した順に結果を返すかどうか
+    """
+
+    def __init__(
+        self,
+        mode: str = MODE_SERIAL,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+    ) -> None:
+        """ParallelExecutorを初期化します。
+
+        Args:
+            mode: 実行モード（"serial", "thread", "process"）
+            workers: ワーカーの数。指定されない場合はCPUの数を使用します。
+            chunk_size: 1つのチャンクのレコード数
+            ordered: Trueの場合は投入した順に、Falseの場合は完了した順に
+                結果を返します。
+            initializer: プロセスプールのワーカーの起動時に呼び出す関数
+            initargs: initializer の引数
+
+        Raises:
+            ValueError: 不正な mode、workers または chunk_size が指定された場合
+        """
+        if mode not in _MODES:
+            raise ValueError(f"不正なmodeです: {mode}")
+        if workers is not None and workers < 1:
+            raise ValueError(f"不正なworkersです: {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"不正なchunk_sizeです: {chunk_size}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pool: Optional[concurrent.futures.Executor] = None
+        # close() でキャンセルするための未完了のチャンク
+        self._futures: Set["concurrent.futures.Future[Any]"] = set()
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        """プールを返します。作成されていない場合は作成します。"""
+        if self._pool is None:
+            if self.mode == MODE_THREAD:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="app-worker"
+                )
+            else:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.workers,
+                    initializer=self._initializer,
+                    initargs=self._initargs,
+                )
+        return self._pool
+
+    def map(self, func: Callable[[Any], Any], records: Iterable[Any]) -> Iterator[Any]:
+        """各レコードに関数を適用した結果を返します。
+
+        Args:
+            func: レコードを処理する関数
+            records: レコードの反復可能オブジェクト
+
+        Yields:
+            関数の戻り値。ordered がFalseの場合はチャンク単位で完了した順。
+        """
+        for results in self.map_chunks(functools.partial(_map_chunk, func), records):
+            yield from results
+
+    def map_chunks(
+        self,
+        func: Callable[[List[Any]], Any],
+        records: Iterable[Any],
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """レコードをチャンクに分割し、各チャンクに関数を適用した結果を返します。
+
+        Args:
+            func: レコードのリストを処理する関数
+            records: レコードの反復可能オブジェクト
+            chunk_size: 1つのチャンクのレコード数。指定されない場合は
+                self.chunk_size を使用します。
+
+        Yields:
+            関数の戻り値
+        """
+        iterator = iter(records)
+        size = chunk_size or self.chunk_size
+        chunks = iter(lambda: list(itertools.islice(iterator, size)), [])
+        if self.mode == MODE_SERIAL:
+            for chunk in chunks:
+                yield func(chunk)
+            return
+
+        pool = self._get_pool()
+        pending: Deque["concurrent.futures.Future[Any]"] = collections.deque()
+        try:
+            for chunk in chunks:
+                future = pool.submit(func, chunk)
+                self._futures.add(future)
+                future.add_done_callback(self._futures.discard)
+                pending.append(future)
+                if len(pending) >= self.workers * 2:
+                    yield from self._collect(pending)
+            while pending:
+                yield from self._collect(pending)
+        finally:
+            # 呼び出し元が途中で止めた場合や例外が発生した場合は、
+            # 未実行のチャンクを破棄する
+            for future in pending:
+                future.cancel()
+
+    def _collect(
+        self, pending: "Deque[concurrent.futures.Future[Any]]"
+    ) -> Iterator[Any]:
+        """完了したチャンクの結果を取り出します。
+
+        Args:
+            pending: 実行中のチャンクのキュー
+
+        Yields:
+            ordered の場合は最も古いチャンクの結果、それ以外の場合は
+            完了したすべてのチャンクの結果
+        """
+        if self.ordered:
+            yield pending.popleft().result()
+            return
+        done, _ = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+    def close(self) -> None:
+        """プールを停止します。実行中のチャンクが完了するまで待ちます。"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            if sys.version_info >= (3, 9):
+                pool.shutdown(wait=True, cancel_futures=True)
+                return
+            # shutdown() の cancel_futures は Python 3.9 以降のため、
+            # 未実行のチャンクは自身でキャンセルする。キャンセルできなかった
+            # チャンクの完了を待ってから停止しないと、プロセスプールの
+            # shutdown() が終了しないことがある
+            futures = list(self._futures)
+            for future in futures:
+                future.cancel()
+            concurrent.futures.wait(futures)
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ParallelExecutor":
+        """自身を返します。"""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """プールを停止します。"""
+        self.close()
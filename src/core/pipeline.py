@@ -0,0 +1,545 @@
+"""パイプラインモジュール。
+
+このモジュールは、ソースから読み込んだレコードを変換ステージの連鎖に
+流し、シンクに書き込むストリーミング処理の機能を提供します。
+
+ステージはジェネレータとして連結するため、レコードは1件（または
+バッチ1つ）ずつ流れ、すべてのレコードをメモリに載せることはありません。
+"""
+
+import contextlib
+import functools
+import itertools
+import queue
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from src.core.parallel import ParallelExecutor
+
+# ソースの統計の名前
+SOURCE = "source"
+
+# バッファの終端を表す値
+_END = object()
+
+
+class _Failure:
+    """バッファの上流で発生した例外を下流に渡すための入れ物。"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        """_Failureを初期化します。
+
+        Args:
+            error: 上流で発生した例外
+        """
+        self.error = error
+
+
+class StageStats:
+    """ステージ1つ分の処理の統計。
+
+    Attributes:
+        records_in: 受け取ったレコードの数
+        records_out: 出力したレコードの数
+        batches: 関数を呼び出した回数
+        busy_ns: 関数の実行にかかった時間の合計（ns）
+        max_ns: 関数の1回の実行にかかった時間の最大値（ns）
+    """
+
+    __slots__ = ("records_in", "records_out", "batches", "busy_ns", "max_ns")
+
+    def __init__(self) -> None:
+        """StageStatsを初期化します。"""
+        self.records_in = 0
+        self.records_out = 0
+        self.batches = 0
+        self.busy_ns = 0
+        self.max_ns = 0
+
+    def add(self, records_in: int, records_out: int, elapsed_ns: int) -> None:
+        """関数の1回の呼び出しを記録します。
+
+        Args:
+            records_in: 関数に渡したレコードの数
+            records_out: 関数が出力したレコードの数
+            elapsed_ns: 関数の実行にかかった時間（ns）
+        """
+        self.records_in += records_in
+        self.records_out += records_out
+        self.batches += 1
+        self.busy_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def add_totals(
+        self, records_in: int, records_out: int, calls: int, busy_ns: int, max_ns: int
+    ) -> None:
+        """複数回の呼び出しの合計を記録します。
+
+        Args:
+            records_in: 関数に渡したレコードの数
+            records_out: 関数が出力したレコードの数
+            calls: 関数を呼び出した回数
+            busy_ns: 関数の実行にかかった時間の合計（ns）
+            max_ns: 関数の1回の実行にかかった時間の最大値（ns）
+        """
+        self.records_in += records_in
+        self.records_out += records_out
+        self.batches += calls
+        self.busy_ns += busy_ns
+        if max_ns > self.max_ns:
+            self.max_ns = max_ns
+
+    @property
+    def throughput(self) -> float:
+        """関数の実行時間あたりの処理件数（件/秒）。"""
+        count = self.records_in or self.records_out
+        return count / (self.busy_ns / 1e9) if self.busy_ns else 0.0
+
+    @property
+    def avg_ns(self) -> float:
+        """関数の1回の実行にかかった平均時間（ns）。"""
+        return self.busy_ns / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> Dict[str, int]:
+        """統計を辞書として返します。"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Stage:
+    """パイプラインの変換ステージまたはシンク。
+
+    batch_size を指定しない場合、func はレコードを1件ずつ受け取り、
+    変換したレコードを返します。Noneを返したレコードは捨てられます。
+    batch_size を指定した場合、func は最大 batch_size 件のレコードの
+    リストを受け取り、変換したレコードの反復可能オブジェクトを返します。
+    シンクとして使用した場合、func の戻り値は使用しません。
+
+    buffer_size を指定すると、上流のステージを別のスレッドで実行し、
+    このステージとの間に最大 buffer_size 件のレコードを保持するバッファを
+    置きます。このステージの処理が遅い場合は、バッファが満杯になった
+    時点で上流が待つため、メモリ使用量は buffer_size で抑えられます。
+    I/O を待つステージの前に置くと、上流の処理と並行して実行できます。
+
+    parallel をTrueにすると、Pipeline.run() に ParallelExecutor を
+    渡した場合に、このステージをチャンクに分割してワーカーで実行します。
+    チャンクのレコード数は batch_size（指定されない場合は executor の
+    chunk_size）です。プロセスプールで実行する場合、func はモジュールの
+    トップレベルで定義した関数である必要があります。
+
+    Attributes:
+        name: ステージ名
+        func: レコードまたはバッチを処理する関数
+        batch_size: 1回に処理するレコードの数。Noneの場合は1件ずつ処理します。
+        buffer_size: 上流との間のバッファのレコード数。0の場合はバッファを
+            置かず、上流と同じスレッドで処理します。
+        parallel: ParallelExecutor で並列に実行するかどうか
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        batch_size: Optional[int] = None,
+        buffer_size: int = 0,
+        parallel: bool = False,
+    ) -> None:
+        """Stageを初期化します。
+
+        Args:
+            name: ステージ名
+            func: レコードまたはバッチを処理する関数
+            batch_size: 1回に処理するレコードの数。Noneの場合は1件ずつ処理します。
+            buffer_size: 上流との間のバッファのレコード数。0の場合は
+                バッファを置きません。
+            parallel: Trueの場合、ParallelExecutor で並列に実行します。
+                実行待ちのチャンクの数が制限されるため、buffer_size とは
+                同時に指定できません。
+
+        Raises:
+            ValueError: batch_size が1未満、buffer_size が負、または
+                buffer_size と parallel を同時に指定した場合
+        """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"不正なbatch_sizeです: {batch_size}")
+        if buffer_size < 0:
+            raise ValueError(f"不正なbuffer_sizeです: {buffer_size}")
+        if buffer_size and parallel:
+            raise ValueError("buffer_size と parallel は同時に指定できません")
+        self.name = name
+        self.func = func
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.parallel = parallel
+
+
+class Pipeline:
+    """ソース、変換ステージ、シンクを連結して実行するクラス。
+
+    run() を呼び出すと、ソースのレコードを各ステージに順に流し、
+    シンクに渡します。ステージごとに関数の実行回数と実行時間を集計し、
+    report() で処理件数とレイテンシを表形式で返します。
+
+    ステージやシンクで例外が発生した場合は、バッファのスレッドを
+    停止してから例外を送出します。
+
+    Attributes:
+        source: レコードの反復可能オブジェクト、またはそれを返す関数
+        stages: 変換ステージのリスト
+        sink: 最後にレコードを受け取るステージ
+        stats: 直前の run() のステージ名ごとの統計
+        elapsed: 直前の run() の実行時間（秒）
+    """
+
+    poll_interval = 0.1
+
+    def __init__(
+        self,
+        source: Union[Iterable[Any], Callable[[], Iterable[Any]]],
+        stages: Sequence[Stage] = (),
+        sink: Optional[Stage] = None,
+    ) -> None:
+        """Pipelineを初期化します。
+
+        Args:
+            source: レコードの反復可能オブジェクト、またはそれを返す関数。
+                関数を指定した場合は、run() のたびに呼び出します。
+            stages: 変換ステージのリスト
+            sink: 最後にレコードを受け取るステージ。指定されない場合は
+                変換したレコードを捨てます。
+
+        Raises:
+            ValueError: ステージ名が重複している場合
+        """
+        names = [SOURCE] + [stage.name for stage in stages]
+        if sink is not None:
+            names.append(sink.name)
+        if len(set(names)) != len(names):
+            raise ValueError(f"ステージ名が重複しています: {names}")
+        self.source = source
+        self.stages = list(stages)
+        self.sink = sink
+        self.stats: Dict[str, StageStats] = {}
+        self.elapsed = 0.0
+
+    def run(self, executor: Optional[ParallelExecutor] = None) -> Dict[str, StageStats]:
+        """パイプラインを実行します。
+
+        Args:
+            executor: parallel を指定したステージを実行する ParallelExecutor。
+                指定されない場合は、すべてのステージを順に実行します。
+
+        Returns:
+            ステージ名ごとの統計
+        """
+        self.stats = {SOURCE: StageStats()}
+        source = self.source() if callable(self.source) else self.source
+        records = self._read_source(iter(source), self.stats[SOURCE])
+        stages = self.stages + ([self.sink] if self.sink is not None else [])
+        for stage in stages:
+            stats = self.stats[stage.name] = StageStats()
+            if stage.parallel and executor is not None:
+                records = self._run_parallel_stage(
+                    stage, stats, records, stage is self.sink, executor
+                )
+            else:
+                records = self._run_stage(stage, stats, records, stage is self.sink)
+
+        start = time.perf_counter()
+        try:
+            # 終了時または例外の発生時に、連結したジェネレータを閉じる
+            with contextlib.closing(records):
+                for _ in records:
+                    pass
+        finally:
+            self.elapsed = time.perf_counter() - start
+        return self.stats
+
+    def _read_source(self, source: Iterator[Any], stats: StageStats) -> Iterator[Any]:
+        """ソースのレコードを読み込み、読み込みにかかった時間を集計します。
+
+        Args:
+            source: ソースのイテレータ
+            stats: ソースの統計
+
+        Yields:
+            ソースのレコード
+        """
+        # レコードごとにメソッドを呼び出さないよう、ローカル変数で集計する
+        perf_counter_ns = time.perf_counter_ns
+        count = busy = longest = 0
+        try:
+            while True:
+                start = perf_counter_ns()
+                try:
+                    record = next(source)
+                except StopIteration:
+                    return
+                elapsed = perf_counter_ns() - start
+                count += 1
+                busy += elapsed
+                if elapsed > longest:
+                    longest = elapsed
+                yield record
+        finally:
+            stats.add_totals(0, count, count, busy, longest)
+            _close(source)
+
+    def _run_stage(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        records: Iterator[Any],
+        sink: bool,
+    ) -> Iterator[Any]:
+        """ステージの関数でレコードを処理します。
+
+        Args:
+            stage: ステージ
+            stats: ステージの統計
+            records: 上流のレコードのイテレータ
+            sink: シンクとして実行する場合はTrue
+
+        Yields:
+            ステージが出力したレコード
+        """
+        # 終了時に閉じるイテレータ。バッファを置いた場合、上流はバッファの
+        # スレッドが閉じる
+        upstream: Iterator[Any] = records
+        if stage.buffer_size:
+            upstream = self._buffered(_batched(records, stage.batch_size or 1), stage)
+        elif stage.batch_size is not None:
+            upstream = _batched(records, stage.batch_size)
+        inputs = upstream
+        if stage.buffer_size and stage.batch_size is None:
+            inputs = itertools.chain.from_iterable(upstream)
+        func = stage.func
+        perf_counter_ns = time.perf_counter_ns
+        try:
+            if stage.batch_size is None:
+                # レコードごとにメソッドを呼び出さないよう、ローカル変数で集計する
+                count = out = busy = longest = 0
+                try:
+                    for record in inputs:
+                        start = perf_counter_ns()
+                        result = func(record)
+                        elapsed = perf_counter_ns() - start
+                        count += 1
+                        busy += elapsed
+                        if elapsed > longest:
+                            longest = elapsed
+                        if not sink and result is not None:
+                            out += 1
+                            yield result
+                finally:
+                    stats.add_totals(count, out, count, busy, longest)
+            else:
+                for batch in inputs:
+                    start = perf_counter_ns()
+                    results = func(batch)
+                    if not sink and results is not None:
+                        # ジェネレータが返された場合も実行時間に含める
+                        results = list(results)
+                    elapsed = perf_counter_ns() - start
+                    if sink or results is None:
+                        stats.add(len(batch), 0, elapsed)
+                    else:
+                        stats.add(len(batch), len(results), elapsed)
+                        yield from results
+        finally:
+            _close(upstream)
+
+    def _run_parallel_stage(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        records: Iterator[Any],
+        sink: bool,
+        executor: ParallelExecutor,
+    ) -> Iterator[Any]:
+        """ステージをチャンクに分割し、ワーカーで実行します。
+
+        Args:
+            stage: ステージ
+            stats: ステージの統計
+            records: 上流のレコードのイテレータ
+            sink: シンクとして実行する場合はTrue
+            executor: チャンクを実行する ParallelExecutor
+
+        Yields:
+            ステージが出力したレコード
+        """
+        chunks = executor.map_chunks(
+            functools.partial(
+                _process_chunk, stage.func, stage.batch_size is not None, sink
+            ),
+            records,
+            stage.batch_size,
+        )
+        try:
+            for records_in, results, calls, busy, longest in chunks:
+                stats.add_totals(records_in, len(results), calls, busy, longest)
+                yield from results
+        finally:
+            _close(chunks)
+            _close(records)
+
+    def _buffered(
+        self, batches: Iterator[List[Any]], stage: Stage
+    ) -> Iterator[List[Any]]:
+        """上流を別のスレッドで実行し、バッファを通してバッチを受け取ります。
+
+        Args:
+            batches: 上流のバッチのイテレータ
+            stage: バッファを置くステージ
+
+        Yields:
+            上流のバッチ
+        """
+        buffer: "queue.Queue[Any]" = queue.Queue(
+            max(1, stage.buffer_size // (stage.batch_size or 1))
+        )
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            # 下流が停止した場合に待ち続けないよう、一定時間ごとに確認する
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=self.poll_interval)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for batch in batches:
+                    if not put(batch):
+                        return
+                put(_END)
+            except BaseException as e:
+                put(_Failure(e))
+            finally:
+                _close(batches)
+
+        producer = threading.Thread(
+            target=produce, name=f"pipeline-{stage.name}", daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+
+    def report(self) -> str:
+        """直前の run() の統計を表形式の文字列で返します。
+
+        Returns:
+            ステージごとの処理件数、スループット、レイテンシの表と合計
+        """
+        lines = [
+            f"{'stage':<20} {'in':>10} {'out':>10} {'calls':>8} {'busy ms':>10} "
+            f"{'rec/s':>10} {'avg us':>9} {'max us':>9}"
+        ]
+        for name, stats in self.stats.items():
+            lines.append(
+                f"{name:<20} {stats.records_in:>10} {stats.records_out:>10} "
+                f"{stats.batches:>8} {stats.busy_ns / 1e6:>10.1f} "
+                f"{stats.throughput:>10.0f} {stats.avg_ns / 1e3:>9.1f} "
+                f"{stats.max_ns / 1e3:>9.1f}"
+            )
+        count = self.stats[SOURCE].records_out if self.stats else 0
+        rate = count / self.elapsed if self.elapsed else 0.0
+        lines.append(
+            f"合計: {count} 件, 経過 {self.elapsed:.3f} 秒, {rate:.0f} 件/秒"
+        )
+        return "\n".join(lines)
+
+
+def _process_chunk(
+    func: Callable[[Any], Any], batched: bool, sink: bool, chunk: List[Any]
+) -> Tuple[int, List[Any], int, int, int]:
+    """ワーカーでチャンクにステージの関数を適用します。
+
+    Args:
+        func: ステージの関数
+        batched: Trueの場合はチャンクをまとめて関数に渡します。
+        sink: シンクとして実行する場合はTrue。結果を返しません。
+        chunk: レコードのリスト
+
+    Returns:
+        (受け取ったレコード数, 出力したレコード, 関数の呼び出し回数,
+        実行時間の合計（ns）, 1回の実行時間の最大値（ns）)
+    """
+    perf_counter_ns = time.perf_counter_ns
+    if batched:
+        start = perf_counter_ns()
+        results = func(chunk)
+        output = [] if sink or results is None else list(results)
+        elapsed = perf_counter_ns() - start
+        return len(chunk), output, 1, elapsed, elapsed
+
+    output = []
+    busy = longest = 0
+    for record in chunk:
+        start = perf_counter_ns()
+        result = func(record)
+        elapsed = perf_counter_ns() - start
+        busy += elapsed
+        if elapsed > longest:
+            longest = elapsed
+        if not sink and result is not None:
+            output.append(result)
+    return len(chunk), output, len(chunk), busy, longest
+
+
+def _batched(records: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """レコードを最大 size 件のリストにまとめます。
+
+    Args:
+        records: レコードのイテレータ
+        size: 1つのリストの最大のレコード数
+
+    Yields:
+        レコードのリスト
+    """
+    try:
+        while True:
+            batch = list(itertools.islice(records, size))
+            if not batch:
+                return
+            yield batch
+    finally:
+        _close(records)
+
+
+def _close(iterator: Iterator[Any]) -> None:
+    """イテレータがジェネレータの場合は閉じます。
+
+    Args:
+        iterator: 閉じるイテレータ
+    """
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
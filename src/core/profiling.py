@@ -0,0 +1,353 @@
+"""プロファイリングモジュール。
+
+このモジュールは、処理のCPU時間とメモリの確保を計測し、
+レポートをディレクトリに書き込む機能を提供します。
+
+CPUの計測には、すべての関数呼び出しを記録する cProfile と、一定の間隔で
+スタックを記録する StackSampler のいずれかを使用します。長時間の処理で
+cProfile のオーバーヘッドが大きい場合は、サンプリングを使用してください。
+メモリの計測には tracemalloc を使用します。
+"""
+
+import collections
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from types import CodeType, FrameType
+from typing import Any, Counter, List, Optional, Tuple
+
+PROFILE_CPU = "cpu"
+PROFILE_MEMORY = "memory"
+PROFILE_BOTH = "both"
+PROFILE_MODES = (PROFILE_CPU, PROFILE_MEMORY, PROFILE_BOTH)
+
+# 処理の本体として、呼び出し先の関数をレポートに個別に出力するメソッド
+PROCESS_FUNCTIONS = ("_process", "_process_async")
+
+Stack = Tuple[CodeType, ...]
+
+
+def _describe(code: CodeType) -> str:
+    """関数を「関数名 (ファイル:行)」の形式で返します。"""
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """一定の間隔でスレッドのスタックを記録するサンプリングプロファイラ。
+
+    バックグラウンドのスレッドが interval 秒ごとに対象のスレッドの
+    スタックを読み取り、同じスタックの出現回数を数えます。計測対象の
+    スレッドは関数呼び出しごとの処理を行わないため、cProfile に比べて
+    オーバーヘッドが小さく、長時間の処理にも使用できます。
+
+    出現回数は経過時間（待ち時間を含む）に比例します。
+
+    Attributes:
+        interval: サンプリングの間隔（秒）
+        samples: 記録したサンプルの数
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """StackSamplerを初期化します。
+
+        Args:
+            interval: サンプリングの間隔（秒）
+
+        Raises:
+            ValueError: interval が0以下の場合
+        """
+        if interval <= 0:
+            raise ValueError(f"不正なintervalです: {interval}")
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter[Stack] = collections.Counter()
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None) -> None:
+        """サンプリングを開始します。
+
+        Args:
+            thread_id: 対象のスレッドの識別子。指定されない場合は
+                このメソッドを呼び出したスレッドを対象にします。
+        """
+        self._target = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """サンプリングを終了します。"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """interval 秒ごとに対象のスレッドのスタックを記録します。"""
+        while not self._stop.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            self._stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def top_functions(
+        self, limit: int = 30, within: Optional[Tuple[str, ...]] = None
+    ) -> List[Tuple[CodeType, int, int]]:
+        """サンプルの多い関数を返します。
+
+        Args:
+            limit: 返す関数の最大数
+            within: 指定された場合、これらの名前の関数から呼び出された
+                関数だけを数えます。
+
+        Returns:
+            (関数のコード, 自身を実行していたサンプル数, 呼び出し先を含む
+            サンプル数) のリスト。呼び出し先を含むサンプル数の多い順
+        """
+        own: Counter[CodeType] = collections.Counter()
+        total: Counter[CodeType] = collections.Counter()
+        for stack, count in self._stacks.items():
+            if within is not None:
+                # 最も外側の呼び出しより内側のフレームだけを対象にする
+                outer = [i for i, code in enumerate(stack) if code.co_name in within]
+                if not outer:
+                    continue
+                stack = stack[: outer[-1]]
+                if not stack:
+                    continue
+            own[stack[0]] += count
+            for code in set(stack):
+                total[code] += count
+        return [(code, own[code], count) for code, count in total.most_common(limit)]
+
+    def report(self, limit: int = 30) -> str:
+        """サンプルの多い関数のレポートを返します。
+
+        Args:
+            limit: 出力する関数の最大数
+
+        Returns:
+            レポートの文字列
+        """
+        lines = [f"サンプル数: {self.samples}（間隔 {self.interval * 1000:g} ms）"]
+        sections = (
+            ("サンプルの多い関数", None),
+            (f"{' / '.join(PROCESS_FUNCTIONS)} から呼び出された関数", PROCESS_FUNCTIONS),
+        )
+        for title, within in sections:
+            lines.append("")
+            lines.append(f"{title}:")
+            lines.append(f"{'自身':>8} {'合計':>8} {'合計%':>7}  関数")
+            for code, own, total in self.top_functions(limit, within):
+                ratio = total / self.samples * 100 if self.samples else 0.0
+                lines.append(f"{own:8d} {total:8d} {ratio:6.1f}%  {_describe(code)}")
+        return "\n".join(lines) + "\n"
+
+    def write_folded(self, path: str) -> None:
+        """スタックを折り畳み形式（flamegraph.pl などの入力形式）で書き込みます。
+
+        Args:
+            path: 書き込むファイルのパス
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                names = ";".join(code.co_name for code in reversed(stack))
+                f.write(f"{names} {count}\n")
+
+
+class Profiler:
+    """処理のCPU時間とメモリの確保を計測し、レポートを書き込むクラス。
+
+    with 文のブロックを計測し、ブロックの終了時（例外で終了した場合を
+    含む）に output_dir にレポートを書き込みます。
+
+    mode が "cpu" または "both" の場合、sample_interval が指定されなければ
+    cProfile を使用して cpu.pstats（pstats 形式）と cpu.txt を、
+    指定されれば StackSampler を使用して cpu_samples.txt と
+    cpu_samples.folded を書き込みます。どちらのレポートにも、
+    _process() と _process_async() から呼び出された関数を個別に出力します。
+    cProfile とサンプリングは、計測を開始したスレッドだけを対象にします。
+
+    mode が "memory" または "both" の場合、tracemalloc を使用して
+    終了時に確保されているメモリの多い行と、実行中の最大使用量を
+    memory.txt に書き込みます。"both" の場合、cProfile の計測する時間には
+    tracemalloc によるメモリ確保のオーバーヘッドが含まれます。
+
+    使用例:
+        with Profiler("cpu", "profiles"):
+            app.run()
+
+    Attributes:
+        mode: 計測の種類（"cpu", "memory", "both"）
+        output_dir: レポートを書き込むディレクトリ
+        sample_interval: CPUのサンプリングの間隔（秒）
+        limit: レポートに出力する関数や行の最大数
+        files: 書き込んだレポートのパスのリスト
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: str,
+        sample_interval: Optional[float] = None,
+        limit: int = 30,
+        memory_frames: int = 10,
+    ) -> None:
+        """Profilerを初期化します。
+
+        Args:
+            mode: 計測の種類（"cpu", "memory", "both"）
+            output_dir: レポートを書き込むディレクトリ
+            sample_interval: 指定された場合、cProfile の代わりにこの間隔（秒）で
+                スタックをサンプリングします。
+            limit: レポートに出力する関数や行の最大数
+            memory_frames: tracemalloc が記録する呼び出し元のフレームの数
+
+        Raises:
+            ValueError: 不正な mode または sample_interval が指定された場合
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"不正なプロファイルの種類です: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.limit = limit
+        self.files: List[str] = []
+        self._memory_frames = memory_frames
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._tracing = False
+        if mode != PROFILE_MEMORY and sample_interval is not None:
+            self._sampler = StackSampler(sample_interval)
+
+    def start(self) -> None:
+        """計測を開始します。"""
+        if self.mode in (PROFILE_MEMORY, PROFILE_BOTH):
+            # tracemalloc が既に有効な場合は、その設定のまま使用する
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self._memory_frames)
+                self._tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9以降
+                tracemalloc.reset_peak()
+        if self.mode in (PROFILE_CPU, PROFILE_BOTH):
+            if self._sampler is not None:
+                self._sampler.start()
+            else:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+
+    def stop(self) -> List[str]:
+        """計測を終了し、レポートを書き込みます。
+
+        Returns:
+            書き込んだレポートのパスのリスト
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        memory_report = None
+        if self.mode in (PROFILE_MEMORY, PROFILE_BOTH):
+            memory_report = self._memory_report()
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self._profile is not None:
+            pstats_path = self._path("cpu.pstats")
+            self._profile.dump_stats(pstats_path)
+            self.files.append(pstats_path)
+            self._write("cpu.txt", self._cpu_report(self._profile))
+            self._profile = None
+        if self._sampler is not None and self.mode != PROFILE_MEMORY:
+            self._write("cpu_samples.txt", self._sampler.report(self.limit))
+            folded_path = self._path("cpu_samples.folded")
+            self._sampler.write_folded(folded_path)
+            self.files.append(folded_path)
+        if memory_report is not None:
+            self._write("memory.txt", memory_report)
+        return self.files
+
+    def _path(self, name: str) -> str:
+        """レポートのファイルのパスを返します。"""
+        return os.path.join(self.output_dir, name)
+
+    def _write(self, name: str, text: str) -> None:
+        """レポートをファイルに書き込みます。"""
+        path = self._path(name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.files.append(path)
+
+    def _cpu_report(self, profile: cProfile.Profile) -> str:
+        """cProfile の結果のレポートを返します。
+
+        累積時間と自身の実行時間の多い関数に加えて、_process() と
+        _process_async() から直接呼び出された関数の時間を出力します。
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.strip_dirs()
+        stream.write("累積時間（呼び出し先を含む）の多い関数:\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+        stream.write("自身の実行時間の多い関数:\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.limit)
+        stream.write(f"{' / '.join(PROCESS_FUNCTIONS)} から呼び出された関数:\n")
+        pattern = "|".join(rf"\({name}\)" for name in PROCESS_FUNCTIONS)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_callees(pattern)
+        return stream.getvalue()
+
+    def _memory_report(self) -> str:
+        """tracemalloc の結果のレポートを返します。"""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+        lines = [
+            f"現在の使用量: {current / 1024:.1f} KiB",
+            f"最大の使用量: {peak / 1024:.1f} KiB",
+            "",
+            "確保されているメモリの多い行:",
+        ]
+        for stat in snapshot.statistics("lineno")[: self.limit]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size / 1024:10.1f} KiB {stat.count:8d} 個  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        lines.append("")
+        lines.append("確保されているメモリの多い呼び出し経路:")
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append("")
+            lines.append(f"{stat.size / 1024:.1f} KiB（{stat.count} 個）")
+            lines.extend(stat.traceback.format(most_recent_first=True))
+        return "\n".join(lines) + "\n"
+
+    def __enter__(self) -> "Profiler":
+        """計測を開始します。"""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """計測を終了し、レポートを書き込みます。"""
+        self.stop()
+
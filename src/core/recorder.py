@@ -0,0 +1,90 @@
+"""フライトレコーダーモジュール。
+
+このモジュールは、出力されなかった直近のログをメモリに保持し、
+エラーが発生したときに出力するためのリングバッファを提供します。
+"""
+
+import itertools
+import time
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# 記録するメッセージ。呼び出し可能オブジェクトの場合は出力するときだけ評価する
+Message = Union[str, Callable[[], str]]
+
+# (通し番号, 作成時刻, ログレベル, メッセージ, 引数)
+Entry = Tuple[int, float, int, Message, Tuple[Any, ...]]
+
+
+class FlightRecorder:
+    """直近のログを固定長のリングバッファに保持するクラス。
+
+    メッセージはフォーマットせず、テンプレートと引数（または
+    メッセージを返す関数）のまま保持し、drain() で取り出すときに
+    呼び出し元でフォーマットします。
+
+    スロットのリストは初期化時に確保し、各スロットには1件分のタプルを
+    1回の代入で格納するため、複数のスレッドから同時に追加しても
+    記録が混ざることはありません（容量を超えた古い記録は上書きされます）。
+
+    メモリ使用量は capacity 件で上限が決まり、1件あたりスロットと
+    タプルで約 100 バイトに、メッセージと引数のオブジェクトが加わります。
+    テンプレートの文字列は通常は定数ですが、f-string のメッセージや
+    引数に渡したオブジェクトは、上書きされるか取り出されるまで解放されません。
+    また、引数は参照のまま保持するため、記録した後に変更すると
+    出力される内容も変わります。
+
+    Attributes:
+        capacity: 保持する記録の最大数
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """FlightRecorderを初期化し、スロットを確保します。
+
+        Args:
+            capacity: 保持する記録の最大数
+
+        Raises:
+            ValueError: capacity が1未満の場合
+        """
+        if capacity < 1:
+            raise ValueError(f"不正なcapacityです: {capacity}")
+        self.capacity = capacity
+        self._slots: List[Optional[Entry]] = [None] * capacity
+        self._counter = itertools.count()
+
+    def append(self, level: int, message: Message, args: Tuple[Any, ...]) -> None:
+        """記録を追加します。容量を超えた場合は最も古い記録を上書きします。
+
+        Args:
+            level: ログレベル
+            message: ログメッセージ、またはメッセージを返す関数
+            args: メッセージの % 形式の引数
+        """
+        sequence = next(self._counter)
+        self._slots[sequence % self.capacity] = (
+            sequence,
+            time.time(),
+            level,
+            message,
+            args,
+        )
+
+    def drain(self) -> List[Entry]:
+        """保持している記録を古い順に取り出し、リングバッファを空にします。
+
+        Returns:
+            記録のリスト
+        """
+        slots = self._slots
+        entries = []
+        for i in range(self.capacity):
+            entry = slots[i]
+            if entry is not None:
+                entries.append(entry)
+                slots[i] = None
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def __len__(self) -> int:
+        """保持している記録の数を返します。"""
+        return sum(1 for entry in self._slots if entry is not None)
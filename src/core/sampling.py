@@ -0,0 +1,133 @@
+"""ログのサンプリングモジュール。
+
+このモジュールは、同じ箇所から繰り返し出力されるログを間引く機能を提供します。
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class _SiteState:
+    """間引きの単位（呼び出し箇所など）ごとの状態。"""
+
+    __slots__ = ("count", "tokens", "updated", "suppressed")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        """_SiteStateを初期化します。
+
+        Args:
+            tokens: トークンバケットの初期の残量
+            updated: 初期化した時刻（time.monotonic() の値）
+        """
+        self.count = 0  # 呼び出し回数
+        self.tokens = tokens  # トークンバケットの残量
+        self.updated = updated  # tokens を更新した時刻
+        self.suppressed = 0  # 前回の集計以降に間引いた回数
+
+
+class LogSampler:
+    """ログの出力をキーごとに間引くクラス。
+
+    sample_every を指定すると、各キーの最初の呼び出しと、以降 sample_every
+    回に1回だけ出力を許可します。rate を指定すると、トークンバケットで
+    各キーの出力を1秒あたり rate 件（連続では最大 burst 件）に制限します。
+    両方を指定した場合は、サンプリングで残った呼び出しに流量制限を適用します。
+
+    間引いた回数はキーごとに数え、pop_suppressed() で取り出します。
+    summary_interval 秒ごとに取り出すかどうかの判定には summary_due() を
+    使用します。
+
+    Attributes:
+        sample_every: 出力を許可する間隔（回）
+        rate: キーごとの1秒あたりの出力件数の上限
+        burst: 連続して出力できる件数の上限
+        summary_interval: 間引いた回数を集計する間隔（秒）
+    """
+
+    def __init__(
+        self,
+        sample_every: int = 1,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        summary_interval: float = 60.0,
+    ) -> None:
+        """LogSamplerを初期化します。
+
+        Args:
+            sample_every: 出力を許可する間隔（回）。1の場合はサンプリングしません。
+            rate: キーごとの1秒あたりの出力件数の上限。Noneの場合は制限しません。
+            burst: 連続して出力できる件数の上限。指定されない場合は
+                rate（最小1）を使用します。
+            summary_interval: 間引いた回数を集計する間隔（秒）
+
+        Raises:
+            ValueError: 不正な sample_every、rate または burst が指定された場合
+        """
+        if sample_every < 1:
+            raise ValueError(f"不正なsample_everyです: {sample_every}")
+        if rate is not None and rate <= 0:
+            raise ValueError(f"不正なrateです: {rate}")
+        if burst is not None and burst < 1:
+            raise ValueError(f"不正なburstです: {burst}")
+        self.sample_every = sample_every
+        self.rate = rate
+        self.burst = float(burst if burst is not None else max(1.0, rate or 1.0))
+        self.summary_interval = summary_interval
+        self._sites: Dict[Hashable, _SiteState] = {}
+        self._lock = threading.Lock()
+        self._next_summary = time.monotonic() + summary_interval
+
+    def allow(self, key: Hashable, now: float) -> bool:
+        """キーの出力を許可するかを判定します。
+
+        Args:
+            key: 間引きの単位を表すキー
+            now: 現在時刻（time.monotonic() の値）
+
+        Returns:
+            出力を許可する場合はTrue
+        """
+        with self._lock:
+            state = self._sites.get(key)
+            if state is None:
+                state = self._sites[key] = _SiteState(self.burst, now)
+            state.count += 1
+            if (state.count - 1) % self.sample_every:
+                state.suppressed += 1
+                return False
+            if self.rate is not None:
+                tokens = state.tokens + (now - state.updated) * self.rate
+                state.tokens = tokens if tokens < self.burst else self.burst
+                state.updated = now
+                if state.tokens < 1.0:
+                    state.suppressed += 1
+                    return False
+                state.tokens -= 1.0
+            return True
+
+    def summary_due(self, now: float) -> bool:
+        """間引いた回数を集計する時刻になったかを返します。
+
+        Args:
+            now: 現在時刻（time.monotonic() の値）
+
+        Returns:
+            集計する時刻になった場合はTrue
+        """
+        return now >= self._next_summary
+
+    def pop_suppressed(self) -> List[Tuple[Hashable, int]]:
+        """前回の集計以降に間引いた回数を取り出し、0に戻します。
+
+        Returns:
+            間引いたことのあるキーと回数のリスト
+        """
+        with self._lock:
+            self._next_summary = time.monotonic() + self.summary_interval
+            result = []
+            for key, state in self._sites.items():
+                if state.suppressed:
+                    result.append((key, state.suppressed))
+                    state.suppressed = 0
+            return result
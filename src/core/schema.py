@@ -0,0 +1,336 @@
+"""設定スキーマモジュール。
+
+このモジュールは、設定の構造と型を宣言するスキーマと、読み込んだ設定を
+スキーマに従って属性アクセス可能なオブジェクトに変換する機能を提供します。
+
+使用例:
+    class PoolSchema(ConfigSchema):
+        size: int = 10
+
+    class DatabaseSchema(ConfigSchema):
+        host: str = "localhost"
+        pool: PoolSchema
+
+    class AppSchema(ConfigSchema):
+        database: DatabaseSchema
+
+    cfg = compile_schema(AppSchema, {"database": {"pool": {"size": "20"}}})
+    cfg.database.pool.size  # -> 20
+"""
+
+import copy
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T", bound="ConfigSchema")
+
+# 環境変数の値を取得する関数。引数は設定キー、戻り値は値（存在しない場合はNone）
+EnvLookup = Callable[[str], Optional[str]]
+
+# フィールドにデフォルト値がないことを表す番兵
+_REQUIRED = object()
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "no", "off"})
+
+
+class _SchemaMeta(type):
+    """スキーマクラスのメタクラス。
+
+    __slots__ を宣言していないサブクラスに空の __slots__ を追加し、
+    コンパイル済みのオブジェクトが __dict__ を持たないようにします。
+    """
+
+    def __new__(
+        mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any]
+    ) -> "_SchemaMeta":
+        """__slots__ を補ってスキーマクラスを作成します。
+
+        Args:
+            name: クラス名
+            bases: 基底クラスのタプル
+            namespace: クラスの名前空間
+
+        Returns:
+            作成されたクラス
+        """
+        namespace.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class ConfigSchema(metaclass=_SchemaMeta):
+    """設定スキーマの基底クラス。
+
+    サブクラスのクラス属性の型注釈でフィールドを宣言します。クラス属性に
+    値を代入したフィールドはその値がデフォルト値となり、代入していない
+    フィールドは必須となります。型注釈には int、float、bool、str、
+    ConfigSchema のサブクラス、およびそれらの Optional、List、Dict を
+    使用できます。
+
+    サブクラスには空の __slots__ が自動的に追加されるため、コンパイル済みの
+    オブジェクトはフィールドの値をスロットだけに保持します。
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        """フィールドと値の一覧を含む文字列表現を返します。"""
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in _fields(type(self))
+        )
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        """同じスキーマで、すべてのフィールドの値が等しい場合にTrueを返します。"""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in _fields(type(self))
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """コンパイル済みの設定は変更できません。"""
+        raise AttributeError(f"設定オブジェクトは変更できません: {name}")
+
+
+# スキーマクラスからフィールド定義と、コンパイル済みクラスへのキャッシュ
+_FIELD_CACHE: Dict[type, List[Tuple[str, Any, Any]]] = {}
+_COMPILED_CACHE: Dict[type, type] = {}
+
+
+def _fields(schema: type) -> List[str]:
+    """スキーマのフィールド名の一覧を返します。
+
+    Args:
+        schema: スキーマクラス（コンパイル済みクラスも可）
+
+    Returns:
+        フィールド名のリスト
+    """
+    return [name for name, _, _ in _field_specs(getattr(schema, "_schema", schema))]
+
+
+def _field_specs(schema: type) -> List[Tuple[str, Any, Any]]:
+    """スキーマのフィールド定義を返します。
+
+    Args:
+        schema: スキーマクラス
+
+    Returns:
+        (フィールド名, 型, デフォルト値) のリスト
+    """
+    specs = _FIELD_CACHE.get(schema)
+    if specs is None:
+        hints = typing.get_type_hints(schema)
+        specs = [
+            (name, tp, getattr(schema, name, _REQUIRED))
+            for name, tp in hints.items()
+            if not name.startswith("_")
+        ]
+        _FIELD_CACHE[schema] = specs
+    return specs
+
+
+def _compiled_class(schema: type) -> type:
+    """スキーマに対応する __slots__ ベースのクラスを返します。
+
+    コンパイル済みクラスはスキーマのサブクラスのため、isinstance による
+    判定や型チェッカーによる属性の補完はスキーマクラスに対して行えます。
+
+    Args:
+        schema: スキーマクラス
+
+    Returns:
+        コンパイル済みクラス
+    """
+    compiled = _COMPILED_CACHE.get(schema)
+    if compiled is None:
+        names = tuple(name for name, _, _ in _field_specs(schema))
+        namespace = {
+            "__slots__": names,
+            "__qualname__": schema.__qualname__,
+            "_schema": schema,
+        }
+        compiled = type(schema.__name__, (schema,), namespace)
+        _COMPILED_CACHE[schema] = compiled
+    return compiled
+
+
+def _is_schema(tp: Any) -> bool:
+    """型がスキーマクラスかどうかを返します。"""
+    return isinstance(tp, type) and issubclass(tp, ConfigSchema)
+
+
+def _coerce(
+    value: Any, tp: Any, path: str, env_lookup: Optional[EnvLookup] = None
+) -> Any:
+    """値を型注釈に従って変換します。
+
+    スキーマクラスの値は、Optional、List、Dict の要素であっても
+    スキーマに従ってコンパイルします。
+
+    Args:
+        value: 変換する値
+        tp: 型注釈
+        path: エラーメッセージに使用する設定キー
+        env_lookup: スキーマのフィールドの値を取得する環境変数の関数
+
+    Returns:
+        変換された値
+
+    Raises:
+        ValueError: 値を変換できない場合。
+    """
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+
+    if origin is typing.Union:
+        if value is None and type(None) in args:
+            return None
+        candidates = [a for a in args if a is not type(None)]
+        if len(candidates) == 1:
+            return _coerce(value, candidates[0], path, env_lookup)
+        return value
+
+    if _is_schema(tp):
+        return _compile(tp, value, env_lookup, path + ".")
+    if tp is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS:
+            return True
+        if isinstance(value, str) and value.strip().lower() in _FALSE_STRINGS:
+            return False
+    elif tp is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+    elif tp is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return float(value.strip())
+            except ValueError:
+                pass
+    elif tp is str:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+    elif origin in (list, List):
+        if isinstance(value, list):
+            item_type = args[0] if args else Any
+            return [
+                _coerce(v, item_type, f"{path}[{i}]", env_lookup)
+                for i, v in enumerate(value)
+            ]
+    elif origin in (dict, Dict):
+        if isinstance(value, dict):
+            value_type = args[1] if len(args) == 2 else Any
+            return {
+                k: _coerce(v, value_type, f"{path}.{k}", env_lookup)
+                for k, v in value.items()
+            }
+    else:
+        return value
+
+    raise ValueError(
+        f"設定値の型が不正です: {path} ({_type_name(tp)} が必要ですが {value!r} です)"
+    )
+
+
+def parse_value(value: Any, tp: Any, key: str) -> Any:
+    """設定値をスキーマのフィールドと同じ規則で型注釈に従って変換します。
+
+    環境変数から与えられた文字列も変換できます。真偽値は "true"/"false"、
+    "1"/"0"、"yes"/"no"、"on"/"off" を大文字小文字を区別せずに解釈します。
+    真偽値は int や float の値としては受け付けません。
+
+    Args:
+        value: 変換する値
+        tp: 型注釈。int、float、bool、str、およびそれらの Optional、List、Dict。
+        key: エラーメッセージに使用する設定キー
+
+    Returns:
+        変換された値
+
+    Raises:
+        ValueError: 値を変換できない場合。
+    """
+    return _coerce(value, tp, key)
+
+
+def _type_name(tp: Any) -> str:
+    """エラーメッセージ用の型名を返します。"""
+    return getattr(tp, "__name__", str(tp))
+
+
+def _compile(
+    schema: type, data: Any, env_lookup: Optional[EnvLookup], prefix: str
+) -> Any:
+    """スキーマに従って設定をコンパイルします。
+
+    Args:
+        schema: スキーマクラス
+        data: スキーマに対応する設定の辞書
+        env_lookup: 環境変数の値を取得する関数
+        prefix: 設定キーの接頭辞（末尾のドットを含む）
+
+    Returns:
+        コンパイル済みの設定オブジェクト
+
+    Raises:
+        ValueError: 設定がスキーマに適合しない場合。
+    """
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError(f"設定値の型が不正です: {prefix[:-1]} (辞書が必要です)")
+
+    compiled = _compiled_class(schema)
+    obj = object.__new__(compiled)
+    for name, tp, default in _field_specs(schema):
+        path = prefix + name
+        if _is_schema(tp):
+            value = _compile(tp, data.get(name), env_lookup, path + ".")
+        else:
+            env_value = env_lookup(path) if env_lookup is not None else None
+            if env_value is not None:
+                value = _coerce(env_value, tp, path)
+            elif name in data:
+                value = _coerce(data[name], tp, path, env_lookup)
+            elif default is not _REQUIRED:
+                # 可変なデフォルト値はオブジェクト間で共有しない
+                value = copy.deepcopy(default)
+            else:
+                raise ValueError(f"必須の設定がありません: {path}")
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def compile_schema(
+    schema: Type[T], data: Any, env_lookup: Optional[EnvLookup] = None
+) -> T:
+    """設定をスキーマに従って属性アクセス可能なオブジェクトに変換します。
+
+    変換と検証はこの呼び出しで一度だけ行われ、返されるオブジェクトの
+    属性参照は通常のスロット参照になります。
+
+    Args:
+        schema: スキーマクラス
+        data: 設定の辞書
+        env_lookup: 環境変数の値を取得する関数。指定された場合は、
+            スキーマ以外のフィールドの値を環境変数で上書きし、型を変換します。
+
+    Returns:
+        コンパイル済みの設定オブジェクト
+
+    Raises:
+        ValueError: 設定がスキーマに適合しない場合。
+    """
+    return _compile(schema, data, env_lookup, "")
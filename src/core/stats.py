@@ -0,0 +1,146 @@
+"""設定アクセスの統計モジュール。
+
+このモジュールは、設定キーごとの参照回数、デフォルト値へのフォールバック
+回数、環境変数による上書き回数、参照にかかった時間を集計する機能を
+提供します。ループ内で頻繁に参照されるキーを見つけ、ループの外に
+出したりスキーマで事前に変換したりする判断に使用します。
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+
+class KeyStats:
+    """設定キー1つ分のアクセス統計。
+
+    Attributes:
+        gets: get() の呼び出し回数
+        misses: キーが存在せずデフォルト値を返した回数
+        env_hits: 環境変数の値を返した回数
+        sets: set() の呼び出し回数
+        total_ns: get() にかかった時間の合計（ns）
+    """
+
+    __slots__ = ("gets", "misses", "env_hits", "sets", "total_ns")
+
+    def __init__(self) -> None:
+        """KeyStatsを初期化します。"""
+        self.gets = 0
+        self.misses = 0
+        self.env_hits = 0
+        self.sets = 0
+        self.total_ns = 0
+
+    @property
+    def avg_ns(self) -> float:
+        """get() 1回あたりの平均時間（ns）。"""
+        return self.total_ns / self.gets if self.gets else 0.0
+
+    def to_dict(self) -> Dict[str, int]:
+        """統計を辞書として返します。"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ConfigStats:
+    """設定アクセスの統計を集計するクラス。
+
+    複数のスレッドから同時に記録できます。
+    """
+
+    def __init__(self) -> None:
+        """ConfigStatsを初期化します。"""
+        self._keys: Dict[str, KeyStats] = {}
+        self._lock = threading.Lock()
+
+    def _key_stats(self, key: str) -> KeyStats:
+        """キーの統計を返します。存在しない場合は作成します。
+
+        呼び出し元で self._lock を取得している必要があります。
+        """
+        stats = self._keys.get(key)
+        if stats is None:
+            stats = self._keys[key] = KeyStats()
+        return stats
+
+    def record_get(self, key: str, elapsed_ns: int, miss: bool, env_hit: bool) -> None:
+        """get() の呼び出しを記録します。
+
+        Args:
+            key: 設定キー
+            elapsed_ns: 参照にかかった時間（ns）
+            miss: キーが存在せずデフォルト値を返した場合はTrue
+            env_hit: 環境変数の値を返した場合はTrue
+        """
+        with self._lock:
+            stats = self._key_stats(key)
+            stats.gets += 1
+            stats.total_ns += elapsed_ns
+            if miss:
+                stats.misses += 1
+            if env_hit:
+                stats.env_hits += 1
+
+    def record_set(self, key: str) -> None:
+        """set() の呼び出しを記録します。
+
+        Args:
+            key: 設定キー
+        """
+        with self._lock:
+            self._key_stats(key).sets += 1
+
+    def reset(self) -> None:
+        """統計をすべて破棄します。"""
+        with self._lock:
+            self._keys = {}
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        """キーごとの統計を辞書として返します。
+
+        Returns:
+            設定キーから統計の辞書へのマッピング
+        """
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._keys.items()}
+
+    def hot_keys(self, limit: int = 20) -> List[Tuple[str, KeyStats]]:
+        """get() の呼び出し回数が多い順にキーの統計を返します。
+
+        Args:
+            limit: 返すキーの最大数
+
+        Returns:
+            (設定キー, 統計) のリスト
+        """
+        with self._lock:
+            items = list(self._keys.items())
+        items.sort(key=lambda item: (-item[1].gets, -item[1].sets, item[0]))
+        return items[:limit]
+
+    def report(self, limit: int = 20) -> str:
+        """統計を表形式の文字列で返します。
+
+        Args:
+            limit: 表示するキーの最大数
+
+        Returns:
+            呼び出し回数が多い順にキーを並べた表と合計
+        """
+        lines = [
+            f"{'key':<40} {'gets':>8} {'misses':>8} {'env':>8} {'sets':>8} "
+            f"{'avg ns':>8}"
+        ]
+        for key, stats in self.hot_keys(limit):
+            lines.append(
+                f"{key:<40} {stats.gets:>8} {stats.misses:>8} {stats.env_hits:>8} "
+                f"{stats.sets:>8} {stats.avg_ns:>8.0f}"
+            )
+        with self._lock:
+            totals = list(self._keys.values())
+        lines.append(
+            f"合計: {len(totals)} キー, get {sum(s.gets for s in totals)} 回, "
+            f"ミス {sum(s.misses for s in totals)} 回, "
+            f"環境変数 {sum(s.env_hits for s in totals)} 回, "
+            f"set {sum(s.sets for s in totals)} 回"
+        )
+        return "\n".join(lines)
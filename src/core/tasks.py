@@ -0,0 +1,156 @@
+"""非同期タスクモジュール。
+
+このモジュールは、1つのイベントループ上でコルーチンを同時実行数と
+タイムアウトを制限して実行する機能を提供します。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+class AsyncTaskRunner:
+    """コルーチンを同時実行数とタイムアウトを制限して実行するクラス。
+
+    run() で実行するコルーチンは、セマフォによって同時に最大
+    concurrency 個までに制限され、timeout 秒を超えると
+    asyncio.TimeoutError で中断されます。
+
+    map() は項目ごとにタスクを作成しますが、未完了のタスクが concurrency 個に
+    達すると次の項目を読み込まずに待つため、項目が多くてもタスクを
+    まとめて作成することはありません。map() が例外やキャンセルで
+    中断した場合は、残りのタスクをキャンセルし、それらが終了処理を
+    終えるまで待ってから戻ります。
+
+    セマフォは最初の実行時にイベントループ上で作成するため、
+    インスタンスはイベントループの外で作成できますが、
+    1つのイベントループでのみ使用してください。
+
+    Attributes:
+        concurrency: 同時に実行するコルーチンの最大数
+        timeout: 1つのコルーチンのタイムアウト（秒）。Noneの場合は制限しません。
+        completed: 完了したコルーチンの数
+        failed: 例外で終了したコルーチンの数（タイムアウトを除く）
+        timed_out: タイムアウトしたコルーチンの数
+        cancelled: キャンセルされたコルーチンの数
+    """
+
+    def __init__(self, concurrency: int = 100, timeout: Optional[float] = None) -> None:
+        """AsyncTaskRunnerを初期化します。
+
+        Args:
+            concurrency: 同時に実行するコルーチンの最大数
+            timeout: 1つのコルーチンのタイムアウト（秒）。Noneの場合は制限しません。
+
+        Raises:
+            ValueError: concurrency が1未満、または timeout が0以下の場合
+        """
+        if concurrency < 1:
+            raise ValueError(f"不正なconcurrencyです: {concurrency}")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"不正なtimeoutです: {timeout}")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def run(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """同時実行数とタイムアウトを制限してコルーチンを実行します。
+
+        Args:
+            func: コルーチン関数
+            *args: func の引数
+
+        Returns:
+            コルーチンの戻り値
+
+        Raises:
+            asyncio.TimeoutError: timeout 秒以内に完了しなかった場合
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                if self.timeout is None:
+                    result = await func(*args)
+                else:
+                    result = await asyncio.wait_for(func(*args), self.timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            self.completed += 1
+            return result
+
+    async def map(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """各項目にコルーチン関数を適用し、結果を項目の順に返します。
+
+        Args:
+            func: 項目を受け取るコルーチン関数
+            items: 項目の反復可能オブジェクト
+            return_exceptions: Trueの場合、例外（タイムアウトを含む）を
+                送出せずに結果のリストに格納します。
+
+        Returns:
+            結果のリスト
+
+        Raises:
+            Exception: return_exceptions がFalseで、いずれかのコルーチンが
+                例外で終了した場合。残りのタスクはキャンセルされます。
+        """
+        results: Dict[int, Any] = {}
+        pending: Dict["asyncio.Task[Any]", int] = {}
+        try:
+            for index, item in enumerate(items):
+                if len(pending) >= self.concurrency:
+                    await self._wait(pending, results, return_exceptions)
+                pending[asyncio.ensure_future(self.run(func, item))] = index
+            while pending:
+                await self._wait(pending, results, return_exceptions)
+        finally:
+            if pending:
+                for task in pending:
+                    task.cancel()
+                # キャンセルしたタスクの終了処理が終わるまで待つ
+                await asyncio.gather(*pending, return_exceptions=True)
+        return [results[index] for index in range(len(results))]
+
+    async def _wait(
+        self,
+        pending: Dict["asyncio.Task[Any]", int],
+        results: Dict[int, Any],
+        return_exceptions: bool,
+    ) -> None:
+        """いずれかのタスクが完了するまで待ち、結果を格納します。
+
+        Args:
+            pending: 未完了のタスクから項目の位置へのマッピング
+            results: 項目の位置から結果へのマッピング
+            return_exceptions: Trueの場合、例外を結果に格納します。
+        """
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            index = pending.pop(task)
+            error = task.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results[index] = error if error is not None else task.result()
+
+    def summary(self) -> str:
+        """実行したコルーチンの数を1行の文字列で返します。"""
+        return (
+            f"完了 {self.completed} 件, 失敗 {self.failed} 件, "
+            f"タイムアウト {self.timed_out} 件, キャンセル {self.cancelled} 件"
+        )
@@ -0,0 +1,233 @@
+"""ファイル監視モジュール。
+
+このモジュールは、ファイルの変更を監視する機能を提供します。
+Linux では inotify を使用し、利用できない環境では更新時刻のポーリングで
+変更を検出します。
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify のイベントマスク（<sys/inotify.h> より）
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 連続するイベントをまとめるための待ち時間（秒）
+_DEBOUNCE_SECONDS = 0.05
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """inotify 関数を持つ libc を読み込みます。
+
+    Returns:
+        libc。inotify が利用できない場合は None。
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    """ファイルの変更検出に使用する更新時刻とサイズを返します。
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        (更新時刻(ns), サイズ)。ファイルが存在しない場合は None。
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """ファイルの変更を監視し、変更時にコールバックを呼び出すクラス。
+
+    監視はバックグラウンドのデーモンスレッドで行います。inotify では
+    エディタによるファイルの置き換えにも対応するため、ファイルではなく
+    親ディレクトリを監視し、対象のファイル名のイベントだけを扱います。
+
+    Attributes:
+        paths: 監視するファイルの絶対パスのリスト
+        interval: ポーリング間隔（秒）
+        backend: 使用している監視方式（"inotify" または "polling"）
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        callback: Callable[[], None],
+        interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        """FileWatcherを初期化します。
+
+        Args:
+            paths: 監視するファイルのパス
+            callback: 変更を検出したときに呼び出す関数
+            interval: ポーリング間隔（秒）。inotify使用時は停止要求の確認間隔。
+            use_inotify: Falseの場合、inotifyが利用可能でもポーリングを使用します。
+        """
+        self.paths: List[str] = [os.path.abspath(p) for p in paths]
+        self.interval = interval
+        self._callback = callback
+        self._libc = _load_libc() if use_inotify else None
+        self.backend = "inotify" if self._libc is not None else "polling"
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """監視を開始します。既に開始している場合は何もしません。
+
+        監視の準備は呼び出し元のスレッドで行うため、start() から戻った後の
+        変更は確実に検出されます。
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        inotify = self._open_inotify() if self.backend == "inotify" else None
+        if inotify is None:
+            self.backend = "polling"
+            signatures = {p: _stat_signature(p) for p in self.paths}
+            self._thread = threading.Thread(
+                target=self._run_polling,
+                args=(signatures,),
+                name="file-watcher",
+                daemon=True,
+            )
+        else:
+            self._thread = threading.Thread(
+                target=self._run_inotify,
+                args=inotify,
+                name="file-watcher",
+                daemon=True,
+            )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """監視スレッドを停止し、終了を待ちます。
+
+        コールバックの中から呼び出された場合は、終了を待たずに戻ります。
+        監視スレッドはコールバックから戻った後に終了します。
+        """
+        self._stop_event.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _notify(self) -> None:
+        """コールバックを呼び出します。例外はログに記録して握りつぶします。"""
+        try:
+            self._callback()
+        except Exception:
+            logger.exception("ファイル変更のコールバックでエラーが発生しました")
+
+    def _run_polling(self, signatures: Dict[str, Optional[Tuple[int, int]]]) -> None:
+        """更新時刻とサイズのポーリングで変更を検出します。
+
+        Args:
+            signatures: 監視開始時点の各ファイルの更新時刻とサイズ
+        """
+        while not self._stop_event.wait(self.interval):
+            current = {p: _stat_signature(p) for p in self.paths}
+            if current != signatures:
+                signatures = current
+                self._notify()
+
+    def _open_inotify(self) -> Optional[Tuple[int, Dict[int, List[str]]]]:
+        """inotify を初期化し、監視対象のファイルの親ディレクトリを登録します。
+
+        Returns:
+            (inotify のファイルディスクリプタ, ウォッチ記述子から監視対象の
+            ファイル名へのマッピング)。初期化に失敗した場合は None。
+        """
+        assert self._libc is not None
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        names: Dict[int, List[str]] = {}
+        for directory in sorted({os.path.dirname(p) for p in self.paths}):
+            wd = self._libc.inotify_add_watch(
+                fd, os.fsencode(directory), _IN_WATCH_MASK
+            )
+            if wd < 0:
+                os.close(fd)
+                return None
+            names[wd] = [
+                os.path.basename(p)
+                for p in self.paths
+                if os.path.dirname(p) == directory
+            ]
+        return fd, names
+
+    def _run_inotify(self, fd: int, names: Dict[int, List[str]]) -> None:
+        """inotify で変更を検出します。
+
+        Args:
+            fd: inotify のファイルディスクリプタ
+            names: ウォッチ記述子から監視対象のファイル名へのマッピング
+        """
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([fd], [], [], self.interval)
+                if not readable:
+                    continue
+                changed = self._read_events(fd, names)
+                # 書き込みが複数のイベントに分かれるため、少し待ってまとめる
+                while select.select([fd], [], [], _DEBOUNCE_SECONDS)[0]:
+                    changed = self._read_events(fd, names) or changed
+                if changed:
+                    self._notify()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_events(fd: int, names: Dict[int, List[str]]) -> bool:
+        """inotify のイベントを読み出し、監視対象のファイルが含まれるかを返します。
+
+        Args:
+            fd: inotify のファイルディスクリプタ
+            names: ウォッチ記述子から監視対象のファイル名へのマッピング
+
+        Returns:
+            監視対象のファイルに対するイベントが含まれる場合はTrue
+        """
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            return False
+        changed = False
+        offset = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if name in names.get(wd, ()):
+                changed = True
+        return changed
@@ -0,0 +1,166 @@
+"""ログコレクタモジュールのテスト。
+
+このモジュールは、ログコレクタモジュール（src.core.collector）のテストを提供します。
+"""
+
+import glob
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.core.collector import CollectorHandler, LogCollector
+from src.core.handlers import BatchingRotatingFileHandler
+from src.core.logger import Logger
+
+
+def _write_logs(address: str, worker: int, count: int) -> None:
+    """ログコレクタにログを送る子プロセスの処理。"""
+    with patch("sys.stdout", new=io.StringIO()):
+        logger = Logger(
+            f"worker{worker}", format_string="%(message)s", collector=address
+        )
+        for i in range(count):
+            logger.info(f"worker {worker} record {i:05d}")
+        logger.close()
+
+
+class TestLogCollector(unittest.TestCase):
+    """LogCollectorクラスとCollectorHandlerクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.temp_dir.name, "log.sock")
+        self.log_file = os.path.join(self.temp_dir.name, "app.log")
+        self.collector: LogCollector = None  # type: ignore[assignment]
+        self.logger = logging.getLogger("test_collector")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.handlers = []
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        for handler in self.logger.handlers:
+            handler.close()
+        self.logger.handlers = []
+        if self.collector is not None:
+            self.collector.close()
+        self.temp_dir.cleanup()
+
+    def _start_collector(self, **kwargs) -> LogCollector:
+        """レコードごとに書き込むハンドラでログコレクタを起動します。"""
+        options = {"buffer_size": 0, "flush_interval": 0}
+        options.update(kwargs)
+        handler = BatchingRotatingFileHandler(self.log_file, **options)
+        self.collector = LogCollector(self.address, handler)
+        self.collector.start()
+        return self.collector
+
+    def _create_handler(self, address: str = "", **kwargs) -> CollectorHandler:
+        """ハンドラを作成してロガーに追加します。"""
+        options = {"flush_interval": 0}
+        options.update(kwargs)
+        handler = CollectorHandler(address or self.address, **options)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.logger.addHandler(handler)
+        return handler
+
+    def _read(self) -> str:
+        """ログファイルの内容を返します。"""
+        with open(self.log_file, encoding="utf-8") as f:
+            return f.read()
+
+    def test_collect(self) -> None:
+        """送られたログがまとめて書き込まれることのテスト。"""
+        collector = self._start_collector()
+        handler = self._create_handler(batch_size=100)
+        for i in range(10):
+            self.logger.info(f"record {i}")  # 1レコード 14 バイト
+        handler.close()
+        self.logger.handlers = []
+        collector.close()
+
+        self.assertEqual(
+            self._read(), "".join(f"INFO record {i}\n" for i in range(10))
+        )
+        # 8レコード（112バイト）のまとまりと、close() で送った残りの2レコード
+        self.assertEqual(collector.received, 2)
+        self.assertFalse(os.path.exists(self.address))
+
+    def test_flush_level(self) -> None:
+        """ERROR以上のレコードがすぐに送られることのテスト。"""
+        self._start_collector()
+        self._create_handler()
+        self.logger.info("before")
+        self.logger.error("failure")
+
+        deadline = time.monotonic() + 5
+        while self._read() != "INFO before\nERROR failure\n":
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_flush_interval(self) -> None:
+        """一定間隔で送られることのテスト。"""
+        self._start_collector()
+        self._create_handler(flush_interval=0.01)
+        self.logger.info("periodic")
+
+        deadline = time.monotonic() + 5
+        while "periodic" not in self._read():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_collector_unavailable(self) -> None:
+        """コレクタに接続できない場合にレコードを捨てて数えることのテスト。"""
+        missing = os.path.join(self.temp_dir.name, "missing.sock")
+        handler = self._create_handler(address=missing)
+        with patch("sys.stderr", new=io.StringIO()) as fake_stderr:
+            self.logger.info("lost")
+            self.logger.error("lost")
+        self.assertEqual(handler.dropped, 2)
+        self.assertIn("ログコレクタに送信できませんでした", fake_stderr.getvalue())
+
+        # コレクタが起動した後は接続し直して送る
+        self.address = missing
+        collector = self._start_collector()
+        self.logger.error("delivered")
+        handler.close()
+        self.logger.handlers = []
+        collector.close()
+        self.assertEqual(self._read(), "ERROR delivered\n")
+
+    def test_multiple_processes(self) -> None:
+        """複数のプロセスのログがローテーションしても失われないことのテスト。"""
+        self._start_collector(max_bytes=20000, backup_count=50)
+        count = 2000
+        processes = [
+            multiprocessing.Process(target=_write_logs, args=(self.address, n, count))
+            for n in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        self.collector.close()
+
+        lines = []
+        for path in glob.glob(self.log_file + "*"):
+            with open(path, encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        self.assertGreater(len(glob.glob(self.log_file + ".*")), 1)
+        self.assertEqual(
+            sorted(lines),
+            sorted(
+                f"worker {n} record {i:05d}" for n in range(3) for i in range(count)
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
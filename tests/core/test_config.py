@@ -3,15 +3,32 @@
 このモジュールは、設定管理モジュール（src.core.config）のテストを提供します。
 """
 
+import copy
 import json
 import os
 import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
 
 import yaml
 
-from src.core.config import ConfigManager
+from src.core.config import ConfigManager, ConfigView
+from src.core.schema import ConfigSchema
+
+
+class DatabaseSchema(ConfigSchema):
+    """テスト用のデータベースのスキーマ。"""
+
+    host: str
+    port: int
+
+
+class AppSchema(ConfigSchema):
+    """テスト用のアプリケーションのスキーマ。"""
+
+    database: DatabaseSchema
 
 
 class TestConfigManager(unittest.TestCase):
@@ -84,6 +101,63 @@ class TestConfigManager(unittest.TestCase):
         finally:
             os.unlink(temp_file_path)
 
+    def test_load_config_with_cache(self) -> None:
+        """キャッシュディレクトリを指定した場合に解析結果が再利用されることのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            cache_dir = os.path.join(temp_dir, "cache")
+            with open(config_path, "w", encoding="utf-8") as f:
+                yaml.dump(self.test_config, f)
+
+            ConfigManager(config_path, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch("src.core.config.yaml.load") as mock_load:
+                config_manager = ConfigManager(config_path, cache_dir=cache_dir)
+                mock_load.assert_not_called()
+            self.assertEqual(config_manager.config, self.test_config)
+
+    def test_load_config_cache_invalidated_on_change(self) -> None:
+        """設定ファイルが変更された場合にキャッシュが使われないことのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.json")
+            cache_dir = os.path.join(temp_dir, "cache")
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump(self.test_config, f)
+            ConfigManager(config_path, cache_dir=cache_dir)
+
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump({"app": {"name": "Changed"}}, f)
+            config_manager = ConfigManager(config_path, cache_dir=cache_dir)
+            self.assertEqual(config_manager.get("app.name"), "Changed")
+
+    def test_load_config_cache_with_dates(self) -> None:
+        """marshalで表現できない値を含む設定もキャッシュできることのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            cache_dir = os.path.join(temp_dir, "cache")
+            with open(config_path, "w", encoding="utf-8") as f:
+                f.write("release:\n  date: 2024-01-01\n")
+
+            first = ConfigManager(config_path, cache_dir=cache_dir)
+            second = ConfigManager(config_path, cache_dir=cache_dir)
+            self.assertEqual(second.config, first.config)
+
+    def test_load_config_corrupted_cache(self) -> None:
+        """壊れたキャッシュファイルは無視されることのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.json")
+            cache_dir = os.path.join(temp_dir, "cache")
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump(self.test_config, f)
+            ConfigManager(config_path, cache_dir=cache_dir)
+            for name in os.listdir(cache_dir):
+                with open(os.path.join(cache_dir, name), "wb") as f:
+                    f.write(b"broken")
+
+            config_manager = ConfigManager(config_path, cache_dir=cache_dir)
+            self.assertEqual(config_manager.config, self.test_config)
+
     def test_get_existing_key(self) -> None:
         """存在するキーの値を取得するテスト。"""
         config_manager = ConfigManager()
@@ -104,8 +178,36 @@ class TestConfigManager(unittest.TestCase):
         config_manager = ConfigManager()
         config_manager.config = self.test_config
 
+        with patch.dict(os.environ, {"APP_DATABASE_HOST": "env-host"}):
+            config_manager.refresh_env()
+            self.assertEqual(config_manager.get("database.host"), "env-host")
+
+    def test_env_snapshot_taken_at_init(self) -> None:
+        """初期化時の環境変数スナップショットが使われることのテスト。"""
+        with patch.dict(os.environ, {"APP_DATABASE_HOST": "env-host"}):
+            config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        self.assertEqual(config_manager.get("database.host"), "env-host")
+
+        with patch.dict(os.environ, {"APP_DATABASE_PORT": "6543"}):
+            self.assertEqual(config_manager.get("database.port"), 5432)
+
+    def test_refresh_env_drops_removed_variables(self) -> None:
+        """refresh_envで削除された環境変数の上書きが解除されることのテスト。"""
+        with patch.dict(os.environ, {"APP_DATABASE_HOST": "env-host"}):
+            config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        config_manager.refresh_env()
+        self.assertEqual(config_manager.get("database.host"), "localhost")
+
+    def test_live_env(self) -> None:
+        """live_envを有効にした場合に環境変数の変更が即座に反映されることのテスト。"""
+        config_manager = ConfigManager(live_env=True)
+        config_manager.config = self.test_config
+
         with patch.dict(os.environ, {"APP_DATABASE_HOST": "env-host"}):
             self.assertEqual(config_manager.get("database.host"), "env-host")
+        self.assertEqual(config_manager.get("database.host"), "localhost")
 
     def test_set_new_key(self) -> None:
         """新しいキーに値を設定するテスト。"""
@@ -126,6 +228,655 @@ class TestConfigManager(unittest.TestCase):
         config_manager.set("a.b.c.d", "value")
         self.assertEqual(config_manager.get("a.b.c.d"), "value")
 
+    def test_get_none_value(self) -> None:
+        """値がNoneのキーはデフォルト値ではなくNoneを返すことのテスト。"""
+        config_manager = ConfigManager()
+        config_manager.config = {"a": {"b": None}}
+        self.assertIsNone(config_manager.get("a.b", "default"))
+
+    def test_get_intermediate_node(self) -> None:
+        """中間ノードのキーで辞書全体を取得するテスト。"""
+        config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        self.assertEqual(config_manager.get("app"), self.test_config["app"])
+
+    def test_reassign_config_invalidates_index(self) -> None:
+        """configを再代入するとインデックスが作り直されることのテスト。"""
+        config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        self.assertEqual(config_manager.get("app.name"), "TestApp")
+
+        config_manager.config = {"app": {"name": "Other"}}
+        self.assertEqual(config_manager.get("app.name"), "Other")
+        self.assertIsNone(config_manager.get("database.host"))
+
+    def test_set_replaces_subtree_in_index(self) -> None:
+        """辞書の値を置き換えると古い配下のキーが参照できなくなることのテスト。"""
+        config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        self.assertEqual(config_manager.get("database.host"), "localhost")
+
+        config_manager.set("database", {"url": "sqlite://"})
+        self.assertIsNone(config_manager.get("database.host"))
+        self.assertEqual(config_manager.get("database.url"), "sqlite://")
+
+    def test_set_through_non_dict_value(self) -> None:
+        """辞書でない中間ノードを経由して値を設定するテスト。"""
+        config_manager = ConfigManager()
+        config_manager.config = self.test_config
+        self.assertEqual(config_manager.get("app.name"), "TestApp")
+
+        config_manager.set("app.name.first", "Test")
+        self.assertEqual(config_manager.get("app.name"), {"first": "Test"})
+        self.assertEqual(config_manager.get("app.name.first"), "Test")
+
+
+
+class TestConfigManagerSchema(unittest.TestCase):
+    """ConfigManagerのスキーマ対応のテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"database": {"host": "localhost", "port": 5432}}, f)
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def test_typed(self) -> None:
+        """読み込んだ設定を属性で参照するテスト。"""
+        config_manager = ConfigManager(self.config_path, schema=AppSchema)
+        self.assertEqual(config_manager.typed.database.host, "localhost")
+        self.assertEqual(config_manager.typed.database.port, 5432)
+
+    def test_typed_env_override_is_coerced(self) -> None:
+        """環境変数の値がスキーマの型に変換されることのテスト。"""
+        with patch.dict(os.environ, {"APP_DATABASE_PORT": "6543"}):
+            config_manager = ConfigManager(self.config_path, schema=AppSchema)
+        self.assertEqual(config_manager.typed.database.port, 6543)
+
+    def test_invalid_config_raises_at_load(self) -> None:
+        """スキーマに適合しない設定は読み込み時にエラーになることのテスト。"""
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"database": {"host": "localhost", "port": "x"}}, f)
+        with self.assertRaisesRegex(ValueError, "database.port"):
+            ConfigManager(self.config_path, schema=AppSchema)
+
+    def test_typed_reflects_set(self) -> None:
+        """setで変更した値がtypedに反映されることのテスト。"""
+        config_manager = ConfigManager(self.config_path, schema=AppSchema)
+        config_manager.set("database.port", 7000)
+        self.assertEqual(config_manager.typed.database.port, 7000)
+
+    def test_typed_without_schema(self) -> None:
+        """スキーマなしでtypedを参照した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            ConfigManager(self.config_path).typed
+
+
+class TestConfigManagerLayers(unittest.TestCase):
+    """ConfigManagerの複数設定ファイルと取り込みのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base_path = self._write(
+            "base.yaml",
+            {"database": {"host": "localhost", "port": 5432}, "app": {"debug": False}},
+        )
+        self.env_path = self._write(
+            "production.yaml", {"database": {"host": "db.example.com"}}
+        )
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def _write(self, name: str, config: dict) -> str:
+        """設定ファイルを書き込み、そのパスを返します。"""
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.dump(config, f)
+        return path
+
+    def test_load_multiple_sources(self) -> None:
+        """複数の設定ファイルが順に深くマージされることのテスト。"""
+        config_manager = ConfigManager([self.base_path, self.env_path])
+        self.assertEqual(config_manager.get("database.host"), "db.example.com")
+        self.assertEqual(config_manager.get("database.port"), 5432)
+        self.assertIs(config_manager.get("app.debug"), False)
+
+    def test_include(self) -> None:
+        """includeで取り込んだ設定ファイルより自身の値が優先されることのテスト。"""
+        path = self._write(
+            "app.yaml", {"include": "production.yaml", "app": {"debug": True}}
+        )
+        self._write("production.yaml", {"include": ["base.yaml"]})
+        config_manager = ConfigManager(path)
+        self.assertEqual(config_manager.get("database.host"), "localhost")
+        self.assertIs(config_manager.get("app.debug"), True)
+        self.assertIsNone(config_manager.get("include"))
+        self.assertEqual(
+            config_manager.layer_paths,
+            [self.base_path, self.env_path, os.path.abspath(path)],
+        )
+
+    def test_include_cycle(self) -> None:
+        """取り込みが循環している場合のテスト。"""
+        path = self._write("a.yaml", {"include": "b.yaml"})
+        self._write("b.yaml", {"include": "a.yaml"})
+        with self.assertRaisesRegex(ValueError, "循環"):
+            ConfigManager(path)
+
+    def test_include_missing_file(self) -> None:
+        """取り込む設定ファイルが存在しない場合のテスト。"""
+        path = self._write("a.yaml", {"include": "missing.yaml"})
+        with self.assertRaises(FileNotFoundError):
+            ConfigManager(path)
+
+    def test_non_mapping_root(self) -> None:
+        """ルートが辞書でない設定ファイルの場合のテスト。"""
+        path = os.path.join(self.temp_dir.name, "list.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("- a\n- b\n")
+        with self.assertRaises(ValueError):
+            ConfigManager(path)
+
+    def test_reload_reparses_only_changed_layer(self) -> None:
+        """再読み込み時に変更された設定ファイルだけが再解析されることのテスト。"""
+        config_manager = ConfigManager([self.base_path, self.env_path])
+        self._write("production.yaml", {"database": {"host": "db2.example.com"}})
+
+        with patch.object(
+            config_manager, "_read_config", wraps=config_manager._read_config
+        ) as mock_read:
+            self.assertTrue(config_manager.reload())
+        mock_read.assert_called_once_with(os.path.abspath(self.env_path))
+        self.assertEqual(config_manager.get("database.host"), "db2.example.com")
+        self.assertEqual(config_manager.get("database.port"), 5432)
+
+    def test_set_does_not_leak_into_layers(self) -> None:
+        """setの値が再読み込み時に破棄されることのテスト。"""
+        config_manager = ConfigManager([self.base_path, self.env_path])
+        config_manager.set("database.port", 6543)
+        self._write("production.yaml", {"database": {"host": "db2.example.com"}})
+
+        config_manager.reload()
+        self.assertEqual(config_manager.get("database.port"), 5432)
+
+    def test_watch_included_file(self) -> None:
+        """取り込んだ設定ファイルの変更が監視されることのテスト。"""
+        path = self._write("app.yaml", {"include": "base.yaml"})
+        config_manager = ConfigManager(path)
+        changed = threading.Event()
+        config_manager.subscribe("database.host", lambda *_: changed.set())
+        config_manager.watch(interval=0.01, use_inotify=False)
+        try:
+            self._write("base.yaml", {"database": {"host": "db.example.com"}})
+            self.assertTrue(changed.wait(5))
+            self.assertEqual(config_manager.get("database.host"), "db.example.com")
+        finally:
+            config_manager.stop_watching()
+
+
+class TestConfigManagerLazy(unittest.TestCase):
+    """ConfigManagerの遅延読み込みのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.json")
+        self.test_config = {
+            "logging": {"file": "/var/log/app.log"},
+            "tables": {"countries": {"jp": "Japan", "us": "United States"}},
+        }
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(self.test_config, f)
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def test_get_parses_only_accessed_section(self) -> None:
+        """参照したセクションだけが解析されることのテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        document = config_manager._snapshot.document
+        with patch.object(document, "load", wraps=document.load) as mock_load:
+            self.assertEqual(config_manager.get("logging.file"), "/var/log/app.log")
+            self.assertEqual(config_manager.get("logging.file"), "/var/log/app.log")
+        mock_load.assert_called_once_with("logging")
+        self.assertEqual(config_manager._snapshot.pending, {"tables"})
+
+    def test_get_missing_key(self) -> None:
+        """存在しないキーはデフォルト値を返すことのテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        self.assertEqual(config_manager.get("missing.key", "default"), "default")
+        self.assertEqual(config_manager.get("tables.missing", "default"), "default")
+
+    def test_config_materializes_all_sections(self) -> None:
+        """configを参照するとすべてのセクションが解析されることのテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        self.assertEqual(config_manager.config, self.test_config)
+
+    def test_set_into_unloaded_section(self) -> None:
+        """未解析のセクションに値を設定するテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        config_manager.set("tables.countries.fr", "France")
+        self.assertEqual(config_manager.get("tables.countries.jp"), "Japan")
+        self.assertEqual(config_manager.get("tables.countries.fr"), "France")
+
+    def test_reload(self) -> None:
+        """遅延読み込みで再読み込みするテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        self.assertFalse(config_manager.reload())
+
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"logging": {"file": "/tmp/app.log"}}, f)
+        self.assertTrue(config_manager.reload())
+        self.assertEqual(config_manager.get("logging.file"), "/tmp/app.log")
+
+    def test_reload_closes_previous_document(self) -> None:
+        """再読み込みで古い設定ファイルを閉じることのテスト。"""
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        old_snapshot = config_manager._snapshot
+        old_document = old_snapshot.document
+        assert old_document is not None
+
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"logging": {"file": "/tmp/app.log"}}, f)
+        self.assertTrue(config_manager.reload())
+
+        self.assertTrue(old_document._file.closed)
+        self.assertIsNone(old_snapshot.document)
+        # 古いスナップショットの未解析のセクションは存在しないものとして扱う
+        self.assertEqual(old_snapshot.pending, set())
+        old_snapshot.load_section("tables")
+        self.assertNotIn("tables", old_snapshot.config)
+        self.assertEqual(config_manager.get("logging.file"), "/tmp/app.log")
+        self.assertFalse(config_manager._snapshot.document._file.closed)
+
+    def test_reload_after_in_place_rewrite(self) -> None:
+        """その場で書き換えられた設定ファイルの再読み込みで通知されることのテスト。"""
+        # BufferedReader のバッファ（8KB）に収まらない大きさにする
+        rows = {f"row{i:04d}": "x" * 16 for i in range(1000)}
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"logging": {"level": "INFO"}, "tables": rows}, f)
+        config_manager = ConfigManager(self.config_path, lazy=True)
+        old_snapshot = config_manager._snapshot
+        self.assertEqual(config_manager.get("logging.level"), "INFO")
+        listener = MagicMock()
+        config_manager.subscribe("logging", listener)
+        config_manager.subscribe("tables", listener)
+
+        # 同じファイルを書き換え、未解析の "tables" の位置をずらす
+        new_logging = {"level": "DEBUG", "file": "app.log"}
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"logging": new_logging, "tables": {}}, f)
+        self.assertTrue(config_manager.reload())
+
+        # 解析済みの値は比較され、読み出せない未解析の値は存在しなかったものとして扱う
+        listener.assert_has_calls(
+            [
+                call("logging", {"level": "INFO"}, new_logging),
+                call("tables", None, {}),
+            ]
+        )
+        self.assertIsNone(old_snapshot.document)
+        self.assertEqual(config_manager.get("logging.level"), "DEBUG")
+
+    def test_multiple_sources_not_supported(self) -> None:
+        """複数の設定ファイルでは遅延読み込みできないことのテスト。"""
+        with self.assertRaises(ValueError):
+            ConfigManager([self.config_path, self.config_path], lazy=True)
+
+    def test_include_not_supported(self) -> None:
+        """includeを含む設定ファイルでは遅延読み込みできないことのテスト。"""
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"include": "base.json"}, f)
+        with self.assertRaises(ValueError):
+            ConfigManager(self.config_path, lazy=True)
+
+
+class TestConfigManagerReload(unittest.TestCase):
+    """ConfigManagerの再読み込みと変更通知のテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.json")
+        self._write({"database": {"host": "localhost"}, "logging": {"level": "INFO"}})
+        self.config_manager = ConfigManager(self.config_path)
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.config_manager.stop_watching()
+        self.temp_dir.cleanup()
+
+    def _write(self, config: dict) -> None:
+        """設定ファイルを書き込みます。"""
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+    def test_reload(self) -> None:
+        """reloadで変更された設定に差し替わることのテスト。"""
+        self._write({"database": {"host": "db.example.com"}})
+        self.assertTrue(self.config_manager.reload())
+        self.assertEqual(self.config_manager.get("database.host"), "db.example.com")
+        self.assertIsNone(self.config_manager.get("logging.level"))
+
+    def test_reload_unchanged(self) -> None:
+        """内容が変わらない場合はreloadがFalseを返すことのテスト。"""
+        self.assertFalse(self.config_manager.reload())
+
+    def test_reload_without_config_path(self) -> None:
+        """設定ファイルなしでreloadした場合のテスト。"""
+        with self.assertRaises(ValueError):
+            ConfigManager().reload()
+
+    def test_subscribe_notified_only_for_changed_prefix(self) -> None:
+        """値が変化した接頭辞の購読者だけに通知されることのテスト。"""
+        database_listener = MagicMock()
+        logging_listener = MagicMock()
+        self.config_manager.subscribe("database", database_listener)
+        self.config_manager.subscribe("logging", logging_listener)
+
+        self._write(
+            {"database": {"host": "db.example.com"}, "logging": {"level": "INFO"}}
+        )
+        self.config_manager.reload()
+
+        database_listener.assert_called_once_with(
+            "database", {"host": "localhost"}, {"host": "db.example.com"}
+        )
+        logging_listener.assert_not_called()
+
+    def test_subscribe_removed_key(self) -> None:
+        """キーが削除された場合に変更後の値がNoneで通知されることのテスト。"""
+        listener = MagicMock()
+        self.config_manager.subscribe("logging.level", listener)
+
+        self._write({"database": {"host": "localhost"}})
+        self.config_manager.reload()
+
+        listener.assert_called_once_with("logging.level", "INFO", None)
+
+    def test_unsubscribe(self) -> None:
+        """購読を解除すると通知されないことのテスト。"""
+        listener = MagicMock()
+        self.config_manager.subscribe("database", listener)
+        self.config_manager.unsubscribe("database", listener)
+
+        self._write({"database": {"host": "db.example.com"}})
+        self.config_manager.reload()
+
+        listener.assert_not_called()
+
+    def test_listener_exception_does_not_abort_reload(self) -> None:
+        """購読者の例外が他の購読者への通知を妨げないことのテスト。"""
+        failing_listener = MagicMock(side_effect=RuntimeError("テストエラー"))
+        listener = MagicMock()
+        self.config_manager.subscribe("database", failing_listener)
+        self.config_manager.subscribe("database", listener)
+
+        self._write({"database": {"host": "db.example.com"}})
+        with self.assertLogs("src.core.config", level="ERROR"):
+            self.assertTrue(self.config_manager.reload())
+        listener.assert_called_once()
+
+    def test_watch_reloads_on_change(self) -> None:
+        """watchでファイルの変更が自動的に反映されることのテスト。"""
+        changed = threading.Event()
+        self.config_manager.subscribe("database.host", lambda *_: changed.set())
+        self.config_manager.watch(interval=0.01, use_inotify=False)
+
+        self._write({"database": {"host": "db.example.com", "port": 5432}})
+        self.assertTrue(changed.wait(5))
+        self.assertEqual(self.config_manager.get("database.host"), "db.example.com")
+
+    def test_watch_keeps_config_on_parse_error(self) -> None:
+        """解析に失敗した場合は現在の設定が維持されることのテスト。"""
+        with self.assertLogs("src.core.config", level="WARNING"):
+            with open(self.config_path, "w", encoding="utf-8") as f:
+                f.write("{broken")
+            self.config_manager._reload_in_background()
+        self.assertEqual(self.config_manager.get("database.host"), "localhost")
+
+
+class TestConfigManagerBulkAccess(unittest.TestCase):
+    """ConfigManagerの一括取得と接頭辞による参照のテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.config_manager = ConfigManager()
+        self.config_manager.config = {
+            "db": {"host": "localhost", "port": 5432, "pool": {"size": 10}},
+        }
+
+    def test_get_many(self) -> None:
+        """get_manyで複数の値をまとめて取得するテスト。"""
+        self.assertEqual(
+            self.config_manager.get_many(
+                ["db.host", "db.pool.size", "db.missing"], default=0
+            ),
+            {"db.host": "localhost", "db.pool.size": 10, "db.missing": 0},
+        )
+
+    def test_get_many_with_env(self) -> None:
+        """get_manyで環境変数による上書きが適用されることのテスト。"""
+        with patch.dict(os.environ, {"APP_DB_HOST": "db.example.com"}):
+            self.config_manager.refresh_env()
+            values = self.config_manager.get_many(["db.host", "db.port"])
+        self.assertEqual(values, {"db.host": "db.example.com", "db.port": 5432})
+
+    def test_get_many_with_stats(self) -> None:
+        """統計が有効な場合にget_manyの参照が記録されることのテスト。"""
+        stats = self.config_manager.enable_stats()
+        self.config_manager.get_many(["db.host", "db.port"])
+        self.assertEqual(set(stats.to_dict()), {"db.host", "db.port"})
+
+    def test_view(self) -> None:
+        """viewで相対キーの値を取得するテスト。"""
+        view = self.config_manager.view("db")
+        self.assertIsInstance(view, ConfigView)
+        self.assertEqual(view.prefix, "db")
+        self.assertEqual(view.get("host"), "localhost")
+        self.assertEqual(view.get("pool.size"), 10)
+        self.assertEqual(view.get("missing", "default"), "default")
+        self.assertEqual(view.get(), self.config_manager.get("db"))
+        self.assertEqual(
+            view.get_many(["host", "port"]), {"host": "localhost", "port": 5432}
+        )
+
+        pool = view.view("pool")
+        self.assertEqual(pool.prefix, "db.pool")
+        self.assertEqual(pool.get("size"), 10)
+        self.assertEqual(self.config_manager.view("").get("db.port"), 5432)
+
+    def test_view_reflects_changes(self) -> None:
+        """viewが設定の変更と環境変数による上書きを反映することのテスト。"""
+        view = self.config_manager.view("db")
+        self.assertEqual(view.get("port"), 5432)
+
+        self.config_manager.set("db.port", 6543)
+        self.assertEqual(view.get("port"), 6543)
+
+        with patch.dict(os.environ, {"APP_DB_PORT": "7654"}):
+            self.config_manager.refresh_env()
+            self.assertEqual(view.get("port"), "7654")
+
+    def test_view_get_many_fallbacks(self) -> None:
+        """view.get_manyがデフォルト値、環境変数、統計を扱うことのテスト。"""
+        view = self.config_manager.view("db")
+        self.assertEqual(
+            view.get_many(["host", "missing"], default=0),
+            {"host": "localhost", "missing": 0},
+        )
+        # 相対キーの組み合わせごとにはキャッシュしない
+        view.get_many(["port", "host"])
+        self.assertEqual(set(view._keys), {"host", "missing", "port"})
+
+        with patch.dict(os.environ, {"APP_DB_HOST": "db.example.com"}):
+            self.config_manager.refresh_env()
+            self.assertEqual(
+                view.get_many(["host", "port"]),
+                {"host": "db.example.com", "port": 5432},
+            )
+        self.config_manager.refresh_env()
+
+        stats = self.config_manager.enable_stats()
+        self.assertEqual(view.get("pool.size"), 10)
+        view.get_many(["port"])
+        self.assertEqual(set(stats.to_dict()), {"db.pool.size", "db.port"})
+
+
+class TestConfigManagerStats(unittest.TestCase):
+    """ConfigManagerの設定アクセスの統計のテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.config_manager = ConfigManager()
+        self.config_manager.config = {"database": {"host": "localhost"}}
+
+    def test_disabled_by_default(self) -> None:
+        """統計がデフォルトで無効であることのテスト。"""
+        self.assertIsNone(self.config_manager.stats)
+        self.assertNotIn("get", vars(self.config_manager))
+
+    def test_enable_stats(self) -> None:
+        """get() と set() が統計に記録されることのテスト。"""
+        stats = self.config_manager.enable_stats()
+        self.assertIs(self.config_manager.enable_stats(), stats)
+
+        self.assertEqual(self.config_manager.get("database.host"), "localhost")
+        self.assertEqual(self.config_manager.get("missing", "default"), "default")
+        self.config_manager.set("database.port", 5432)
+        with patch.dict(os.environ, {"APP_DATABASE_PORT": "6543"}):
+            self.config_manager.refresh_env()
+            self.assertEqual(self.config_manager.get("database.port"), "6543")
+
+        counts = stats.to_dict()
+        self.assertEqual(counts["database.host"]["gets"], 1)
+        self.assertEqual(counts["missing"]["misses"], 1)
+        self.assertEqual(counts["database.port"]["sets"], 1)
+        self.assertEqual(counts["database.port"]["env_hits"], 1)
+
+    def test_disable_stats(self) -> None:
+        """統計の無効化で通常の get() と set() に戻ることのテスト。"""
+        self.config_manager.enable_stats()
+        self.config_manager.disable_stats()
+
+        self.assertIsNone(self.config_manager.stats)
+        self.assertNotIn("get", vars(self.config_manager))
+        self.assertNotIn("set", vars(self.config_manager))
+        self.config_manager.set("database.port", 5432)
+        self.assertEqual(self.config_manager.get("database.port"), 5432)
+
+
+class TestConfigManagerThreadSafe(unittest.TestCase):
+    """ConfigManagerのコピーオンライトによる並行アクセスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.config_manager = ConfigManager(thread_safe=True)
+        self.config_manager.config = {
+            "database": {"host": "localhost", "pool": {"size": 10, "timeout": 30}},
+            "logging": {"level": "INFO"},
+        }
+
+    def test_set_copy_on_write(self) -> None:
+        """setが公開済みの辞書を変更せず、経路上の辞書だけを複製することのテスト。"""
+        old_config = self.config_manager.config
+        old_pool = self.config_manager.get("database.pool")
+        logging_section = self.config_manager.get("logging")
+
+        self.config_manager.set("database.pool.size", 20)
+
+        self.assertEqual(old_pool, {"size": 10, "timeout": 30})
+        self.assertEqual(old_config["database"]["pool"]["size"], 10)
+        self.assertEqual(self.config_manager.get("database.pool.size"), 20)
+        self.assertEqual(self.config_manager.get("database.pool.timeout"), 30)
+        self.assertEqual(self.config_manager.get("database.pool")["size"], 20)
+        self.assertEqual(self.config_manager.config["database"]["pool"]["size"], 20)
+        # 経路外の辞書は複製されない
+        self.assertIs(self.config_manager.get("logging"), logging_section)
+
+    def test_set_replaces_subtree(self) -> None:
+        """辞書で上書きした場合に古いキーが参照できなくなることのテスト。"""
+        self.config_manager.set("database.pool", {"size": 5})
+        self.assertEqual(self.config_manager.get("database.pool.size"), 5)
+        self.assertIsNone(self.config_manager.get("database.pool.timeout"))
+
+        self.config_manager.set("logging.level.name", "DEBUG")
+        self.assertEqual(self.config_manager.get("logging.level"), {"name": "DEBUG"})
+        self.assertEqual(self.config_manager.get("logging.level.name"), "DEBUG")
+
+    def test_concurrent_get_and_set(self) -> None:
+        """複数の読み取りスレッドと書き込みスレッドを同時に実行するテスト。"""
+        writes = 2000
+        stop = threading.Event()
+        errors: list = []
+        read_counts: list = []
+
+        def reader() -> None:
+            reads = 0
+            last = -1
+            # 前回取得した辞書と、取得した時点の内容の複製
+            held: tuple = ({}, {})
+            try:
+                while not stop.is_set():
+                    value = self.config_manager.get("counter.value", -1)
+                    if value < last:
+                        errors.append(f"値が巻き戻りました: {last} -> {value}")
+                    if not -1 <= value < writes:
+                        errors.append(f"書き込まれていない値です: {value}")
+                    last = value
+                    pair = self.config_manager.get("pair")
+                    if pair is not None and pair["a"] != pair["b"]:
+                        errors.append(f"一貫しない値を読み取りました: {pair}")
+                    # 取得済みの辞書は、その後の set() で書き換えられない
+                    if held[0] != held[1]:
+                        errors.append(f"取得した辞書が変更されました: {held}")
+                    counter = self.config_manager.get("counter")
+                    if counter is not None:
+                        history = counter.get("history", [])
+                        if history != list(range(len(history))):
+                            errors.append(f"書き込まれていない値です: {history}")
+                        held = (counter, copy.deepcopy(counter))
+                    reads += 3
+            except Exception as e:  # pragma: no cover - 失敗時のみ
+                errors.append(repr(e))
+            read_counts.append(reads)
+
+        def writer() -> None:
+            for i in range(writes):
+                self.config_manager.set("counter.value", i)
+                self.config_manager.set("counter.history", list(range(i % 10)))
+                self.config_manager.set("pair", {"a": i, "b": i})
+
+        readers = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in readers:
+            thread.start()
+        start = time.perf_counter()
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        writer_thread.join(30)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in readers:
+            thread.join(5)
+
+        self.assertFalse(writer_thread.is_alive())
+        self.assertEqual(errors, [])
+        self.assertEqual(self.config_manager.get("counter.value"), writes - 1)
+        last = writes - 1
+        self.assertEqual(self.config_manager.get("pair"), {"a": last, "b": last})
+        # 読み取りが書き込みに妨げられずに進んでいること
+        throughput = sum(read_counts) / elapsed
+        self.assertGreater(throughput, 0, f"{throughput:.0f} reads/s")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,189 @@
+"""ログフォーマッタモジュールのテスト。
+
+このモジュールは、ログフォーマッタモジュール（src.core.formatters）のテストを提供します。
+"""
+
+import json
+import logging
+import sys
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.core.formatters import CachedTimeFormatter, JsonFormatter
+
+
+def _make_record(
+    message: str = "message", level: int = logging.INFO, **attrs
+) -> logging.LogRecord:
+    """テスト用のログレコードを作成します。"""
+    record = logging.LogRecord("app", level, __file__, 1, message, (), None)
+    for name, value in attrs.items():
+        setattr(record, name, value)
+    return record
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """JsonFormatterクラスのテスト。"""
+
+    def test_format(self) -> None:
+        """基本的なフィールドの出力のテスト。"""
+        formatter = JsonFormatter()
+        record = _make_record("処理が完了しました", created=1700000000.25)
+        line = formatter.format(record)
+
+        self.assertNotIn("\n", line)
+        self.assertEqual(
+            json.loads(line),
+            {
+                "ts": "2023-11-14T22:13:20.250Z",
+                "level": "INFO",
+                "logger": "app",
+                "msg": "処理が完了しました",
+            },
+        )
+
+    def test_format_args(self) -> None:
+        """% 形式の引数がメッセージに展開されることのテスト。"""
+        record = logging.LogRecord(
+            "app", logging.INFO, __file__, 1, 'value: %s "%d"', ("x", 1), None
+        )
+        self.assertEqual(
+            json.loads(JsonFormatter().format(record))["msg"], 'value: x "1"'
+        )
+
+    def test_context_and_fields(self) -> None:
+        """静的なコンテキストと追加フィールドの出力のテスト。"""
+        formatter = JsonFormatter({"app": "service", "pid": 123})
+        record = _make_record(
+            fields={"user_id": 42, "tags": ["a", "b"], "obj": object}
+        )
+        data = json.loads(formatter.format(record))
+
+        self.assertEqual(data["app"], "service")
+        self.assertEqual(data["pid"], 123)
+        self.assertEqual(data["user_id"], 42)
+        self.assertEqual(data["tags"], ["a", "b"])
+        self.assertEqual(data["obj"], str(object))
+
+    def test_reserved_field_names(self) -> None:
+        """出力済みのキーと同名のフィールドが重複して出力されないことのテスト。"""
+        formatter = JsonFormatter({"msg": "context", "app": "service"})
+        record = _make_record(
+            "本文", fields={"level": "field", "app": "other", "msg": "field"}
+        )
+        line = formatter.format(record)
+
+        pairs = json.loads(line, object_pairs_hook=lambda pairs: pairs)
+        keys = [key for key, _ in pairs]
+        self.assertEqual(len(keys), len(set(keys)), line)
+        data = dict(pairs)
+        self.assertEqual(data["msg"], "本文")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["extra_msg"], "context")
+        self.assertEqual(data["extra_extra_msg"], "field")
+        self.assertEqual(data["extra_level"], "field")
+        self.assertEqual(data["app"], "service")
+        self.assertEqual(data["extra_app"], "other")
+
+    def test_exception(self) -> None:
+        """例外情報の出力のテスト。"""
+        try:
+            raise ValueError("テストエラー")
+        except ValueError:
+            record = _make_record(level=logging.ERROR, exc_info=sys.exc_info())
+        data = json.loads(JsonFormatter().format(record))
+        self.assertIn("ValueError: テストエラー", data["exc"])
+
+    def test_timestamp_cache(self) -> None:
+        """秒が変わった場合にタイムスタンプが更新されることのテスト。"""
+        formatter = JsonFormatter()
+        created_values = (1700000000.125, 1700000000.75, 1700000001.5)
+        timestamps = [
+            json.loads(formatter.format(_make_record(created=c)))["ts"]
+            for c in created_values
+        ]
+        self.assertEqual(
+            timestamps,
+            [
+                "2023-11-14T22:13:20.125Z",
+                "2023-11-14T22:13:20.750Z",
+                "2023-11-14T22:13:21.500Z",
+            ],
+        )
+        for ts in timestamps:
+            datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class TestCachedTimeFormatter(unittest.TestCase):
+    """CachedTimeFormatterクラスのテスト。"""
+
+    FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+    def _records(self) -> list:
+        """秒をまたぐ作成時刻のレコードを作成します。"""
+        records = []
+        for created in (1700000000.125, 1700000000.75, 1700000001.5, 1700000061.0):
+            record = _make_record()
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            records.append(record)
+        return records
+
+    def test_same_output_as_formatter(self) -> None:
+        """logging.Formatter と同じ出力になることのテスト。"""
+        for datefmt in (None, "%H:%M:%S", "%Y/%m/%d"):
+            with self.subTest(datefmt=datefmt):
+                expected = logging.Formatter(self.FORMAT, datefmt)
+                formatter = CachedTimeFormatter(self.FORMAT, datefmt)
+                for record in self._records():
+                    self.assertEqual(
+                        formatter.format(record), expected.format(record)
+                    )
+
+    def test_gmtime_converter(self) -> None:
+        """converter を変更した場合も同じ出力になることのテスト。"""
+        expected = logging.Formatter(self.FORMAT)
+        expected.converter = time.gmtime
+        formatter = CachedTimeFormatter(self.FORMAT)
+        formatter.converter = time.gmtime
+        for record in self._records():
+            self.assertEqual(formatter.format(record), expected.format(record))
+
+    def test_strftime_once_per_second(self) -> None:
+        """同じ秒のレコードでは strftime を呼び出さないことのテスト。"""
+        formatter = CachedTimeFormatter(self.FORMAT)
+        with patch("time.strftime", wraps=time.strftime) as mock_strftime:
+            for record in self._records():
+                formatter.format(record)
+        self.assertEqual(mock_strftime.call_count, 3)
+
+    def test_numeric_timestamps(self) -> None:
+        """数値のタイムスタンプのテスト。"""
+        record = _make_record()
+        record.created = 1700000000.125
+        record.relativeCreated = 1234.5
+
+        formatter = CachedTimeFormatter("%(asctime)s %(message)s", timestamp="epoch")
+        self.assertEqual(formatter.format(record), "1700000000.125 message")
+        formatter = CachedTimeFormatter(
+            "%(asctime)s %(message)s", timestamp="relative"
+        )
+        self.assertEqual(formatter.format(record), "1.234 message")
+
+    def test_without_asctime(self) -> None:
+        """%(asctime)s を含まない場合は時刻を変換しないことのテスト。"""
+        formatter = CachedTimeFormatter("%(message)s")
+        with patch.object(formatter, "formatTime") as mock_format_time:
+            self.assertEqual(formatter.format(_make_record()), "message")
+        mock_format_time.assert_not_called()
+
+    def test_invalid_timestamp(self) -> None:
+        """不正な timestamp の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            CachedTimeFormatter(timestamp="monotonic")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,334 @@
+"""ログハンドラモジュールのテスト。
+
+このモジュールは、ログハンドラモジュール（src.core.handlers）のテストを提供します。
+"""
+
+import glob
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core.handlers import BatchingRotatingFileHandler, HandlerRegistry
+
+
+class TestBatchingRotatingFileHandler(unittest.TestCase):
+    """BatchingRotatingFileHandlerクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "app.log")
+        self.logger = logging.getLogger("test_handlers")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.handlers = []
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        for handler in self.logger.handlers:
+            handler.close()
+        self.logger.handlers = []
+        self.temp_dir.cleanup()
+
+    def _create_handler(self, **kwargs) -> BatchingRotatingFileHandler:
+        """ハンドラを作成してロガーに追加します。"""
+        options = {"flush_interval": 0}
+        options.update(kwargs)
+        handler = BatchingRotatingFileHandler(self.log_file, **options)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.logger.addHandler(handler)
+        return handler
+
+    def _read(self, path: str) -> str:
+        """ファイルの内容を返します。"""
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_buffers_until_flush(self) -> None:
+        """flushまで書き込みが行われないことのテスト。"""
+        handler = self._create_handler()
+        self.logger.info("first")
+        self.logger.info("second")
+        self.assertEqual(self._read(self.log_file), "")
+
+        handler.flush()
+        self.assertEqual(self._read(self.log_file), "INFO first\nINFO second\n")
+
+    def test_single_write_per_batch(self) -> None:
+        """バッファが満杯になったときに1回の書き込みで出力することのテスト。"""
+        handler = self._create_handler(buffer_size=100)
+        with patch("src.core.handlers.os.write", wraps=os.write) as mock_write:
+            for i in range(10):
+                self.logger.info(f"message {i:02d}")  # 1レコード 17 バイト
+            handler.flush()
+        self.assertEqual(mock_write.call_count, 2)
+        self.assertEqual(self._read(self.log_file).count("message"), 10)
+
+    def test_flush_on_error(self) -> None:
+        """ERROR以上のレコードですぐに書き込まれることのテスト。"""
+        self._create_handler()
+        self.logger.info("before")
+        self.logger.error("failure")
+        self.assertEqual(self._read(self.log_file), "INFO before\nERROR failure\n")
+
+    def test_flush_interval(self) -> None:
+        """一定間隔で書き込まれることのテスト。"""
+        self._create_handler(flush_interval=0.01)
+        self.logger.info("periodic")
+        deadline = time.monotonic() + 5
+        while "periodic" not in self._read(self.log_file):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_close_flushes(self) -> None:
+        """closeで残りのレコードが書き込まれることのテスト。"""
+        handler = self._create_handler()
+        self.logger.info("last")
+        handler.close()
+        self.logger.handlers = []
+        self.assertEqual(self._read(self.log_file), "INFO last\n")
+
+    def test_appends_to_existing_file(self) -> None:
+        """既存のファイルに追記し、そのサイズをローテーションに数えることのテスト。"""
+        with open(self.log_file, "w", encoding="utf-8") as f:
+            f.write("x" * 20 + "\n")
+        handler = self._create_handler(max_bytes=30, backup_count=1)
+        self.logger.info("message")
+        handler.flush()
+
+        self.assertEqual(self._read(self.log_file), "INFO message\n")
+        self.assertEqual(self._read(self.log_file + ".1"), "x" * 20 + "\n")
+
+    def test_rotation(self) -> None:
+        """書き込み済みのバイト数でローテーションすることのテスト。"""
+        handler = self._create_handler(max_bytes=40, backup_count=2)
+        for i in range(10):
+            self.logger.info(f"message {i}")  # 1レコード 15 バイト
+        handler.flush()
+
+        self.assertEqual(self._read(self.log_file), "INFO message 8\nINFO message 9\n")
+        self.assertEqual(
+            self._read(self.log_file + ".1"), "INFO message 6\nINFO message 7\n"
+        )
+        self.assertEqual(
+            self._read(self.log_file + ".2"), "INFO message 4\nINFO message 5\n"
+        )
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+
+    def test_rotation_with_namer(self) -> None:
+        """namerでバックアップファイルの名前を変更するテスト。"""
+        handler = self._create_handler(max_bytes=20, backup_count=1)
+        handler.namer = lambda name: name + ".bak"
+        self.logger.info("message 1")
+        self.logger.info("message 2")
+        handler.flush()
+
+        self.assertEqual(self._read(self.log_file + ".1.bak"), "INFO message 1\n")
+        self.assertEqual(self._read(self.log_file), "INFO message 2\n")
+
+    def test_no_rotation_without_backup_count(self) -> None:
+        """backup_countが0の場合はローテーションしないことのテスト。"""
+        handler = self._create_handler(max_bytes=20)
+        for i in range(5):
+            self.logger.info(f"message {i}")
+        handler.flush()
+        self.assertEqual(self._read(self.log_file).count("message"), 5)
+        self.assertFalse(os.path.exists(self.log_file + ".1"))
+
+
+class TestCompressedRotation(unittest.TestCase):
+    """BatchingRotatingFileHandlerの圧縮と時間によるローテーションのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "app.log")
+        self.logger = logging.getLogger("test_compressed_rotation")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.handlers = []
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        for handler in self.logger.handlers:
+            handler.close()
+        self.logger.handlers = []
+        self.temp_dir.cleanup()
+
+    def _create_handler(self, **kwargs) -> BatchingRotatingFileHandler:
+        """レコードごとに書き込むハンドラを作成してロガーに追加します。"""
+        options = {"buffer_size": 0, "flush_interval": 0, "compression": "gzip"}
+        options.update(kwargs)
+        handler = BatchingRotatingFileHandler(self.log_file, **options)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger.addHandler(handler)
+        return handler
+
+    def _read(self, path: str) -> str:
+        """ファイルの内容を返します。"""
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _read_gzip(self, path: str) -> str:
+        """gzipで圧縮したファイルの内容を返します。"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def _pending_files(self) -> list:
+        """圧縮待ちの一時ファイルのリストを返します。"""
+        return glob.glob(os.path.join(self.temp_dir.name, ".app.log.*"))
+
+    def test_compressed_rotation(self) -> None:
+        """ローテーションしたファイルが圧縮され、番号順に保持されることのテスト。"""
+        handler = self._create_handler(max_bytes=20, backup_count=2)
+        for i in range(4):
+            self.logger.info(f"message {i}")  # 1レコード 10 バイト
+        handler.close()
+        self.logger.handlers = []
+
+        self.assertEqual(self._read(self.log_file), "message 3\n")
+        self.assertEqual(self._read_gzip(self.log_file + ".1.gz"), "message 2\n")
+        self.assertEqual(self._read_gzip(self.log_file + ".2.gz"), "message 1\n")
+        self.assertFalse(os.path.exists(self.log_file + ".3.gz"))
+        self.assertEqual(self._pending_files(), [])
+
+    def test_rotate_interval(self) -> None:
+        """rotate_interval 秒が経過したときにローテーションすることのテスト。"""
+        handler = self._create_handler(backup_count=1, rotate_interval=60)
+        self.logger.info("first")
+        self.logger.info("second")
+        record = logging.makeLogRecord(
+            {"msg": "later", "levelno": logging.INFO, "created": time.time() + 61}
+        )
+        handler.handle(record)
+        handler.close()
+        self.logger.handlers = []
+
+        self.assertEqual(self._read(self.log_file), "later\n")
+        self.assertEqual(
+            self._read_gzip(self.log_file + ".1.gz"), "first\nsecond\n"
+        )
+
+    def test_rotate_interval_skips_empty_file(self) -> None:
+        """空のログファイルは時間が経過してもローテーションしないことのテスト。"""
+        handler = self._create_handler(backup_count=1, rotate_interval=60)
+        record = logging.makeLogRecord(
+            {"msg": "later", "levelno": logging.INFO, "created": time.time() + 61}
+        )
+        handler.handle(record)
+        handler.close()
+        self.logger.handlers = []
+
+        self.assertEqual(self._read(self.log_file), "later\n")
+        self.assertFalse(os.path.exists(self.log_file + ".1.gz"))
+
+    def test_writer_does_not_wait_for_compression(self) -> None:
+        """圧縮中もログの書き込みが続けられることのテスト。"""
+        release = threading.Event()
+        started = threading.Event()
+        copyfileobj = shutil.copyfileobj
+
+        def blocking_copy(*args, **kwargs) -> None:
+            started.set()
+            release.wait(5)
+            copyfileobj(*args, **kwargs)
+
+        with patch("src.core.handlers.shutil.copyfileobj", side_effect=blocking_copy):
+            handler = self._create_handler(max_bytes=21, backup_count=1)
+            self.logger.info("message 0")
+            self.logger.info("message 1")
+            self.logger.info("message 2")  # ローテーション
+            self.assertTrue(started.wait(5))
+            self.logger.info("message 3")
+            self.assertEqual(self._read(self.log_file), "message 2\nmessage 3\n")
+            self.assertFalse(os.path.exists(self.log_file + ".1.gz"))
+
+            release.set()
+            handler.close()
+            self.logger.handlers = []
+        self.assertEqual(
+            self._read_gzip(self.log_file + ".1.gz"), "message 0\nmessage 1\n"
+        )
+
+    def test_compresses_leftover_files(self) -> None:
+        """前回の実行で圧縮されなかったファイルを初期化時に圧縮するテスト。"""
+        leftover = os.path.join(self.temp_dir.name, f".app.log.{1:020d}.pending")
+        with open(leftover, "w", encoding="utf-8") as f:
+            f.write("leftover\n")
+        handler = self._create_handler(backup_count=1)
+        handler.close()
+        self.logger.handlers = []
+
+        self.assertEqual(self._read_gzip(self.log_file + ".1.gz"), "leftover\n")
+        self.assertEqual(self._pending_files(), [])
+
+    def test_invalid_compression(self) -> None:
+        """不正な圧縮方式を指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            BatchingRotatingFileHandler(self.log_file, compression="zip")
+
+
+class TestHandlerRegistry(unittest.TestCase):
+    """HandlerRegistryクラスのテスト。"""
+
+    def test_acquire_shares_handler(self) -> None:
+        """同じキーで同じハンドラを共有することのテスト。"""
+        registry = HandlerRegistry()
+        factory = MagicMock(side_effect=logging.NullHandler)
+
+        first = registry.acquire(("file", "a.log"), factory)
+        second = registry.acquire(("file", "a.log"), factory)
+        other = registry.acquire(("file", "b.log"), factory)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(factory.call_count, 2)
+        self.assertEqual(registry.references(first), 2)
+        self.assertEqual(len(registry), 2)
+
+    def test_release_closes_last_reference(self) -> None:
+        """参照数が0になったときにハンドラを閉じることのテスト。"""
+        registry = HandlerRegistry()
+        handler = registry.acquire("key", logging.NullHandler)
+        registry.acquire("key", logging.NullHandler)
+
+        with patch.object(handler, "close") as mock_close:
+            registry.release(handler)
+            mock_close.assert_not_called()
+            registry.release(handler)
+            mock_close.assert_called_once_with()
+        self.assertEqual(len(registry), 0)
+
+        # 閉じた後は新しいハンドラを作成する
+        self.assertIsNot(registry.acquire("key", logging.NullHandler), handler)
+
+    def test_release_unregistered_handler(self) -> None:
+        """登録されていないハンドラはすぐに閉じることのテスト。"""
+        registry = HandlerRegistry()
+        handler = logging.NullHandler()
+        with patch.object(handler, "close") as mock_close:
+            registry.release(handler)
+            mock_close.assert_called_once_with()
+
+    def test_close_all(self) -> None:
+        """登録されているすべてのハンドラを閉じることのテスト。"""
+        registry = HandlerRegistry()
+        handlers = [registry.acquire(key, logging.NullHandler) for key in "ab"]
+        registry.acquire("a", logging.NullHandler)
+        with patch.object(handlers[0], "close") as close_a, patch.object(
+            handlers[1], "close"
+        ) as close_b:
+            registry.close_all()
+        close_a.assert_called_once_with()
+        close_b.assert_called_once_with()
+        self.assertEqual(len(registry), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
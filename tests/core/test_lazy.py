@@ -0,0 +1,172 @@
+"""遅延読み込みモジュールのテスト。
+
+このモジュールは、遅延読み込みモジュール（src.core.lazy）のテストを提供します。
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from src.core.lazy import LazyDocument
+
+
+class TestLazyDocument(unittest.TestCase):
+    """LazyDocumentクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def _write(self, name: str, content: str) -> str:
+        """ファイルを書き込み、そのパスを返します。"""
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def _load_all(self, path: str) -> dict:
+        """すべてのトップレベルのキーを読み込んだ辞書を返します。"""
+        document = LazyDocument(path)
+        try:
+            return {key: document.load(key) for key in document.keys()}
+        finally:
+            document.close()
+
+    def test_json(self) -> None:
+        """JSONのトップレベルのキーを個別に読み込むテスト。"""
+        config = {
+            "logging": {"file": "/var/log/app.log"},
+            "tables": [{"name": "a]}\"b", "values": [1, 2, 3]}, [], {}],
+            "text": "quoted \"value\" with { and [",
+            "number": -1.5e3,
+            "flags": [True, False, None],
+            "empty": {},
+        }
+        path = self._write("config.json", json.dumps(config, indent=2))
+        self.assertEqual(self._load_all(path), config)
+
+    def test_json_compact(self) -> None:
+        """空白を含まないJSONを読み込むテスト。"""
+        config = {"a": 1, "b": {"c": [1, {"d": "e"}]}, "f": "g"}
+        path = self._write("config.json", json.dumps(config, separators=(",", ":")))
+        self.assertEqual(self._load_all(path), config)
+
+    def test_json_deeply_nested(self) -> None:
+        """正規表現で読み飛ばせる深さを超えて入れ子になったJSONのテスト。"""
+        nested: object = "leaf ]}"
+        for _ in range(20):
+            nested = [{"x": nested}]
+        config = {"deep": nested, "after": 1}
+        path = self._write("config.json", json.dumps(config))
+        self.assertEqual(self._load_all(path), config)
+
+    def test_json_empty_object(self) -> None:
+        """空のオブジェクトのJSONを読み込むテスト。"""
+        path = self._write("config.json", " {} ")
+        self.assertEqual(self._load_all(path), {})
+
+    def test_json_invalid_root(self) -> None:
+        """ルートがオブジェクトでないJSONの場合のテスト。"""
+        path = self._write("config.json", "[1, 2]")
+        with self.assertRaises(ValueError):
+            LazyDocument(path)
+
+    def test_json_unterminated(self) -> None:
+        """括弧が閉じられていないJSONの場合のテスト。"""
+        path = self._write("config.json", '{"a": {"b": 1}')
+        with self.assertRaises(ValueError):
+            LazyDocument(path)
+
+    def test_yaml(self) -> None:
+        """YAMLのトップレベルのキーを個別に読み込むテスト。"""
+        path = self._write(
+            "config.yaml",
+            "# comment\n"
+            "---\n"
+            "logging:\n"
+            "  file: /var/log/app.log\n"
+            "  level: INFO\n"
+            "\n"
+            "tables:\n"
+            "  - name: a\n"
+            "    note: |\n"
+            "      multi: line\n"
+            "  - name: b\n"
+            "url: http://example.com\n"
+            "1: one\n",
+        )
+        self.assertEqual(
+            self._load_all(path),
+            {
+                "logging": {"file": "/var/log/app.log", "level": "INFO"},
+                "tables": [{"name": "a", "note": "multi: line\n"}, {"name": "b"}],
+                "url": "http://example.com",
+                1: "one",
+            },
+        )
+
+    def test_yaml_empty(self) -> None:
+        """空のYAMLを読み込むテスト。"""
+        path = self._write("config.yaml", "")
+        self.assertEqual(self._load_all(path), {})
+
+    def test_yaml_unsupported_root(self) -> None:
+        """ルートがブロック形式のマッピングでないYAMLの場合のテスト。"""
+        for content in ("{a: 1}\n", "- a\n- b\n", "a: 1\n---\nb: 2\n"):
+            path = self._write("config.yaml", content)
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    LazyDocument(path)
+
+    def test_yaml_section_parse_error(self) -> None:
+        """不正なセクションは読み込み時にエラーになることのテスト。"""
+        path = self._write("config.yaml", "good: 1\nbad: [1, 2\n")
+        document = LazyDocument(path)
+        try:
+            self.assertEqual(document.load("good"), 1)
+            with self.assertRaises(ValueError):
+                document.load("bad")
+        finally:
+            document.close()
+
+    def test_missing_file(self) -> None:
+        """存在しないファイルの場合のテスト。"""
+        with self.assertRaises(FileNotFoundError):
+            LazyDocument(os.path.join(self.temp_dir.name, "missing.json"))
+
+    def test_unsupported_format(self) -> None:
+        """サポートされていない形式の場合のテスト。"""
+        path = self._write("config.txt", "a")
+        with self.assertRaises(ValueError):
+            LazyDocument(path)
+
+    def test_replaced_file(self) -> None:
+        """ファイルが置き換えられても索引作成時の内容を読み込むことのテスト。"""
+        path = self._write("config.json", json.dumps({"a": {"b": 1}}))
+        document = LazyDocument(path)
+        try:
+            replacement = self._write("new.json", json.dumps({"x": 12345}))
+            os.replace(replacement, path)
+            self.assertEqual(document.load("a"), {"b": 1})
+        finally:
+            document.close()
+
+    def test_rewritten_in_place(self) -> None:
+        """その場で書き換えられたファイルからは読み込まないことのテスト。"""
+        path = self._write("config.json", json.dumps({"a": {"b": 1}, "c": [2]}))
+        document = LazyDocument(path)
+        try:
+            self._write("config.json", json.dumps({"c": [2], "a": {"b": 12345}}))
+            with self.assertRaises(ValueError):
+                document.load("a")
+        finally:
+            document.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
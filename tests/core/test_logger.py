@@ -4,12 +4,17 @@
 """
 
 import io
+import json
 import logging
 import os
 import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch
+from logging.handlers import QueueHandler
+from unittest.mock import MagicMock, patch
 
+from src.core.handlers import BatchingRotatingFileHandler, handler_registry
 from src.core.logger import Logger
 
 
@@ -65,12 +70,86 @@ class TestLogger(unittest.TestCase):
         finally:
             os.unlink(temp_file_path)
 
+    def test_init_with_file_buffer_size(self) -> None:
+        """ログファイルへの書き込みをまとめる場合のテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "app.log")
+            with patch("sys.stdout", new=io.StringIO()):
+                logger = Logger("test", log_file=log_file, file_buffer_size=4096)
+                self.assertIsInstance(
+                    logger.logger.handlers[1], BatchingRotatingFileHandler
+                )
+                logger.info("Buffered message")
+                logger.close()
+            with open(log_file, encoding="utf-8") as f:
+                self.assertIn("Buffered message", f.read())
+
+    def test_init_with_compression(self) -> None:
+        """ローテーションしたログファイルを圧縮する場合のテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "app.log")
+            with patch("sys.stdout", new=io.StringIO()):
+                logger = Logger(
+                    "test",
+                    log_file=log_file,
+                    max_bytes=15,
+                    backup_count=2,
+                    format_string="%(message)s",
+                    compression="gzip",
+                    rotate_interval=3600,
+                )
+                handler = logger.logger.handlers[1]
+                self.assertIsInstance(handler, BatchingRotatingFileHandler)
+                self.assertEqual(handler.rotate_interval, 3600)
+                for i in range(3):
+                    logger.info(f"record {i:02d}")  # 1レコード 10 バイト
+                # バッファせずにレコードごとに書き込む
+                with open(log_file, encoding="utf-8") as f:
+                    self.assertEqual(f.read(), "record 02\n")
+                logger.close()
+            self.assertTrue(os.path.exists(log_file + ".1.gz"))
+            self.assertTrue(os.path.exists(log_file + ".2.gz"))
+
+    def test_json_format(self) -> None:
+        """JSON形式の出力のテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test", json_format=True, context={"env": "test"})
+            logger.info("処理件数: %d", 3, user_id=42)
+            logger.info("追加フィールドなし")
+
+        lines = fake_stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        data = json.loads(lines[0])
+        self.assertEqual(data["msg"], "処理件数: 3")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["app"], "test")
+        self.assertEqual(data["pid"], os.getpid())
+        self.assertIn("host", data)
+        self.assertEqual(data["env"], "test")
+        self.assertEqual(data["user_id"], 42)
+        self.assertNotIn("user_id", json.loads(lines[1]))
+
     def test_init_with_format(self) -> None:
         """フォーマットを指定して初期化した場合のテスト。"""
         format_string = "%(levelname)s - %(message)s"
         logger = Logger("test", format_string=format_string)
         self.assertEqual(logger.logger.handlers[0].formatter._fmt, format_string)
 
+    def test_init_with_timestamp(self) -> None:
+        """タイムスタンプの形式を指定して初期化した場合のテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger(
+                "test.epoch", format_string="%(asctime)s %(message)s", timestamp="epoch"
+            )
+            logger.info("message")
+            logger.close()
+
+        timestamp, message = fake_stdout.getvalue().split()
+        self.assertAlmostEqual(float(timestamp), time.time(), delta=60)
+        self.assertEqual(message, "message")
+        with self.assertRaises(ValueError):
+            Logger("test.invalid", timestamp="monotonic")
+
     def test_debug(self) -> None:
         """debugメソッドのテスト。"""
         with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
@@ -124,6 +203,393 @@ class TestLogger(unittest.TestCase):
             self.assertNotIn("Info message", output)
             self.assertIn("Warning message", output)
 
+    def test_format_args(self) -> None:
+        """% 形式の引数でメッセージを組み立てるテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test")
+            logger.info("処理件数: %d / %s", 3, "total")
+            self.assertIn("処理件数: 3 / total", fake_stdout.getvalue())
+
+    def test_lazy_message(self) -> None:
+        """メッセージを返す関数が出力時にだけ評価されることのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test", level="INFO")
+            build_message = MagicMock(return_value="Lazy message")
+            logger.debug(build_message)
+            build_message.assert_not_called()
+
+            logger.info(build_message)
+            build_message.assert_called_once_with()
+            self.assertIn("Lazy message", fake_stdout.getvalue())
+
+    def test_disabled_level_skips_formatting(self) -> None:
+        """無効なレベルでは引数が文字列に変換されないことのテスト。"""
+        argument = MagicMock()
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test", level="WARNING")
+            logger.info("value: %s", argument)
+            argument.__str__.assert_not_called()
+            self.assertEqual(fake_stdout.getvalue(), "")
+
+    def test_is_enabled(self) -> None:
+        """is_enabledとset_levelのテスト。"""
+        logger = Logger("test", level="INFO")
+        self.assertFalse(logger.is_enabled("DEBUG"))
+        self.assertTrue(logger.is_enabled("info"))
+        self.assertTrue(logger.is_enabled(logging.ERROR))
+        self.assertTrue(logger.is_enabled(logging.INFO + 5))
+
+        logger.set_level("DEBUG")
+        self.assertTrue(logger.is_enabled("DEBUG"))
+        self.assertEqual(logger.logger.level, logging.DEBUG)
+        with self.assertRaises(ValueError):
+            logger.is_enabled("INVALID")
+
+    def test_refresh_levels(self) -> None:
+        """logging.disableの反映のテスト。"""
+        logger = Logger("test", level="INFO")
+        logging.disable(logging.INFO)
+        try:
+            logger.refresh_levels()
+            self.assertFalse(logger.is_enabled("INFO"))
+            self.assertTrue(logger.is_enabled("WARNING"))
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_caller_location(self) -> None:
+        """ファイル名に呼び出し元が記録されることのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test", format_string="%(filename)s - %(message)s")
+            logger.info("message")
+            self.assertIn("test_logger.py - message", fake_stdout.getvalue())
+
+
+    def test_sampling(self) -> None:
+        """同じ呼び出し箇所のログを間引き、件数を出力することのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger("test", format_string="%(message)s", sample_every=10)
+            build_message = MagicMock(return_value="lazy")
+            for i in range(25):
+                logger.info(f"loop {i}")
+                logger.info(build_message)
+            logger.warning("other")
+            logger.close()
+
+        lines = fake_stdout.getvalue().splitlines()
+        self.assertEqual(
+            [line for line in lines if line.startswith("loop")],
+            ["loop 0", "loop 10", "loop 20"],
+        )
+        # 間引いたメッセージは評価しない
+        self.assertEqual(build_message.call_count, 3)
+        self.assertIn("other", lines)
+        summaries = [line for line in lines if "抑制しました" in line]
+        self.assertEqual(len(summaries), 2)
+        for summary in summaries:
+            self.assertIn("同様のメッセージを 22 件抑制しました", summary)
+            self.assertIn("test_logger.py", summary)
+
+    def test_rate_limit_summary_interval(self) -> None:
+        """summary_interval 経過後のログ出力時に件数を出力することのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout, patch(
+            "src.core.logger.time.monotonic"
+        ) as logger_clock, patch("src.core.sampling.time.monotonic") as clock:
+            clock.return_value = logger_clock.return_value = 0.0
+            logger = Logger(
+                "test",
+                format_string="%(levelname)s %(message)s",
+                rate_limit=1,
+                rate_burst=2,
+                summary_interval=10.0,
+            )
+            for _ in range(5):
+                logger.warning("hot")
+            self.assertEqual(fake_stdout.getvalue(), "WARNING hot\nWARNING hot\n")
+
+            clock.return_value = logger_clock.return_value = 10.0
+            logger.warning("hot")
+            output = fake_stdout.getvalue().splitlines()
+            self.assertEqual(len(output), 4)
+            self.assertTrue(
+                output[2].startswith("WARNING 同様のメッセージを 3 件抑制しました")
+            )
+            self.assertEqual(output[3], "WARNING hot")
+
+    def test_flight_recorder(self) -> None:
+        """出力されなかったログがERRORの直前に出力されることのテスト。"""
+        build_message = MagicMock(return_value="lazy detail")
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            logger = Logger(
+                "test",
+                format_string="%(levelname)s %(message)s",
+                flight_recorder_size=3,
+            )
+            for i in range(5):
+                logger.debug("detail %d", i)
+            logger.debug(build_message)
+            logger.info("visible")
+            build_message.assert_not_called()
+            self.assertEqual(fake_stdout.getvalue(), "INFO visible\n")
+
+            logger.error("failure")
+            build_message.assert_called_once_with()
+            # 2回目のERRORでは、すでに出力したログを再び出力しない
+            logger.error("failure again")
+
+        self.assertEqual(
+            fake_stdout.getvalue().splitlines(),
+            [
+                "INFO visible",
+                "INFO ---- 直前の 3 件のログ ----",
+                "DEBUG detail 3",
+                "DEBUG detail 4",
+                "DEBUG lazy detail",
+                "INFO ---- ここまで ----",
+                "ERROR failure",
+                "ERROR failure again",
+            ],
+        )
+
+    def test_flight_recorder_file(self) -> None:
+        """保持したログを別のファイルに出力するテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dump_file = os.path.join(temp_dir, "flight.log")
+            with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+                logger = Logger(
+                    "test",
+                    format_string="%(levelname)s %(message)s",
+                    flight_recorder_size=10,
+                    flight_recorder_file=dump_file,
+                )
+                self.assertFalse(os.path.exists(dump_file))
+                logger.debug("detail")
+                self.assertEqual(logger.dump_flight_recorder(), 1)
+                self.assertEqual(logger.dump_flight_recorder(), 0)
+                logger.close()
+            self.assertEqual(fake_stdout.getvalue(), "")
+            with open(dump_file, encoding="utf-8") as f:
+                self.assertEqual(
+                    f.read().splitlines(),
+                    [
+                        "INFO ---- 直前の 1 件のログ ----",
+                        "DEBUG detail",
+                        "INFO ---- ここまで ----",
+                    ],
+                )
+
+    def test_invalid_sampling(self) -> None:
+        """不正な間引きの設定を指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            Logger("test", sample_every=0)
+        with self.assertRaises(ValueError):
+            Logger("test", rate_limit=-1)
+
+
+class TestLoggerSharedHandlers(unittest.TestCase):
+    """Loggerのハンドラの共有のテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "app.log")
+        stdout_patcher = patch("sys.stdout", new=io.StringIO())
+        stdout_patcher.start()
+        self.addCleanup(stdout_patcher.stop)
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def test_share_handlers(self) -> None:
+        """同じ設定のLoggerでハンドラを共有することのテスト。"""
+        first = Logger("component.a", log_file=self.log_file)
+        second = Logger("component.b", log_file=self.log_file)
+        other_format = Logger(
+            "component.c", log_file=self.log_file, format_string="%(message)s"
+        )
+        other_rotation = Logger("component.d", log_file=self.log_file, max_bytes=100)
+
+        self.assertIs(first.handlers[0], second.handlers[0])
+        self.assertIs(first.handlers[1], second.handlers[1])
+        self.assertIsNot(first.handlers[1], other_format.handlers[1])
+        self.assertIsNot(first.handlers[1], other_rotation.handlers[1])
+        for logger in (first, second, other_format, other_rotation):
+            logger.close()
+
+    def test_close_releases_handlers(self) -> None:
+        """すべてのLoggerが閉じられたときにハンドラを閉じることのテスト。"""
+        first = Logger("component.a", log_file=self.log_file)
+        second = Logger("component.b", log_file=self.log_file)
+        file_handler = first.handlers[1]
+        self.assertEqual(handler_registry.references(file_handler), 2)
+
+        first.close()
+        first.close()  # 複数回呼び出しても参照数は1回だけ減る
+        self.assertEqual(handler_registry.references(file_handler), 1)
+        second.info("still open")
+        with open(self.log_file, encoding="utf-8") as f:
+            self.assertIn("still open", f.read())
+
+        second.close()
+        self.assertEqual(handler_registry.references(file_handler), 0)
+        self.assertIsNone(file_handler.stream)  # type: ignore[attr-defined]
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "/proc/self/fd が必要です")
+    def test_many_loggers(self) -> None:
+        """多数のLoggerを作成してもファイルを開き直さないことのテスト。"""
+        fd_count = len(os.listdir("/proc/self/fd"))
+        start = time.perf_counter()
+        loggers = [
+            Logger(f"job.{i}", log_file=self.log_file) for i in range(2000)
+        ]
+        elapsed = time.perf_counter() - start
+
+        # 最初のLoggerが開いたログファイルの1つだけ増える
+        self.assertLessEqual(len(os.listdir("/proc/self/fd")), fd_count + 1)
+        self.assertLess(elapsed, 5.0)
+        self.assertEqual(handler_registry.references(loggers[0].handlers[1]), 2000)
+        for logger in loggers:
+            logger.close()
+        self.assertLessEqual(len(os.listdir("/proc/self/fd")), fd_count)
+
+
+class TestLoggerAsync(unittest.TestCase):
+    """Loggerの非同期モードのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.temp_dir.name, "app.log")
+        self.stdout = io.StringIO()
+        stdout_patcher = patch("sys.stdout", new=self.stdout)
+        stdout_patcher.start()
+        self.addCleanup(stdout_patcher.stop)
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def _read_log(self) -> str:
+        """ログファイルの内容を返します。"""
+        with open(self.log_file, encoding="utf-8") as f:
+            return f.read()
+
+    def _block_console(self, logger: Logger) -> threading.Event:
+        """コンソールへの出力を止め、出力を再開するイベントを返します。
+
+        最初のレコードの出力中にバックグラウンドのスレッドを止めるため、
+        以降のレコードはキューに溜まります。
+        """
+        entered = threading.Event()
+        release = threading.Event()
+        console = logger.handlers[0]
+        original_handle = console.handle
+
+        def blocking_handle(record: logging.LogRecord) -> bool:
+            entered.set()
+            release.wait(5)
+            return original_handle(record)
+
+        console.handle = blocking_handle  # type: ignore[method-assign]
+        logger.info("m0")
+        self.assertTrue(entered.wait(5))
+        return release
+
+    def test_async_mode(self) -> None:
+        """非同期モードでログがファイルとコンソールに出力されることのテスト。"""
+        logger = Logger("test_async", log_file=self.log_file, async_mode=True)
+        self.assertEqual(len(logger.logger.handlers), 1)
+        self.assertIsInstance(logger.logger.handlers[0], QueueHandler)
+        self.assertEqual(len(logger.handlers), 2)
+
+        for i in range(100):
+            logger.info(f"message {i}")
+        logger.close()
+
+        output = self._read_log()
+        self.assertEqual(output.count("INFO - message"), 100)
+        self.assertIn("message 99", output)
+        self.assertIn("message 99", self.stdout.getvalue())
+        self.assertEqual(logger.dropped, 0)
+        logger.close()  # 複数回呼び出しても安全
+
+    def test_async_level_filtering(self) -> None:
+        """非同期モードでもログレベルによるフィルタリングが行われることのテスト。"""
+        logger = Logger(
+            "test_async", level="WARNING", log_file=self.log_file, async_mode=True
+        )
+        logger.info("Info message")
+        logger.warning("Warning message")
+        logger.close()
+
+        output = self._read_log()
+        self.assertNotIn("Info message", output)
+        self.assertIn("Warning message", output)
+
+    def test_async_drop_new(self) -> None:
+        """キューが満杯のときに新しいレコードを捨てることのテスト。"""
+        logger = Logger(
+            "test_async",
+            log_file=self.log_file,
+            async_mode=True,
+            queue_size=2,
+            overflow="drop_new",
+        )
+        release = self._block_console(logger)
+        for i in range(1, 4):
+            logger.info(f"m{i}")
+        self.assertEqual(logger.dropped, 1)
+        release.set()
+        logger.close()
+
+        output = self._read_log()
+        for message in ("m0", "m1", "m2"):
+            self.assertIn(message, output)
+        self.assertNotIn("m3", output)
+
+    def test_async_drop_oldest(self) -> None:
+        """キューが満杯のときに最も古いレコードを捨てることのテスト。"""
+        logger = Logger(
+            "test_async",
+            log_file=self.log_file,
+            async_mode=True,
+            queue_size=2,
+            overflow="drop_oldest",
+        )
+        release = self._block_console(logger)
+        for i in range(1, 4):
+            logger.info(f"m{i}")
+        self.assertEqual(logger.dropped, 1)
+        release.set()
+        logger.close()
+
+        output = self._read_log()
+        for message in ("m0", "m2", "m3"):
+            self.assertIn(message, output)
+        self.assertNotIn("m1", output)
+
+    def test_async_block_flushes_on_close(self) -> None:
+        """キューが満杯でもcloseで残りのレコードが出力されることのテスト。"""
+        logger = Logger(
+            "test_async", log_file=self.log_file, async_mode=True, queue_size=2
+        )
+        release = self._block_console(logger)
+        logger.info("m1")
+        logger.info("m2")
+        threading.Timer(0.1, release.set).start()
+        logger.info("m3")  # 空きができるまで待つ
+        logger.close()
+
+        output = self._read_log()
+        for message in ("m0", "m1", "m2", "m3"):
+            self.assertIn(message, output)
+        self.assertEqual(logger.dropped, 0)
+
+    def test_invalid_overflow(self) -> None:
+        """不正なoverflowを指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            Logger("test_async", async_mode=True, overflow="invalid")
+
 
 if __name__ == "__main__":
     unittest.main()
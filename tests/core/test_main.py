@@ -3,10 +3,23 @@
 このモジュールは、メインモジュール（src.core.main）のテストを提供します。
 """
 
+import asyncio
+import io
+import json
+import os
+import signal
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
+from src.core.logger import Logger
 from src.core.main import Application, main
+from src.core.pipeline import Pipeline, Stage
+
+
+def _double(value: int) -> int:
+    """プロセスプールで実行するための関数。"""
+    return value * 2
 
 
 class TestApplication(unittest.TestCase):
@@ -18,17 +31,35 @@ class TestApplication(unittest.TestCase):
         """初期化のテスト。"""
         # モックの設定
         mock_config_instance = mock_config_manager.return_value
-        mock_config_instance.get.return_value = "/path/to/log.file"
+        config_values = {"logging.file": "/path/to/log.file"}
+        mock_config_instance.get.side_effect = config_values.get
         mock_logger_instance = mock_logger.return_value
 
         # テスト対象の実行
         app = Application(config_path="/path/to/config.json", log_level="DEBUG")
 
         # 検証
-        mock_config_manager.assert_called_once_with("/path/to/config.json")
-        mock_config_instance.get.assert_called_once_with("logging.file")
+        mock_config_manager.assert_called_once_with(
+            "/path/to/config.json", cache_dir=None
+        )
+        self.assertEqual(
+            mock_config_instance.get.call_args_list,
+            [
+                call("execution.async"),
+                call("logging.file"),
+                call("logging.collector"),
+                call("logging.flight_recorder_size"),
+                call("logging.flight_recorder_file"),
+            ],
+        )
         mock_logger.assert_called_once_with(
-            name="app", level="DEBUG", log_file="/path/to/log.file"
+            name="app",
+            level="DEBUG",
+            log_file="/path/to/log.file",
+            collector=None,
+            flight_recorder_size=0,
+            flight_recorder_file=None,
+            async_mode=False,
         )
         mock_logger_instance.info.assert_called_once_with(
             "アプリケーションを初期化しました"
@@ -39,6 +70,8 @@ class TestApplication(unittest.TestCase):
     def test_run(self, mock_logger, mock_config_manager) -> None:
         """runメソッドのテスト。"""
         # モックの設定
+        # 設定ファイルには値がない（metrics.file などを使用しない）
+        mock_config_manager.return_value.get.return_value = None
         mock_logger_instance = mock_logger.return_value
 
         # テスト対象の実行
@@ -53,11 +86,212 @@ class TestApplication(unittest.TestCase):
             "アプリケーションの実行が完了しました"
         )
 
+    def test_run_failure_dumps_flight_recorder(self) -> None:
+        """実行に失敗したときに直前のDEBUGログが出力されることのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()) as fake_stdout:
+            app = Application()
+            app.logger = Logger(
+                "test_flight_recorder",
+                format_string="%(levelname)s %(message)s",
+                flight_recorder_size=10,
+            )
+
+            def process() -> None:
+                app.logger.debug("処理中の項目: %d", 42)
+                raise RuntimeError("テストエラー")
+
+            app._process = process  # type: ignore[method-assign]
+            with self.assertRaises(RuntimeError):
+                app.run()
+
+        lines = fake_stdout.getvalue().splitlines()
+        error = "ERROR アプリケーションの実行中にエラーが発生しました: テストエラー"
+        self.assertIn("DEBUG 処理中の項目: 42", lines)
+        self.assertLess(lines.index("DEBUG 処理中の項目: 42"), lines.index(error))
+
+    def test_flight_recorder_size_from_environment(self) -> None:
+        """環境変数のフライトレコーダーのサイズを整数に変換することのテスト。"""
+        with patch.dict(os.environ, {"APP_LOGGING_FLIGHT_RECORDER_SIZE": "100"}):
+            with patch("src.core.main.Logger") as mock_logger:
+                Application()
+        self.assertEqual(mock_logger.call_args.kwargs["flight_recorder_size"], 100)
+
+        with patch.dict(os.environ, {"APP_LOGGING_FLIGHT_RECORDER_SIZE": "large"}):
+            with self.assertRaisesRegex(ValueError, "logging.flight_recorder_size"):
+                Application()
+
+    @patch("src.core.main.Logger")
+    def test_run_with_config_stats(self, mock_logger) -> None:
+        """設定アクセスの統計が実行終了時に出力されることのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+
+        app = Application(config_stats=True)
+        app.run()
+
+        messages = [c.args[0] for c in mock_logger_instance.info.call_args_list]
+        report = messages[-1]()
+        self.assertTrue(report.startswith("設定アクセスの統計:"))
+        self.assertIn("logging.file", report)
+
+    @patch("src.core.main.Logger")
+    def test_run_with_pipeline(self, mock_logger) -> None:
+        """パイプラインを実行し、終了時に統計が出力されることのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+        output: list = []
+        pipeline = Pipeline(
+            range(3), [Stage("double", lambda x: x * 2)], Stage("sink", output.append)
+        )
+
+        app = Application(pipeline=pipeline)
+        app.run()
+
+        self.assertEqual(output, [0, 2, 4])
+        messages = [c.args[0] for c in mock_logger_instance.info.call_args_list]
+        report = messages[-1]()
+        self.assertTrue(report.startswith("パイプラインの統計:"))
+        self.assertIn("double", report)
+        self.assertIn("合計: 3 件", report)
+
+    @patch("src.core.main.Logger")
+    def test_run_with_parallel_pipeline(self, mock_logger) -> None:
+        """実行モードに従ってパイプラインのステージを並列に実行することのテスト。"""
+        output: list = []
+        pipeline = Pipeline(
+            range(20),
+            [Stage("double", _double, parallel=True)],
+            Stage("sink", output.append),
+        )
+
+        app = Application(
+            pipeline=pipeline, execution_mode="process", workers=2, chunk_size=3
+        )
+        app.run()
+
+        self.assertEqual(output, [i * 2 for i in range(20)])
+        self.assertEqual(app.executor.mode, "process")
+        self.assertEqual(app.executor.chunk_size, 3)
+        self.assertEqual(pipeline.stats["double"].batches, 20)
+
+    def test_run_records_metrics(self) -> None:
+        """フェーズごとの時間と独自のメトリクスが記録されることのテスト。"""
+
+        class CountingApplication(Application):
+            def _process(self) -> None:
+                self.metrics.counter("records").inc(3)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.json")
+            with patch("src.core.main.Logger"):
+                app = CountingApplication(metrics_file=path)
+            app.run()
+
+            with open(path, encoding="utf-8") as f:
+                metrics = json.load(f)["metrics"]
+
+        for phase in ("phase.config_load", "phase.logger_setup", "phase.process"):
+            self.assertEqual(metrics[phase]["count"], 1)
+        self.assertEqual(metrics["app.runs"]["value"], 1)
+        self.assertEqual(metrics["records"]["value"], 3)
+
+    @patch("src.core.main.Logger")
+    def test_run_failure_records_metrics(self, mock_logger) -> None:
+        """失敗した場合もメトリクスが出力されることのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+        app = Application()
+        app._process = MagicMock(side_effect=ValueError("テストエラー"))
+
+        with self.assertRaises(ValueError):
+            app.run()
+
+        self.assertEqual(app.metrics.counter("app.failures").value, 1)
+        self.assertEqual(app.metrics.histogram("phase.process").count, 1)
+        # metrics_file を指定しない場合はDEBUGレベルでログに出力する
+        message = mock_logger_instance.debug.call_args.args[0]()
+        self.assertTrue(message.startswith("メトリクス: "))
+        self.assertIn('"app.failures"', message)
+
+    @patch("src.core.main.Logger")
+    def test_metrics_file_from_config(self, mock_logger) -> None:
+        """設定の metrics.file に書き込むことのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.json")
+            app = Application()
+            app.config.set("metrics.file", path)
+            app.run()
+            self.assertTrue(os.path.exists(path))
+
+    @patch("src.core.main.Logger")
+    def test_metrics_write_error(self, mock_logger) -> None:
+        """メトリクスの書き込みに失敗しても実行が失敗しないことのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+        with tempfile.NamedTemporaryFile() as f:
+            # 通常のファイルの下にはディレクトリを作成できない
+            app = Application(metrics_file=os.path.join(f.name, "metrics.json"))
+            app.run()
+
+        message = mock_logger_instance.warning.call_args.args[0]
+        self.assertTrue(message.startswith("メトリクスの書き込みに失敗しました"))
+
+    def test_execution_config(self) -> None:
+        """設定ファイルの execution セクションを使用することのテスト。"""
+        with patch("src.core.main.Logger"):
+            app = Application()
+        app.config.set("execution.mode", "thread")
+        app.config.set("execution.workers", 3)
+        app.config.set("execution.ordered", False)
+
+        executor = app.executor
+        self.assertEqual(executor.mode, "thread")
+        self.assertEqual(executor.workers, 3)
+        self.assertEqual(executor.chunk_size, 1000)
+        self.assertFalse(executor.ordered)
+        self.assertEqual(sorted(app.map(_double, range(5))), [0, 2, 4, 6, 8])
+        executor.close()
+
+    def test_execution_config_from_environment(self) -> None:
+        """環境変数の execution.* の値を変換して使用することのテスト。"""
+        env = {
+            "APP_EXECUTION_MODE": "thread",
+            "APP_EXECUTION_WORKERS": "2",
+            "APP_EXECUTION_CHUNK_SIZE": "50",
+            "APP_EXECUTION_ORDERED": "false",
+        }
+        with patch.dict(os.environ, env), patch("src.core.main.Logger"):
+            app = Application()
+            executor = app.executor
+
+        self.assertEqual(executor.mode, "thread")
+        self.assertEqual(executor.workers, 2)
+        self.assertEqual(executor.chunk_size, 50)
+        self.assertFalse(executor.ordered)
+        executor.close()
+
+    def test_execution_config_null_section(self) -> None:
+        """execution セクションが null の場合にデフォルト値を使用することのテスト。"""
+        with patch("src.core.main.Logger"):
+            app = Application()
+        app.config.set("execution", None)
+
+        executor = app.executor
+        self.assertEqual(executor.mode, "serial")
+        self.assertEqual(executor.chunk_size, 1000)
+        self.assertTrue(executor.ordered)
+
+    def test_execution_config_invalid(self) -> None:
+        """変換できない値の場合に例外が発生することのテスト。"""
+        with patch.dict(os.environ, {"APP_EXECUTION_WORKERS": "many"}):
+            with patch("src.core.main.Logger"):
+                app = Application()
+            with self.assertRaisesRegex(ValueError, "execution.workers"):
+                app.executor
+
     @patch("src.core.main.ConfigManager")
     @patch("src.core.main.Logger")
     def test_run_with_exception(self, mock_logger, mock_config_manager) -> None:
         """例外発生時のrunメソッドのテスト。"""
         # モックの設定
+        # 設定ファイルには値がない（metrics.file などを使用しない）
+        mock_config_manager.return_value.get.return_value = None
         mock_logger_instance = mock_logger.return_value
 
         # テスト対象の実行
@@ -80,6 +314,7 @@ class TestApplication(unittest.TestCase):
     def test_process(self, mock_logger, mock_config_manager) -> None:
         """_processメソッドのテスト。"""
         # モックの設定
+        mock_config_manager.return_value.get.return_value = None
         mock_logger_instance = mock_logger.return_value
 
         # テスト対象の実行
@@ -90,6 +325,125 @@ class TestApplication(unittest.TestCase):
         mock_logger_instance.info.assert_any_call("内部処理を実行します")
 
 
+class TestApplicationAsync(unittest.TestCase):
+    """Applicationクラスの非同期実行のテスト。"""
+
+    @patch("src.core.main.Logger")
+    def test_run_async(self, mock_logger) -> None:
+        """コルーチンを同時実行数とタイムアウトを制限して実行することのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+        running = 0
+        max_running = 0
+
+        async def fetch(delay: float) -> float:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                running -= 1
+            return delay
+
+        app = Application(concurrency=2, task_timeout=0.2)
+        results = []
+
+        async def process() -> None:
+            assert app.task_runner is not None
+            results.extend(
+                await app.task_runner.map(
+                    fetch, [0.01, 0.01, 1.0, 0.01], return_exceptions=True
+                )
+            )
+
+        app._process_async = process  # type: ignore[method-assign]
+        asyncio.run(app.run_async())
+
+        self.assertEqual(max_running, 2)
+        self.assertIsInstance(results[2], asyncio.TimeoutError)
+        messages = [c.args[0] for c in mock_logger_instance.info.call_args_list]
+        self.assertIn("アプリケーションの実行が完了しました", messages)
+        summary = [m() for m in messages if callable(m)][0]
+        self.assertEqual(
+            summary,
+            "非同期タスクの統計: 完了 3 件, 失敗 0 件, タイムアウト 1 件, キャンセル 0 件",
+        )
+
+    @patch("src.core.main.Logger")
+    def test_run_async_cancelled_by_signal(self, mock_logger) -> None:
+        """SIGTERM で実行中のコルーチンがキャンセルされることのテスト。"""
+        mock_logger_instance = mock_logger.return_value
+        cleaned_up = []
+
+        async def wait_forever(value: int) -> None:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                cleaned_up.append(value)
+
+        app = Application()
+
+        async def process() -> None:
+            assert app.task_runner is not None
+            asyncio.get_running_loop().call_later(
+                0.05, os.kill, os.getpid(), signal.SIGTERM
+            )
+            await app.task_runner.map(wait_forever, range(3))
+
+        app._process_async = process  # type: ignore[method-assign]
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(app.run_async())
+
+        self.assertEqual(sorted(cleaned_up), [0, 1, 2])
+        mock_logger_instance.warning.assert_called_once_with(
+            "アプリケーションの実行をキャンセルしました"
+        )
+        self.assertEqual(app.metrics.counter("app.cancellations").value, 1)
+        self.assertEqual(app.metrics.histogram("phase.process").count, 1)
+        # シグナルハンドラは元に戻される
+        self.assertIs(signal.getsignal(signal.SIGTERM), signal.SIG_DFL)
+
+    @patch("src.core.main.Logger")
+    def test_run_async_with_pipeline(self, mock_logger) -> None:
+        """パイプラインを別のスレッドで実行することのテスト。"""
+        output: list = []
+        pipeline = Pipeline(range(3), sink=Stage("sink", output.append))
+        app = Application(pipeline=pipeline)
+        asyncio.run(app.run_async())
+        self.assertEqual(output, [0, 1, 2])
+
+    def test_async_mode_logger(self) -> None:
+        """async_mode の場合にログをバックグラウンドで書き込むことのテスト。"""
+        with patch("sys.stdout", new=io.StringIO()):
+            app = Application(async_mode=True)
+            self.assertTrue(app.async_mode)
+            self.assertTrue(app.logger.async_mode)
+            app.logger.close()
+
+    def test_async_config_from_environment(self) -> None:
+        """環境変数の execution.* の文字列を変換して使用することのテスト。"""
+        env = {
+            "APP_EXECUTION_ASYNC": "false",
+            "APP_EXECUTION_CONCURRENCY": "7",
+            "APP_EXECUTION_TASK_TIMEOUT": "2.5",
+        }
+        with patch.dict(os.environ, env), patch("src.core.main.Logger"):
+            app = Application()
+            self.assertFalse(app.async_mode)
+            asyncio.run(app.run_async())
+
+        assert app.task_runner is not None
+        self.assertEqual(app.task_runner.concurrency, 7)
+        self.assertEqual(app.task_runner.timeout, 2.5)
+
+        with patch.dict(os.environ, {"APP_EXECUTION_ASYNC": "0"}):
+            with patch("src.core.main.Logger"):
+                self.assertFalse(Application().async_mode)
+        with patch.dict(os.environ, {"APP_EXECUTION_ASYNC": "maybe"}):
+            with self.assertRaisesRegex(ValueError, "execution.async"):
+                Application()
+
+
 class TestMain(unittest.TestCase):
     """mainメソッドのテスト。"""
 
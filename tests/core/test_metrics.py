@@ -0,0 +1,169 @@
+"""メトリクスモジュールのテスト。
+
+このモジュールは、メトリクスモジュール（src.core.metrics）のテストを提供します。
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestCounter(unittest.TestCase):
+    """Counterクラスのテスト。"""
+
+    def test_inc(self) -> None:
+        """値を増やすことのテスト。"""
+        counter = Counter()
+        counter.inc()
+        counter.inc(4)
+        self.assertEqual(counter.value, 5)
+        self.assertEqual(counter.to_dict(), {"type": "counter", "value": 5})
+
+    def test_inc_negative(self) -> None:
+        """負の値で増やした場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            Counter().inc(-1)
+
+    def test_inc_from_threads(self) -> None:
+        """複数のスレッドから増やした値が失われないことのテスト。"""
+        counter = Counter()
+
+        def work() -> None:
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value, 40000)
+
+
+class TestGauge(unittest.TestCase):
+    """Gaugeクラスのテスト。"""
+
+    def test_set_inc_dec(self) -> None:
+        """値の設定と増減のテスト。"""
+        gauge = Gauge()
+        gauge.set(10)
+        gauge.inc(2)
+        gauge.dec(5)
+        self.assertEqual(gauge.value, 7)
+        self.assertEqual(gauge.to_dict(), {"type": "gauge", "value": 7})
+
+
+class TestHistogram(unittest.TestCase):
+    """Histogramクラスのテスト。"""
+
+    def test_observe(self) -> None:
+        """値がバケットに数えられることのテスト。"""
+        histogram = Histogram([1, 5, 10])
+        for value in (0.5, 1, 3, 7, 20):
+            histogram.observe(value)
+
+        data = histogram.to_dict()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(data["sum"], 31.5)
+        self.assertEqual(data["min"], 0.5)
+        self.assertEqual(data["max"], 20)
+        # 上限ちょうどの値はそのバケットに含まれ、件数は累積で出力される
+        self.assertEqual(data["buckets"], {"1": 2, "5": 3, "10": 4, "+Inf": 5})
+
+    def test_percentile(self) -> None:
+        """パーセンタイルの推定のテスト。"""
+        histogram = Histogram([1, 2, 4, 8])
+        self.assertEqual(histogram.percentile(0.5), 0.0)
+        for value in [0.5] * 90 + [3] * 9 + [100]:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.percentile(0.5), 1)
+        self.assertEqual(histogram.percentile(0.99), 4)
+        # 上限のないバケットの場合は最大値を返す
+        self.assertEqual(histogram.percentile(1.0), 100)
+
+    def test_empty(self) -> None:
+        """値を記録していない場合のテスト。"""
+        data = Histogram().to_dict()
+        self.assertEqual(data["count"], 0)
+        self.assertIsNone(data["min"])
+        self.assertIsNone(data["max"])
+
+    def test_time(self) -> None:
+        """with 文のブロックの実行時間が記録されることのテスト。"""
+        histogram = Histogram()
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count, 1)
+        self.assertGreaterEqual(histogram.sum, 0)
+
+    def test_invalid_buckets(self) -> None:
+        """不正なバケットの場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            Histogram([])
+        with self.assertRaises(ValueError):
+            Histogram([1, 1, 2])
+        with self.assertRaises(ValueError):
+            Histogram([2, 1])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """MetricsRegistryクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.metrics = MetricsRegistry()
+
+    def test_get_same_metric(self) -> None:
+        """同じ名前で同じメトリクスを返すことのテスト。"""
+        self.assertIs(self.metrics.counter("a"), self.metrics.counter("a"))
+        self.assertIs(self.metrics.gauge("b"), self.metrics.gauge("b"))
+        self.assertIs(self.metrics.histogram("c"), self.metrics.histogram("c"))
+
+    def test_type_mismatch(self) -> None:
+        """同じ名前で種類の異なるメトリクスを要求した場合のテスト。"""
+        self.metrics.counter("a")
+        with self.assertRaises(ValueError):
+            self.metrics.histogram("a")
+
+    def test_time(self) -> None:
+        """time() がヒストグラムに実行時間を記録することのテスト。"""
+        with self.metrics.time("phase"):
+            pass
+        with self.metrics.time("phase"):
+            pass
+        self.assertEqual(self.metrics.histogram("phase").count, 2)
+
+    def test_to_dict(self) -> None:
+        """すべてのメトリクスが名前順に出力されることのテスト。"""
+        self.metrics.gauge("z").set(1)
+        self.metrics.counter("a").inc()
+        data = self.metrics.to_dict()
+        self.assertEqual(list(data), ["a", "z"])
+        self.assertEqual(data["a"], {"type": "counter", "value": 1})
+
+    def test_write_json(self) -> None:
+        """JSONファイルへの書き込みのテスト。"""
+        self.metrics.counter("runs").inc()
+        with self.metrics.time("phase.process"):
+            pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "out", "metrics.json")
+            self.metrics.write_json(path, extra={"timestamp": 1.0})
+
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            # 一時ファイルが残らない
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["metrics.json"])
+
+        self.assertEqual(data["timestamp"], 1.0)
+        self.assertEqual(data["metrics"]["runs"]["value"], 1)
+        self.assertEqual(data["metrics"]["phase.process"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""並列実行モジュールのテスト。
+
+このモジュールは、並列実行モジュール（src.core.parallel）のテストを提供します。
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+from src.core import parallel
+from src.core.collector import LogCollector
+from src.core.config import ConfigManager
+from src.core.handlers import BatchingRotatingFileHandler
+from src.core.logger import Logger
+from src.core.parallel import (
+    ParallelExecutor,
+    init_worker,
+    set_worker_context,
+    worker_config,
+    worker_logger,
+)
+
+
+def _log_record(value: int) -> int:
+    """ワーカーのロガーに出力する関数。"""
+    worker_logger().info("worker record %02d", value)
+    return value
+
+
+def _square(value: int) -> int:
+    """プロセスプールで実行するための関数。"""
+    return value * value
+
+
+def _fail_on_three(value: int) -> int:
+    """3を受け取ると例外を発生させる関数。"""
+    if value == 3:
+        raise ValueError("テストエラー")
+    return value
+
+
+def _worker_settings(value: int) -> Dict[str, Any]:
+    """ワーカーの設定とプロセスの情報を返す関数。"""
+    config = worker_config()
+    worker_logger().debug("処理中の値: %d", value)
+    return {
+        "pid": os.getpid(),
+        "greeting": config.get("app.greeting"),
+        "config_paths": config.config_paths,
+    }
+
+
+class TestParallelExecutor(unittest.TestCase):
+    """ParallelExecutorクラスのテスト。"""
+
+    def test_modes(self) -> None:
+        """各実行モードで同じ結果を返すことのテスト。"""
+        for mode in ("serial", "thread", "process"):
+            with self.subTest(mode=mode):
+                with ParallelExecutor(mode, workers=2, chunk_size=3) as executor:
+                    self.assertEqual(
+                        list(executor.map(_square, range(10))),
+                        [i * i for i in range(10)],
+                    )
+
+    def test_unordered(self) -> None:
+        """ordered がFalseの場合は完了した順に結果を返すことのテスト。"""
+
+        def slow_first(value: int) -> int:
+            if value == 0:
+                time.sleep(0.2)
+            return value
+
+        with ParallelExecutor(
+            "thread", workers=2, chunk_size=1, ordered=False
+        ) as executor:
+            results = list(executor.map(slow_first, range(4)))
+        self.assertEqual(sorted(results), [0, 1, 2, 3])
+        self.assertNotEqual(results[0], 0)
+
+    def test_map_chunks(self) -> None:
+        """チャンクに分割して関数に渡すことのテスト。"""
+        with ParallelExecutor("thread", workers=2, chunk_size=4) as executor:
+            chunks = list(executor.map_chunks(list, range(10)))
+            self.assertEqual(chunks, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+            self.assertEqual(
+                list(executor.map_chunks(len, range(10), chunk_size=5)), [5, 5]
+            )
+
+    def test_bounded_pending(self) -> None:
+        """実行待ちのチャンクの数が制限されることのテスト。"""
+        produced = 0
+        max_ahead = 0
+
+        def records() -> Iterator[int]:
+            nonlocal produced
+            for i in range(200):
+                produced += 1
+                yield i
+
+        with ParallelExecutor("thread", workers=2, chunk_size=5) as executor:
+            for value in executor.map(lambda x: time.sleep(0.0005) or x, records()):
+                max_ahead = max(max_ahead, produced - value)
+
+        # 実行待ちの4チャンクと、次に投入するチャンク
+        self.assertLessEqual(max_ahead, 5 * 5)
+
+    def test_error(self) -> None:
+        """ワーカーの例外が送出されることのテスト。"""
+        for mode in ("serial", "thread", "process"):
+            with self.subTest(mode=mode):
+                with ParallelExecutor(mode, workers=2, chunk_size=2) as executor:
+                    with self.assertRaisesRegex(ValueError, "テストエラー"):
+                        list(executor.map(_fail_on_three, range(10)))
+
+    def test_close(self) -> None:
+        """close() でスレッドプールを停止することのテスト。"""
+        executor = ParallelExecutor("thread", workers=2)
+        list(executor.map(_square, range(10)))
+        executor.close()
+        executor.close()
+        workers = [
+            t for t in threading.enumerate() if t.name.startswith("app-worker")
+        ]
+        self.assertEqual(workers, [])
+
+    def test_invalid_arguments(self) -> None:
+        """不正な引数の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            ParallelExecutor("gpu")
+        with self.assertRaises(ValueError):
+            ParallelExecutor(workers=0)
+        with self.assertRaises(ValueError):
+            ParallelExecutor(chunk_size=0)
+
+
+class TestWorkerContext(unittest.TestCase):
+    """ワーカーの設定とロガーのテスト。"""
+
+    def test_not_initialized(self) -> None:
+        """初期化されていない場合に例外が発生することのテスト。"""
+        with patch.dict(parallel._worker_context, clear=True):
+            with self.assertRaises(RuntimeError):
+                worker_config()
+            with self.assertRaises(RuntimeError):
+                worker_logger()
+
+    def test_set_worker_context(self) -> None:
+        """このプロセスの設定とロガーを参照することのテスト。"""
+        config = ConfigManager()
+        logger = Logger("test.worker_context")
+        with patch.dict(parallel._worker_context, clear=True):
+            set_worker_context(config, logger)
+            self.assertIs(worker_config(), config)
+            self.assertIs(worker_logger(), logger)
+
+    def test_process_workers(self) -> None:
+        """プロセスプールのワーカーが渡された設定を参照することのテスト。"""
+        config: Dict[str, Any] = {"app": {"greeting": "こんにちは"}}
+        logger_options = {"name": "test.worker", "level": "WARNING"}
+        with ParallelExecutor(
+            "process",
+            workers=2,
+            chunk_size=1,
+            initializer=init_worker,
+            initargs=(config, logger_options),
+        ) as executor:
+            results: List[Dict[str, Any]] = list(
+                executor.map(_worker_settings, range(4))
+            )
+
+        for result in results:
+            self.assertNotEqual(result["pid"], os.getpid())
+            self.assertEqual(result["greeting"], "こんにちは")
+            # 設定ファイルを読み込まず、渡された辞書を使用している
+            self.assertEqual(result["config_paths"], [])
+
+    def test_process_worker_logs_flushed(self) -> None:
+        """ワーカーの終了時にバッファされたログが送られることのテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, "log.sock")
+            log_file = os.path.join(temp_dir, "app.log")
+            collector = LogCollector(
+                address,
+                BatchingRotatingFileHandler(log_file, buffer_size=0, flush_interval=0),
+            )
+            collector.start()
+            logger_options = {
+                "name": "test.worker_flush",
+                "format_string": "%(message)s",
+                "collector": address,
+            }
+            try:
+                # すぐに終わる処理では、ワーカーのバッファはいっぱいにならない
+                with ParallelExecutor(
+                    "process",
+                    workers=2,
+                    chunk_size=1,
+                    initializer=init_worker,
+                    initargs=({}, logger_options),
+                ) as executor:
+                    list(executor.map(_log_record, range(40)))
+            finally:
+                collector.close()
+
+            with open(log_file, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(sorted(lines), [f"worker record {i:02d}" for i in range(40)])
+
+
+if __name__ == "__main__":
+    unittest.main()
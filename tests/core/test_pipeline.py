@@ -0,0 +1,222 @@
+"""パイプラインモジュールのテスト。
+
+このモジュールは、パイプラインモジュール（src.core.pipeline）のテストを提供します。
+"""
+
+import threading
+import time
+import unittest
+from typing import Iterator, List
+
+from src.core.parallel import ParallelExecutor
+from src.core.pipeline import SOURCE, Pipeline, Stage
+
+
+def _parse(line: str) -> int:
+    """プロセスプールで実行するための変換関数。"""
+    return int(line) if line.strip() else None  # type: ignore[return-value]
+
+
+def _total(batch: List[int]) -> List[int]:
+    """プロセスプールで実行するためのバッチの変換関数。"""
+    return [sum(batch)]
+
+
+def _pipeline_threads() -> List[threading.Thread]:
+    """実行中のバッファのスレッドを返します。"""
+    return [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+
+
+class TestPipeline(unittest.TestCase):
+    """Pipelineクラスのテスト。"""
+
+    def test_run_stages(self) -> None:
+        """レコードが各ステージを順に流れることのテスト。"""
+        output: List[int] = []
+        pipeline = Pipeline(
+            range(10),
+            [
+                Stage("double", lambda x: x * 2),
+                Stage("drop_small", lambda x: x if x >= 10 else None),
+            ],
+            Stage("collect", output.append),
+        )
+
+        stats = pipeline.run()
+
+        self.assertEqual(output, [10, 12, 14, 16, 18])
+        self.assertEqual(list(stats), [SOURCE, "double", "drop_small", "collect"])
+        self.assertEqual(stats[SOURCE].records_out, 10)
+        self.assertEqual(stats["double"].records_in, 10)
+        self.assertEqual(stats["drop_small"].records_out, 5)
+        self.assertEqual(stats["collect"].records_in, 5)
+        self.assertEqual(stats["collect"].records_out, 0)
+
+    def test_batches(self) -> None:
+        """batch_size 件ずつリストで処理することのテスト。"""
+        batches: List[List[int]] = []
+        pipeline = Pipeline(
+            range(7),
+            [Stage("square", lambda batch: (x * x for x in batch), batch_size=3)],
+            Stage("write", batches.append, batch_size=4),
+        )
+
+        stats = pipeline.run()
+
+        self.assertEqual(batches, [[0, 1, 4, 9], [16, 25, 36]])
+        self.assertEqual(stats["square"].batches, 3)
+        self.assertEqual(stats["square"].records_out, 7)
+        self.assertEqual(stats["write"].batches, 2)
+
+    def test_source_callable(self) -> None:
+        """ソースに関数を指定した場合は実行のたびに呼び出すことのテスト。"""
+        output: List[int] = []
+        pipeline = Pipeline(
+            lambda: iter(range(3)), sink=Stage("collect", output.append)
+        )
+        pipeline.run()
+        pipeline.run()
+        self.assertEqual(output, [0, 1, 2, 0, 1, 2])
+
+    def test_buffered_stage(self) -> None:
+        """バッファを置いたステージでも同じ結果になることのテスト。"""
+        output: List[int] = []
+        pipeline = Pipeline(
+            range(1000),
+            [
+                Stage("increment", lambda x: x + 1, buffer_size=10),
+                Stage(
+                    "sum", lambda batch: [sum(batch)], batch_size=100, buffer_size=200
+                ),
+            ],
+            Stage("collect", output.append, buffer_size=5),
+        )
+
+        pipeline.run()
+
+        self.assertEqual(len(output), 10)
+        self.assertEqual(sum(output), sum(range(1, 1001)))
+        self.assertEqual(_pipeline_threads(), [])
+
+    def test_backpressure(self) -> None:
+        """下流が遅い場合に上流がバッファのサイズまでしか先に進まないことのテスト。"""
+        produced = 0
+        max_ahead = 0
+
+        def source() -> Iterator[int]:
+            nonlocal produced
+            for i in range(200):
+                produced += 1
+                yield i
+
+        def slow_sink(record: int) -> None:
+            nonlocal max_ahead
+            max_ahead = max(max_ahead, produced - record)
+            time.sleep(0.0005)
+
+        Pipeline(source, sink=Stage("slow", slow_sink, buffer_size=10)).run()
+
+        # バッファの10件と、producer が put() を待っている1件、下流が処理中の1件
+        self.assertLessEqual(max_ahead, 12)
+
+    def test_stage_error(self) -> None:
+        """ステージの例外が送出され、スレッドとソースが閉じられることのテスト。"""
+        closed = threading.Event()
+
+        def source() -> Iterator[int]:
+            try:
+                yield from range(100000)
+            finally:
+                closed.set()
+
+        def fail(record: int) -> int:
+            if record == 50:
+                raise RuntimeError("テストエラー")
+            return record
+
+        pipeline = Pipeline(
+            source,
+            [Stage("parse", lambda x: x, buffer_size=10), Stage("fail", fail)],
+        )
+        with self.assertRaises(RuntimeError):
+            pipeline.run()
+        self.assertTrue(closed.is_set())
+        self.assertEqual(_pipeline_threads(), [])
+
+    def test_source_error_in_buffer_thread(self) -> None:
+        """バッファのスレッドで発生した例外が送出されることのテスト。"""
+
+        def source() -> Iterator[int]:
+            yield 1
+            raise ValueError("読み込みエラー")
+
+        pipeline = Pipeline(source, sink=Stage("sink", lambda x: None, buffer_size=4))
+        with self.assertRaisesRegex(ValueError, "読み込みエラー"):
+            pipeline.run()
+        self.assertEqual(pipeline.stats["sink"].records_in, 1)
+
+    def test_parallel_stages(self) -> None:
+        """parallel を指定したステージをワーカーで実行することのテスト。"""
+        lines = [str(i) if i % 10 else " " for i in range(100)]
+        for mode in ("serial", "thread", "process"):
+            with self.subTest(mode=mode):
+                output: List[int] = []
+                pipeline = Pipeline(
+                    lines,
+                    [
+                        Stage("parse", _parse, parallel=True),
+                        Stage("total", _total, batch_size=30, parallel=True),
+                    ],
+                    Stage("collect", output.append),
+                )
+                with ParallelExecutor(mode, workers=2, chunk_size=7) as executor:
+                    stats = pipeline.run(executor)
+
+                self.assertEqual(sum(output), sum(i for i in range(100) if i % 10))
+                self.assertEqual(len(output), 3)
+                self.assertEqual(stats["parse"].records_in, 100)
+                self.assertEqual(stats["parse"].records_out, 90)
+                self.assertEqual(stats["parse"].batches, 100)
+                self.assertEqual(stats["total"].batches, 3)
+
+    def test_parallel_stage_without_executor(self) -> None:
+        """executor を渡さない場合は順に実行することのテスト。"""
+        output: List[int] = []
+        pipeline = Pipeline(
+            ["1", "2"],
+            [Stage("parse", _parse, parallel=True)],
+            Stage("collect", output.append),
+        )
+        pipeline.run()
+        self.assertEqual(output, [1, 2])
+
+    def test_report(self) -> None:
+        """統計の表のテスト。"""
+        output: List[str] = []
+        pipeline = Pipeline(
+            range(5), [Stage("parse", str)], Stage("sink", output.append)
+        )
+        self.assertIn("合計: 0 件", pipeline.report())
+        pipeline.run()
+        report = pipeline.report().splitlines()
+        self.assertEqual(len(report), 5)
+        self.assertTrue(report[1].startswith(SOURCE))
+        self.assertTrue(report[2].startswith("parse"))
+        self.assertTrue(report[-1].startswith("合計: 5 件"))
+
+    def test_invalid_arguments(self) -> None:
+        """不正な引数の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            Stage("stage", str, batch_size=0)
+        with self.assertRaises(ValueError):
+            Stage("stage", str, buffer_size=-1)
+        with self.assertRaises(ValueError):
+            Pipeline([], [Stage("a", str), Stage("a", str)])
+        with self.assertRaises(ValueError):
+            Pipeline([], sink=Stage(SOURCE, str))
+        with self.assertRaises(ValueError):
+            Stage("stage", str, buffer_size=10, parallel=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""プロファイリングモジュールのテスト。
+
+このモジュールは、プロファイリングモジュール（src.core.profiling）のテストを提供します。
+"""
+
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from src.core.profiling import Profiler, StackSampler
+
+
+def _busy(seconds: float) -> None:
+    """指定された時間CPUを使います。"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class _Job:
+    """_process() から呼び出された関数をレポートに出力することを確認するクラス。"""
+
+    def _process(self) -> None:
+        _busy(0.2)
+
+
+class TestStackSampler(unittest.TestCase):
+    """StackSamplerクラスのテスト。"""
+
+    def test_sampling(self) -> None:
+        """対象のスレッドのスタックを記録することのテスト。"""
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        _Job()._process()
+        sampler.stop()
+
+        self.assertGreater(sampler.samples, 0)
+        names = [code.co_name for code, _, _ in sampler.top_functions()]
+        self.assertIn("_busy", names)
+        within = sampler.top_functions(within=("_process",))
+        # _process() から呼び出された関数だけを数え、_process() 自身は含めない
+        self.assertEqual(within[0][0].co_name, "_busy")
+        self.assertNotIn("_process", [code.co_name for code, _, _ in within])
+
+        report = sampler.report()
+        self.assertIn("_process / _process_async から呼び出された関数", report)
+        self.assertIn("_busy", report)
+
+    def test_write_folded(self) -> None:
+        """折り畳み形式での書き込みのテスト。"""
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        _busy(0.05)
+        sampler.stop()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "stacks.folded")
+            sampler.write_folded(path)
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertTrue(stack.endswith("test_write_folded;_busy"))
+        total = sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+        self.assertEqual(total, sampler.samples)
+        self.assertGreater(int(count), 0)
+
+    def test_invalid_interval(self) -> None:
+        """不正な間隔の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            StackSampler(interval=0)
+
+
+class TestProfiler(unittest.TestCase):
+    """Profilerクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "profiles")
+
+    def tearDown(self) -> None:
+        """テスト後のクリーンアップを行います。"""
+        self.temp_dir.cleanup()
+
+    def _read(self, name: str) -> str:
+        """レポートを読み込みます。"""
+        with open(os.path.join(self.output_dir, name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_cpu(self) -> None:
+        """cProfile のレポートを書き込むことのテスト。"""
+        with Profiler("cpu", self.output_dir) as profiler:
+            _Job()._process()
+
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in profiler.files),
+            ["cpu.pstats", "cpu.txt"],
+        )
+        stats = pstats.Stats(os.path.join(self.output_dir, "cpu.pstats"))
+        self.assertTrue(any(func[2] == "_busy" for func in stats.stats))
+        report = self._read("cpu.txt")
+        self.assertIn("_process / _process_async から呼び出された関数", report)
+        self.assertRegex(report, r"\(_process\)\s+->.*\(_busy\)")
+
+    def test_cpu_sampling(self) -> None:
+        """sample_interval を指定した場合にサンプリングで計測することのテスト。"""
+        with Profiler("cpu", self.output_dir, sample_interval=0.001) as profiler:
+            _Job()._process()
+
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in profiler.files),
+            ["cpu_samples.folded", "cpu_samples.txt"],
+        )
+        self.assertIn("_busy", self._read("cpu_samples.txt"))
+
+    def test_memory(self) -> None:
+        """tracemalloc のレポートを書き込むことのテスト。"""
+        with Profiler("memory", self.output_dir) as profiler:
+            retained = [bytearray(1024) for _ in range(1000)]
+
+        self.assertEqual(
+            [os.path.basename(path) for path in profiler.files], ["memory.txt"]
+        )
+        report = self._read("memory.txt")
+        self.assertIn("最大の使用量", report)
+        # 最も多くのメモリを確保した行として、このファイルの行を出力する
+        first = report.split("確保されているメモリの多い行:\n")[1].splitlines()[0]
+        self.assertIn(f"{__file__}:", first)
+        self.assertFalse(tracemalloc.is_tracing())
+        del retained
+
+    def test_both_on_error(self) -> None:
+        """例外で終了した場合も両方のレポートを書き込むことのテスト。"""
+        with self.assertRaises(RuntimeError):
+            with Profiler("both", self.output_dir):
+                raise RuntimeError("テストエラー")
+
+        self.assertEqual(
+            sorted(os.listdir(self.output_dir)), ["cpu.pstats", "cpu.txt", "memory.txt"]
+        )
+
+    def test_invalid_mode(self) -> None:
+        """不正な種類の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            Profiler("disk", self.output_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""フライトレコーダーモジュールのテスト。
+
+このモジュールは、フライトレコーダーモジュール（src.core.recorder）のテストを提供します。
+"""
+
+import logging
+import threading
+import unittest
+
+from src.core.recorder import FlightRecorder
+
+
+class TestFlightRecorder(unittest.TestCase):
+    """FlightRecorderクラスのテスト。"""
+
+    def test_append_and_drain(self) -> None:
+        """追加した記録を古い順に取り出せることのテスト。"""
+        recorder = FlightRecorder(5)
+        recorder.append(logging.DEBUG, "value: %d", (1,))
+        recorder.append(logging.INFO, "message", ())
+        self.assertEqual(len(recorder), 2)
+
+        entries = recorder.drain()
+        self.assertEqual(
+            [(level, message, args) for _, _, level, message, args in entries],
+            [(logging.DEBUG, "value: %d", (1,)), (logging.INFO, "message", ())],
+        )
+        self.assertEqual(len(recorder), 0)
+        self.assertEqual(recorder.drain(), [])
+
+    def test_overwrites_oldest(self) -> None:
+        """容量を超えた場合に古い記録が上書きされることのテスト。"""
+        recorder = FlightRecorder(3)
+        for i in range(7):
+            recorder.append(logging.DEBUG, "record %d", (i,))
+        entries = recorder.drain()
+        self.assertEqual([args for *_, args in entries], [(4,), (5,), (6,)])
+
+    def test_does_not_format(self) -> None:
+        """メッセージと引数をフォーマットせずに保持することのテスト。"""
+        recorder = FlightRecorder(1)
+        argument = object()
+        recorder.append(logging.DEBUG, "value: %s", (argument,))
+        (entry,) = recorder.drain()
+        self.assertEqual(entry[3], "value: %s")
+        self.assertIs(entry[4][0], argument)
+
+    def test_concurrent_append(self) -> None:
+        """複数のスレッドから追加した記録が失われないことのテスト。"""
+        recorder = FlightRecorder(4000)
+
+        def append(worker: int) -> None:
+            for i in range(1000):
+                recorder.append(logging.DEBUG, "%d %d", (worker, i))
+
+        threads = [threading.Thread(target=append, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        entries = recorder.drain()
+        self.assertEqual(len(entries), 4000)
+        self.assertEqual(sorted(entry[0] for entry in entries), list(range(4000)))
+
+    def test_invalid_capacity(self) -> None:
+        """不正な容量を指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            FlightRecorder(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""ログのサンプリングモジュールのテスト。
+
+このモジュールは、ログのサンプリングモジュール（src.core.sampling）のテストを提供します。
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.core.sampling import LogSampler
+
+
+class TestLogSampler(unittest.TestCase):
+    """LogSamplerクラスのテスト。"""
+
+    def test_sample_every(self) -> None:
+        """最初の1回と以降N回に1回だけ許可することのテスト。"""
+        sampler = LogSampler(sample_every=3)
+        allowed = [sampler.allow("a", 0.0) for _ in range(7)]
+        self.assertEqual(allowed, [True, False, False, True, False, False, True])
+        self.assertEqual(sampler.pop_suppressed(), [("a", 4)])
+
+    def test_keys_are_independent(self) -> None:
+        """キーごとに数えることのテスト。"""
+        sampler = LogSampler(sample_every=2)
+        self.assertTrue(sampler.allow("a", 0.0))
+        self.assertTrue(sampler.allow("b", 0.0))
+        self.assertFalse(sampler.allow("a", 0.0))
+        self.assertEqual(sampler.pop_suppressed(), [("a", 1)])
+
+    def test_rate_limit(self) -> None:
+        """トークンバケットで流量を制限することのテスト。"""
+        sampler = LogSampler(rate=2, burst=3)
+        allowed = [sampler.allow("a", 0.0) for _ in range(5)]
+        self.assertEqual(allowed, [True, True, True, False, False])
+
+        # 0.5秒で1トークン回復する
+        self.assertTrue(sampler.allow("a", 0.5))
+        self.assertFalse(sampler.allow("a", 0.5))
+        # 回復量は burst までに制限される
+        allowed = [sampler.allow("a", 100.0) for _ in range(4)]
+        self.assertEqual(allowed, [True, True, True, False])
+        self.assertEqual(sampler.pop_suppressed(), [("a", 4)])
+
+    def test_sample_and_rate_limit(self) -> None:
+        """サンプリングで残った呼び出しに流量制限を適用することのテスト。"""
+        sampler = LogSampler(sample_every=2, rate=1)
+        allowed = [sampler.allow("a", 0.0) for _ in range(4)]
+        self.assertEqual(allowed, [True, False, False, False])
+        self.assertTrue(sampler.allow("a", 1.0))
+
+    def test_pop_suppressed_resets(self) -> None:
+        """取り出した件数が0に戻ることのテスト。"""
+        sampler = LogSampler(sample_every=2)
+        for _ in range(4):
+            sampler.allow("a", 0.0)
+        self.assertEqual(sampler.pop_suppressed(), [("a", 2)])
+        self.assertEqual(sampler.pop_suppressed(), [])
+
+    def test_summary_due(self) -> None:
+        """集計の間隔の判定のテスト。"""
+        with patch("src.core.sampling.time.monotonic", return_value=100.0):
+            sampler = LogSampler(sample_every=2, summary_interval=10.0)
+            self.assertFalse(sampler.summary_due(109.0))
+            self.assertTrue(sampler.summary_due(110.0))
+            sampler.pop_suppressed()
+            self.assertFalse(sampler.summary_due(109.0))
+
+    def test_invalid_arguments(self) -> None:
+        """不正な引数を指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            LogSampler(sample_every=0)
+        with self.assertRaises(ValueError):
+            LogSampler(rate=0)
+        with self.assertRaises(ValueError):
+            LogSampler(rate=1, burst=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""設定スキーマモジュールのテスト。
+
+このモジュールは、設定スキーマモジュール（src.core.schema）のテストを提供します。
+"""
+
+import unittest
+from typing import Dict, List, Optional
+
+from src.core.schema import ConfigSchema, compile_schema, parse_value
+
+
+class PoolSchema(ConfigSchema):
+    """テスト用のコネクションプールのスキーマ。"""
+
+    size: int = 10
+    timeout: float = 1.5
+
+
+class DatabaseSchema(ConfigSchema):
+    """テスト用のデータベースのスキーマ。"""
+
+    host: str
+    port: int = 5432
+    debug: bool = False
+    replicas: List[str] = []
+    options: Dict[str, int] = {}
+    password: Optional[str] = None
+    pool: PoolSchema
+
+
+class AppSchema(ConfigSchema):
+    """テスト用のアプリケーションのスキーマ。"""
+
+    database: DatabaseSchema
+
+
+class ClusterSchema(ConfigSchema):
+    """テスト用の、スキーマを要素に持つフィールドのスキーマ。"""
+
+    primary: Optional[PoolSchema] = None
+    shards: List[PoolSchema] = []
+    pools: Dict[str, PoolSchema] = {}
+
+
+class TestCompileSchema(unittest.TestCase):
+    """compile_schema関数のテスト。"""
+
+    def test_compile(self) -> None:
+        """設定をスキーマに従って変換するテスト。"""
+        cfg = compile_schema(
+            AppSchema,
+            {
+                "database": {
+                    "host": "localhost",
+                    "port": 6543,
+                    "replicas": ["a", "b"],
+                    "options": {"retries": 3},
+                    "pool": {"size": 20},
+                }
+            },
+        )
+        self.assertIsInstance(cfg, AppSchema)
+        self.assertEqual(cfg.database.host, "localhost")
+        self.assertEqual(cfg.database.port, 6543)
+        self.assertEqual(cfg.database.replicas, ["a", "b"])
+        self.assertEqual(cfg.database.options, {"retries": 3})
+        self.assertEqual(cfg.database.pool.size, 20)
+        self.assertEqual(cfg.database.pool.timeout, 1.5)
+        self.assertIsNone(cfg.database.password)
+
+    def test_slots(self) -> None:
+        """変換されたオブジェクトが__slots__で属性を保持することのテスト。"""
+        cfg = compile_schema(PoolSchema, {})
+        self.assertEqual(type(cfg).__slots__, ("size", "timeout"))
+        self.assertFalse(hasattr(cfg, "__dict__"))
+        app = compile_schema(AppSchema, {"database": {"host": "h"}})
+        self.assertFalse(hasattr(app.database, "__dict__"))
+        self.assertIs(type(cfg), type(compile_schema(PoolSchema, {})))
+
+    def test_immutable(self) -> None:
+        """変換されたオブジェクトを変更できないことのテスト。"""
+        cfg = compile_schema(PoolSchema, {})
+        with self.assertRaises(AttributeError):
+            cfg.size = 1
+
+    def test_missing_required_field(self) -> None:
+        """必須のフィールドがない場合のテスト。"""
+        with self.assertRaisesRegex(ValueError, "database.host"):
+            compile_schema(AppSchema, {"database": {}})
+
+    def test_invalid_type(self) -> None:
+        """型が不正な場合のテスト。"""
+        with self.assertRaisesRegex(ValueError, "database.pool.size"):
+            compile_schema(
+                AppSchema, {"database": {"host": "h", "pool": {"size": "many"}}}
+            )
+
+    def test_invalid_subtree(self) -> None:
+        """スキーマのフィールドが辞書でない場合のテスト。"""
+        with self.assertRaisesRegex(ValueError, "database"):
+            compile_schema(AppSchema, {"database": "localhost"})
+
+    def test_coerce_strings(self) -> None:
+        """文字列の値が宣言された型に変換されることのテスト。"""
+        cfg = compile_schema(
+            DatabaseSchema,
+            {"host": "h", "port": "6543", "debug": "yes", "pool": {"timeout": "2"}},
+        )
+        self.assertEqual(cfg.port, 6543)
+        self.assertIs(cfg.debug, True)
+        self.assertEqual(cfg.pool.timeout, 2.0)
+
+    def test_nested_schema_in_optional(self) -> None:
+        """Optional のスキーマのフィールドがコンパイルされることのテスト。"""
+        self.assertIsNone(compile_schema(ClusterSchema, {}).primary)
+        cfg = compile_schema(ClusterSchema, {"primary": {"size": "5"}})
+        self.assertIsInstance(cfg.primary, PoolSchema)
+        self.assertEqual(cfg.primary.size, 5)
+        self.assertEqual(cfg.primary.timeout, 1.5)
+        with self.assertRaisesRegex(ValueError, "primary.size"):
+            compile_schema(ClusterSchema, {"primary": {"size": "x"}})
+
+    def test_nested_schema_in_list(self) -> None:
+        """List の要素のスキーマがコンパイルされることのテスト。"""
+        cfg = compile_schema(ClusterSchema, {"shards": [{"size": 1}, {}]})
+        self.assertEqual([shard.size for shard in cfg.shards], [1, 10])
+        self.assertIsInstance(cfg.shards[0], PoolSchema)
+        with self.assertRaisesRegex(ValueError, r"shards\[1\]\.size"):
+            compile_schema(ClusterSchema, {"shards": [{}, {"size": "x"}]})
+        with self.assertRaisesRegex(ValueError, r"shards\[0\]"):
+            compile_schema(ClusterSchema, {"shards": ["small"]})
+
+    def test_nested_schema_in_dict(self) -> None:
+        """Dict の値のスキーマがコンパイルされることのテスト。"""
+        env = {"pools.read.size": "7"}
+        cfg = compile_schema(
+            ClusterSchema,
+            {"pools": {"read": {"size": 2}, "write": {"timeout": "3"}}},
+            env_lookup=env.get,
+        )
+        self.assertEqual(cfg.pools["read"].size, 7)
+        self.assertEqual(cfg.pools["write"].timeout, 3.0)
+        with self.assertRaisesRegex(ValueError, "pools.write.size"):
+            compile_schema(ClusterSchema, {"pools": {"write": {"size": "x"}}})
+
+    def test_bool_is_not_int(self) -> None:
+        """真偽値を数値のフィールドに指定した場合のテスト。"""
+        with self.assertRaises(ValueError):
+            compile_schema(PoolSchema, {"size": True})
+
+    def test_env_lookup(self) -> None:
+        """環境変数の値で上書きされ、型が変換されることのテスト。"""
+        env = {"database.pool.size": "42", "database.debug": "false"}
+        cfg = compile_schema(
+            AppSchema,
+            {"database": {"host": "h", "debug": True}},
+            env_lookup=env.get,
+        )
+        self.assertEqual(cfg.database.pool.size, 42)
+        self.assertIs(cfg.database.debug, False)
+
+    def test_equality_and_repr(self) -> None:
+        """等価比較と文字列表現のテスト。"""
+        first = compile_schema(PoolSchema, {"size": 1})
+        second = compile_schema(PoolSchema, {"size": 1})
+        self.assertEqual(first, second)
+        self.assertEqual(repr(first), "PoolSchema(size=1, timeout=1.5)")
+
+
+
+class TestParseValue(unittest.TestCase):
+    """parse_value関数のテスト。"""
+
+    def test_parse(self) -> None:
+        """スキーマのフィールドと同じ規則で変換されることのテスト。"""
+        self.assertIs(parse_value(" Yes ", bool, "a"), True)
+        self.assertIs(parse_value("off", bool, "a"), False)
+        self.assertEqual(parse_value("42", int, "a"), 42)
+        self.assertEqual(parse_value(3, float, "a"), 3.0)
+        self.assertIsNone(parse_value(None, Optional[int], "a"))
+
+    def test_invalid(self) -> None:
+        """変換できない値の場合に設定キーを含む例外が発生することのテスト。"""
+        for value, tp in (("maybe", bool), (True, int), ("1.5", int), ([], float)):
+            with self.subTest(value=value, tp=tp):
+                with self.assertRaisesRegex(ValueError, "execution.workers"):
+                    parse_value(value, tp, "execution.workers")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""設定アクセスの統計モジュールのテスト。
+
+このモジュールは、設定アクセスの統計モジュール（src.core.stats）のテストを提供します。
+"""
+
+import unittest
+
+from src.core.stats import ConfigStats
+
+
+class TestConfigStats(unittest.TestCase):
+    """ConfigStatsクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.stats = ConfigStats()
+
+    def test_record(self) -> None:
+        """get() と set() の記録のテスト。"""
+        self.stats.record_get("database.host", 100, miss=False, env_hit=True)
+        self.stats.record_get("database.host", 300, miss=False, env_hit=False)
+        self.stats.record_get("missing", 50, miss=True, env_hit=False)
+        self.stats.record_set("database.host")
+
+        self.assertEqual(
+            self.stats.to_dict(),
+            {
+                "database.host": {
+                    "gets": 2,
+                    "misses": 0,
+                    "env_hits": 1,
+                    "sets": 1,
+                    "total_ns": 400,
+                },
+                "missing": {
+                    "gets": 1,
+                    "misses": 1,
+                    "env_hits": 0,
+                    "sets": 0,
+                    "total_ns": 50,
+                },
+            },
+        )
+
+    def test_hot_keys(self) -> None:
+        """呼び出し回数の多い順にキーが並ぶことのテスト。"""
+        for _ in range(3):
+            self.stats.record_get("b", 10, miss=False, env_hit=False)
+        self.stats.record_get("a", 10, miss=False, env_hit=False)
+        self.stats.record_get("c", 10, miss=False, env_hit=False)
+
+        hot_keys = self.stats.hot_keys(limit=2)
+        self.assertEqual([key for key, _ in hot_keys], ["b", "a"])
+        self.assertEqual(hot_keys[0][1].gets, 3)
+        self.assertEqual(hot_keys[0][1].avg_ns, 10.0)
+
+    def test_report(self) -> None:
+        """表形式のレポートのテスト。"""
+        self.stats.record_get("database.host", 100, miss=False, env_hit=False)
+        self.stats.record_get("missing", 50, miss=True, env_hit=False)
+
+        lines = self.stats.report().splitlines()
+        header = ["key", "gets", "misses", "env", "sets", "avg", "ns"]
+        self.assertEqual(lines[0].split(), header)
+        self.assertEqual(
+            lines[1].split(), ["database.host", "1", "0", "0", "0", "100"]
+        )
+        self.assertEqual(lines[2].split(), ["missing", "1", "1", "0", "0", "50"])
+        self.assertEqual(
+            lines[3], "合計: 2 キー, get 2 回, ミス 1 回, 環境変数 0 回, set 0 回"
+        )
+
+    def test_reset(self) -> None:
+        """統計の破棄のテスト。"""
+        self.stats.record_set("key")
+        self.stats.reset()
+        self.assertEqual(self.stats.to_dict(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
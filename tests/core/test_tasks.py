@@ -0,0 +1,124 @@
+"""非同期タスクモジュールのテスト。
+
+このモジュールは、非同期タスクモジュール（src.core.tasks）のテストを提供します。
+"""
+
+import asyncio
+import unittest
+from typing import List
+
+from src.core.tasks import AsyncTaskRunner
+
+
+class TestAsyncTaskRunner(unittest.TestCase):
+    """AsyncTaskRunnerクラスのテスト。"""
+
+    def test_map(self) -> None:
+        """結果を項目の順に返すことのテスト。"""
+
+        async def double(value: int) -> int:
+            # 後の項目ほど早く完了する
+            await asyncio.sleep((10 - value) * 0.001)
+            return value * 2
+
+        runner = AsyncTaskRunner(concurrency=4)
+        results = asyncio.run(runner.map(double, range(10)))
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual(runner.completed, 10)
+
+    def test_concurrency_limit(self) -> None:
+        """同時に実行するコルーチンの数が制限されることのテスト。"""
+        running = 0
+        max_running = 0
+
+        async def work(value: int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return value
+
+        async def main() -> None:
+            runner = AsyncTaskRunner(concurrency=3)
+            # map() と run() の呼び出しをあわせて制限する
+            await asyncio.gather(
+                runner.map(work, range(20)), *(runner.run(work, i) for i in range(5))
+            )
+
+        asyncio.run(main())
+        self.assertEqual(max_running, 3)
+
+    def test_timeout(self) -> None:
+        """タイムアウトしたコルーチンが中断されることのテスト。"""
+
+        async def work(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return delay
+
+        runner = AsyncTaskRunner(timeout=0.05)
+        results = asyncio.run(runner.map(work, [0, 1.0, 0], return_exceptions=True))
+        self.assertEqual(results[0], 0)
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertEqual(results[2], 0)
+        self.assertEqual(runner.timed_out, 1)
+        self.assertEqual(runner.completed, 2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(runner.run(work, 1.0))
+
+    def test_error_cancels_remaining(self) -> None:
+        """例外が発生した場合に残りのタスクがキャンセルされることのテスト。"""
+        cleaned_up: List[int] = []
+
+        async def work(value: int) -> int:
+            try:
+                if value == 0:
+                    raise ValueError("テストエラー")
+                await asyncio.sleep(10)
+                return value
+            finally:
+                cleaned_up.append(value)
+
+        runner = AsyncTaskRunner(concurrency=5)
+        with self.assertRaisesRegex(ValueError, "テストエラー"):
+            asyncio.run(runner.map(work, range(100)))
+
+        # 実行を開始した5件だけが終了処理を行い、残りは作成されない
+        self.assertEqual(sorted(cleaned_up), [0, 1, 2, 3, 4])
+        self.assertEqual(runner.failed, 1)
+        self.assertEqual(runner.cancelled, 4)
+
+    def test_cancel(self) -> None:
+        """map() がキャンセルされた場合に実行中のタスクを待つことのテスト。"""
+        cleaned_up: List[int] = []
+
+        async def work(value: int) -> int:
+            try:
+                await asyncio.sleep(10)
+                return value
+            finally:
+                await asyncio.sleep(0)
+                cleaned_up.append(value)
+
+        async def main() -> None:
+            runner = AsyncTaskRunner(concurrency=3)
+            task = asyncio.ensure_future(runner.map(work, range(10)))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertEqual(sorted(cleaned_up), [0, 1, 2])
+
+    def test_invalid_arguments(self) -> None:
+        """不正な引数の場合に例外が発生することのテスト。"""
+        with self.assertRaises(ValueError):
+            AsyncTaskRunner(concurrency=0)
+        with self.assertRaises(ValueError):
+            AsyncTaskRunner(timeout=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
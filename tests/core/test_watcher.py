@@ -0,0 +1,106 @@
+"""ファイル監視モジュールのテスト。
+
+このモジュールは、ファイル監視モジュール（src.core.watcher）のテストを提供します。
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.core.watcher import FileWatcher
+
+
+class TestFileWatcher(unittest.TestCase):
+    """FileWatcherクラスのテスト。"""
+
+    def setUp(self) -> None:
+        """テスト前の準備を行います。"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "config.yaml")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("a: 1\n")
+        self.changed = threading.Event()
+
+    def tearDown(self) -> None:
+        """テスト後の後片付けを行います。"""
+        self.temp_dir.cleanup()
+
+    def _assert_detects_change(self, watcher: FileWatcher) -> None:
+        """ファイルの書き換えが検出されることを検証します。"""
+        watcher.start()
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("a: 22\n")
+            self.assertTrue(self.changed.wait(5))
+        finally:
+            watcher.stop()
+
+    def test_polling(self) -> None:
+        """ポーリングで変更を検出するテスト。"""
+        watcher = FileWatcher(
+            [self.path], self.changed.set, interval=0.01, use_inotify=False
+        )
+        self.assertEqual(watcher.backend, "polling")
+        self._assert_detects_change(watcher)
+
+    def test_inotify(self) -> None:
+        """inotifyで変更を検出するテスト。"""
+        watcher = FileWatcher([self.path], self.changed.set, interval=0.01)
+        if watcher.backend != "inotify":
+            self.skipTest("inotifyが利用できません")
+        self._assert_detects_change(watcher)
+
+    def test_inotify_ignores_other_files(self) -> None:
+        """inotifyで監視対象外のファイルの変更を無視するテスト。"""
+        watcher = FileWatcher([self.path], self.changed.set, interval=0.01)
+        if watcher.backend != "inotify":
+            self.skipTest("inotifyが利用できません")
+        watcher.start()
+        try:
+            other = os.path.join(self.temp_dir.name, "other.yaml")
+            with open(other, "w", encoding="utf-8") as f:
+                f.write("b: 2\n")
+            self.assertFalse(self.changed.wait(0.2))
+        finally:
+            watcher.stop()
+
+    def test_fallback_to_polling(self) -> None:
+        """inotifyが利用できない場合にポーリングを使用するテスト。"""
+        with patch("src.core.watcher._load_libc", return_value=None):
+            watcher = FileWatcher([self.path], self.changed.set)
+        self.assertEqual(watcher.backend, "polling")
+
+    def test_callback_exception(self) -> None:
+        """コールバックの例外で監視が停止しないことのテスト。"""
+        calls = []
+
+        def callback() -> None:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("テストエラー")
+            self.changed.set()
+
+        failed = threading.Event()
+        watcher = FileWatcher(
+            [self.path],
+            lambda: (failed.set(), callback()),
+            interval=0.01,
+            use_inotify=False,
+        )
+        watcher.start()
+        try:
+            with self.assertLogs("src.core.watcher", level="ERROR"):
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.write("a: 22\n")
+                self.assertTrue(failed.wait(5))
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("a: 333\n")
+            self.assertTrue(self.changed.wait(5))
+        finally:
+            watcher.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
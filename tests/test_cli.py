@@ -3,10 +3,14 @@
 このモジュールは、CLIモジュール（src.cli）のテストを提供します。
 """
 
+import asyncio
+import io
+import os
 import sys
+import tempfile
 import unittest
 from argparse import Namespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.cli import CLI, main
 
@@ -36,6 +40,17 @@ class TestCLI(unittest.TestCase):
         args = self.cli.parse_args(["-c", "config.json"])
         self.assertEqual(args.config, "config.json")
 
+    def test_parse_args_with_config_cache_dir(self) -> None:
+        """設定キャッシュディレクトリを指定してparse_argsメソッドのテスト。"""
+        args = self.cli.parse_args(["--config-cache-dir", "/tmp/cache"])
+        self.assertEqual(args.config_cache_dir, "/tmp/cache")
+
+    def test_parse_args_with_config_stats(self) -> None:
+        """設定アクセスの統計を有効にしてparse_argsメソッドのテスト。"""
+        self.assertFalse(self.cli.parse_args([]).config_stats)
+        args = self.cli.parse_args(["--config-stats"])
+        self.assertTrue(args.config_stats)
+
     def test_parse_args_with_log_level(self) -> None:
         """ログレベルを指定してparse_argsメソッドのテスト。"""
         args = self.cli.parse_args(["-l", "DEBUG"])
@@ -58,18 +73,41 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(args.command, "init")
         self.assertTrue(args.force)
 
+    def test_parse_args_with_collector_command(self) -> None:
+        """collectorコマンドを指定してparse_argsメソッドのテスト。"""
+        args = self.cli.parse_args(
+            ["collector", "--socket", "/tmp/log.sock", "--log-file", "app.log"]
+        )
+        self.assertEqual(args.command, "collector")
+        self.assertEqual(args.socket, "/tmp/log.sock")
+        self.assertEqual(args.log_file, "app.log")
+
     @patch("src.cli.Application")
     def test_run_default(self, mock_application) -> None:
         """デフォルト引数でrunメソッドのテスト。"""
         # モックの設定
         mock_app_instance = mock_application.return_value
+        mock_app_instance.async_mode = False
 
         # テスト対象の実行
         result = self.cli.run([])
 
         # 検証
         self.assertEqual(result, 0)
-        mock_application.assert_called_once_with(config_path=None, log_level="INFO")
+        mock_application.assert_called_once_with(
+            config_path=None,
+            log_level="INFO",
+            config_cache_dir=None,
+            config_stats=False,
+            metrics_file=None,
+            execution_mode=None,
+            workers=None,
+            chunk_size=None,
+            ordered=None,
+            async_mode=None,
+            concurrency=None,
+            task_timeout=None,
+        )
         mock_app_instance.run.assert_called_once()
 
     @patch("src.cli.print")
@@ -88,15 +126,147 @@ class TestCLI(unittest.TestCase):
         """runコマンドを指定してrunメソッドのテスト。"""
         # モックの設定
         mock_app_instance = mock_application.return_value
+        mock_app_instance.async_mode = False
 
         # テスト対象の実行
         result = self.cli.run(["run", "--option", "value"])
 
         # 検証
         self.assertEqual(result, 0)
-        mock_application.assert_called_once_with(config_path=None, log_level="INFO")
+        mock_application.assert_called_once_with(
+            config_path=None,
+            log_level="INFO",
+            config_cache_dir=None,
+            config_stats=False,
+            metrics_file=None,
+            execution_mode=None,
+            workers=None,
+            chunk_size=None,
+            ordered=None,
+            async_mode=None,
+            concurrency=None,
+            task_timeout=None,
+        )
         mock_app_instance.run.assert_called_once()
 
+    @patch("src.cli.Application")
+    def test_run_with_execution_options(self, mock_application) -> None:
+        """並列実行のオプションを指定してrunメソッドのテスト。"""
+        mock_application.return_value.async_mode = False
+        result = self.cli.run(
+            [
+                "run",
+                "--mode",
+                "process",
+                "--workers",
+                "4",
+                "--chunk-size",
+                "500",
+                "--unordered",
+            ]
+        )
+
+        self.assertEqual(result, 0)
+        kwargs = mock_application.call_args.kwargs
+        self.assertEqual(kwargs["execution_mode"], "process")
+        self.assertEqual(kwargs["workers"], 4)
+        self.assertEqual(kwargs["chunk_size"], 500)
+        self.assertIs(kwargs["ordered"], False)
+
+    @patch("src.cli.Application")
+    def test_run_with_metrics_file(self, mock_application) -> None:
+        """--metrics-file を指定した場合のテスト。"""
+        mock_application.return_value.async_mode = False
+
+        result = self.cli.run(["--metrics-file", "metrics.json", "run"])
+
+        self.assertEqual(result, 0)
+        kwargs = mock_application.call_args.kwargs
+        self.assertEqual(kwargs["metrics_file"], "metrics.json")
+
+    @patch("src.cli.print")
+    @patch("src.cli.Application")
+    def test_run_with_profile(self, mock_application, mock_print) -> None:
+        """--profile を指定した場合にレポートを書き込むテスト。"""
+        mock_application.return_value.async_mode = False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.cli.run(
+                ["run", "--profile", "both", "--profile-dir", temp_dir]
+            )
+            files = sorted(os.listdir(temp_dir))
+
+        self.assertEqual(result, 0)
+        mock_application.return_value.run.assert_called_once_with()
+        self.assertEqual(files, ["cpu.pstats", "cpu.txt", "memory.txt"])
+        self.assertEqual(mock_print.call_count, 3)
+
+    @patch("src.cli.print")
+    @patch("src.cli.Application")
+    def test_run_with_profile_interval(self, mock_application, mock_print) -> None:
+        """--profile-interval を指定した場合にサンプリングで計測するテスト。"""
+        mock_application.return_value.async_mode = False
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.cli.run(
+                [
+                    "run",
+                    "--profile",
+                    "cpu",
+                    "--profile-dir",
+                    temp_dir,
+                    "--profile-interval",
+                    "0.01",
+                ]
+            )
+            files = sorted(os.listdir(temp_dir))
+
+        self.assertEqual(result, 0)
+        self.assertEqual(files, ["cpu_samples.folded", "cpu_samples.txt"])
+
+    @patch("src.cli.Application")
+    def test_profile_interval_requires_profile(self, mock_application) -> None:
+        """--profile を指定せずに --profile-interval を指定した場合のテスト。"""
+        with patch("sys.stderr", new=io.StringIO()) as fake_stderr:
+            with self.assertRaises(SystemExit) as context:
+                self.cli.run(["run", "--profile-interval", "0.01"])
+
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn(
+            "--profile-interval は --profile と併用してください", fake_stderr.getvalue()
+        )
+        mock_application.assert_not_called()
+
+    @patch("src.cli.Application")
+    def test_run_with_async(self, mock_application) -> None:
+        """--async を指定した場合にイベントループ上で実行するテスト。"""
+        mock_app_instance = mock_application.return_value
+        mock_app_instance.async_mode = True
+        mock_app_instance.run_async = AsyncMock()
+
+        result = self.cli.run(
+            ["run", "--async", "--concurrency", "20", "--task-timeout", "1.5"]
+        )
+
+        self.assertEqual(result, 0)
+        kwargs = mock_application.call_args.kwargs
+        self.assertIs(kwargs["async_mode"], True)
+        self.assertEqual(kwargs["concurrency"], 20)
+        self.assertEqual(kwargs["task_timeout"], 1.5)
+        mock_app_instance.run_async.assert_awaited_once_with()
+        mock_app_instance.run.assert_not_called()
+
+    @patch("src.cli.print")
+    @patch("src.cli.Application")
+    def test_run_async_cancelled(self, mock_application, mock_print) -> None:
+        """非同期の実行がキャンセルされた場合のテスト。"""
+        mock_app_instance = mock_application.return_value
+        mock_app_instance.async_mode = True
+        mock_app_instance.run_async = AsyncMock(side_effect=asyncio.CancelledError)
+
+        self.assertEqual(self.cli.run(["run", "--async"]), 1)
+        mock_print.assert_called_once_with("実行がキャンセルされました", file=sys.stderr)
+
     @patch("src.cli.CLI._init_command")
     def test_run_with_init_command(self, mock_init_command) -> None:
         """initコマンドを指定してrunメソッドのテスト。"""
@@ -123,6 +293,39 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(result, 1)
         mock_print.assert_called_once_with("エラー: テストエラー", file=sys.stderr)
 
+    @patch("src.cli.print")
+    @patch("src.cli.signal.signal")
+    @patch("src.cli.LogCollector")
+    @patch("src.cli.BatchingRotatingFileHandler")
+    @patch("src.cli.ConfigManager")
+    def test_collector_command(
+        self, mock_config_manager, mock_handler, mock_collector, mock_signal, _
+    ) -> None:
+        """_collector_commandメソッドのテスト。"""
+        config_values = {"logging.collector": "/tmp/log.sock"}
+        mock_config_manager.return_value.get.side_effect = config_values.get
+        args = self.cli.parse_args(["collector", "--log-file", "app.log"])
+
+        self.cli._collector_command(args)
+
+        mock_handler.assert_called_once_with(
+            "app.log", max_bytes=10485760, backup_count=5
+        )
+        mock_collector.assert_called_once_with(
+            "/tmp/log.sock", mock_handler.return_value
+        )
+        mock_collector.return_value.start.assert_called_once_with()
+        mock_collector.return_value.serve_forever.assert_called_once_with()
+        mock_signal.assert_called_once()
+
+    @patch("src.cli.ConfigManager")
+    def test_collector_command_without_socket(self, mock_config_manager) -> None:
+        """ソケットのパスがない場合にcollectorコマンドがエラーになることのテスト。"""
+        mock_config_manager.return_value.get.return_value = None
+        args = self.cli.parse_args(["collector", "--log-file", "app.log"])
+        with self.assertRaises(ValueError):
+            self.cli._collector_command(args)
+
     @patch("src.cli.print")
     def test_init_command(self, mock_print) -> None:
         """_init_commandメソッドのテスト。"""